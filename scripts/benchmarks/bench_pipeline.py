@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Offline throughput benchmarks for the agent and season generator.
+
+Runs against synthetic ESPN fixtures (``fixtures.py synthesize``, the default,
+since no recorded set is checked in) or a directory made by ``fixtures.py
+record`` (``--fixtures``), so no network access is needed:
+
+    flatten_stats          statistics payloads/sec through the generic walk
+    stat_schema            the same payloads through the compiled ``StatSchema``
+    build_team_profiles    end to end from fixture files (read, decode, score)
+    score_teams            profile scoring from in-memory payloads only
+    gather_week_matchups   weekly matchup assembly over every scheduled week
+    gather_all_matchups    one call for the whole season
+    generate_season        ``generate_season_data.main`` for one season CSV
+    generate_batch         ``generate_season_data.main --inputs`` for many seasons
+
+Each benchmark keeps the best of ``--repeat`` runs. ``--save`` appends the
+results to a JSON-lines history file; ``--check`` compares them with the
+median of recent history entries recorded with the same parameters on the same
+machine and exits with status 1 when a benchmark got slower than
+``--tolerance`` allows.
+
+Usage:
+    python scripts/benchmarks/bench_pipeline.py
+    python scripts/benchmarks/bench_pipeline.py --leagues 4 --seasons 40 --save
+    python scripts/benchmarks/bench_pipeline.py --check --only build_team_profiles
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import generate_season_data  # noqa: E402
+from fixtures import seasons, synthesize  # noqa: E402
+from pickem_agent import (  # noqa: E402
+    STATS_URL_TEMPLATE,
+    EventIndex,
+    StatSchema,
+    build_team_profiles,
+    flatten_stats,
+    gather_all_matchups,
+    gather_week_matchups,
+)
+from pickem_http import DEFAULT_TIMEOUT, FetchEngine, FixtureTransport, TransportResponse, fixture_name  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_HISTORY = Path(__file__).resolve().parent / "history.jsonl"
+
+# A benchmark returns how many units of work one run performed.
+Benchmark = Callable[[], int]
+
+
+class MemoryTransport:
+    """Serve fixture bodies already read into memory, isolating CPU cost."""
+
+    def __init__(self, directory: Path) -> None:
+        self.bodies = {path.name: path.read_bytes() for path in directory.glob("*.json")}
+
+    def get(self, url: str, headers: Optional[Mapping[str, str]] = None, timeout: float = DEFAULT_TIMEOUT) -> TransportResponse:
+        body = self.bodies.get(fixture_name(url))
+        if body is None:
+            return TransportResponse(url=url, status=404, body=b"")
+        return TransportResponse(url=url, status=200, body=body)
+
+
+def build_benchmarks(fixture_dir: Path, season_dir: Path, output_dir: Path) -> Dict[str, Tuple[str, Benchmark]]:
+    """Name -> (unit, benchmark) for every measured function."""
+
+    memory = MemoryTransport(fixture_dir)
+    profiles = build_team_profiles(FetchEngine(memory))
+    index = EventIndex.from_profiles(profiles)
+    stat_payloads = [
+        json.loads(memory.bodies[fixture_name(STATS_URL_TEMPLATE.format(team_id=team_id))])
+        for team_id in profiles
+    ]
+    season_csvs = sorted(season_dir.glob("*.csv"))
+
+    def run_flatten() -> int:
+        for payload in stat_payloads:
+            flatten_stats(payload)
+        return len(stat_payloads)
+
+    def run_schema() -> int:
+        schema = StatSchema()
+        for payload in stat_payloads:
+            schema.extract(payload)
+        return len(stat_payloads)
+
+    def run_build() -> int:
+        return len(build_team_profiles(FetchEngine(FixtureTransport(fixture_dir))))
+
+    def run_score() -> int:
+        return len(build_team_profiles(FetchEngine(memory)))
+
+    def run_weeks() -> int:
+        return sum(len(gather_week_matchups(profiles, week, index)) for week in index.weeks())
+
+    def run_all() -> int:
+        return sum(len(matchups) for matchups in gather_all_matchups(profiles).values())
+
+    def run_generator(*argv: str) -> None:
+        saved = sys.argv
+        sys.argv = ["generate_season_data.py", *argv]
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_season_data.main()
+        finally:
+            sys.argv = saved
+
+    def run_season() -> int:
+        source = season_csvs[0]
+        run_generator("--input", str(source), "--output", str(output_dir / "season.json"), "--season", source.name[:4])
+        return 1
+
+    def run_batch() -> int:
+        run_generator("--inputs", str(season_dir), "--output-dir", str(output_dir / "batch"), "--force")
+        return len(season_csvs)
+
+    return {
+        "flatten_stats": ("payloads", run_flatten),
+        "stat_schema": ("payloads", run_schema),
+        "build_team_profiles": ("teams", run_build),
+        "score_teams": ("teams", run_score),
+        "gather_week_matchups": ("matchups", run_weeks),
+        "gather_all_matchups": ("matchups", run_all),
+        "generate_season": ("seasons", run_season),
+        "generate_batch": ("seasons", run_batch),
+    }
+
+
+def measure(benchmark: Benchmark, repeat: int, min_seconds: float) -> Dict[str, float]:
+    """Best time per run; fast functions are looped until ``min_seconds`` pass."""
+
+    best = float("inf")
+    units = 0
+    for _ in range(repeat):
+        loops = 0
+        started = time.perf_counter()
+        while True:
+            units = benchmark()
+            loops += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_seconds:
+                break
+        best = min(best, elapsed / loops)
+    return {"seconds": round(best, 6), "rate": round(units / best, 2) if best else 0.0}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        return []
+    entries = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    return entries
+
+
+def regressions(
+    entry: Dict[str, Any],
+    history: List[Dict[str, Any]],
+    tolerance: float,
+    window: int,
+) -> List[str]:
+    """Benchmarks slower than ``1 + tolerance`` times their recent median."""
+
+    comparable = [
+        item for item in history
+        if item.get("params") == entry["params"] and item.get("machine") == entry["machine"]
+    ][-window:]
+    problems = []
+    for name, result in entry["results"].items():
+        past = [item["results"][name]["seconds"] for item in comparable if name in item.get("results", {})]
+        if not past:
+            continue
+        baseline = statistics.median(past)
+        if result["seconds"] > baseline * (1 + tolerance):
+            problems.append(f"{name}: {result['seconds'] * 1000:.2f} ms vs median {baseline * 1000:.2f} ms")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=None, help="Recorded ESPN fixture directory (default: synthesize one)")
+    parser.add_argument("--leagues", type=int, default=1, help="Synthetic leagues of 32 teams")
+    parser.add_argument("--seasons", type=int, default=10, help="Synthetic season CSVs for the generator")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark; the best is kept")
+    parser.add_argument("--min-seconds", type=float, default=0.2, help="Minimum duration of one run")
+    parser.add_argument("--only", action="append", default=None, help="Run only this benchmark (repeatable)")
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY), help="JSON-lines results history")
+    parser.add_argument("--save", action="store_true", help="Append the results to the history")
+    parser.add_argument("--check", action="store_true", help="Fail if a benchmark regressed against the history")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown before --check fails")
+    parser.add_argument("--window", type=int, default=5, help="History entries the median is taken over")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        fixture_dir = Path(args.fixtures) if args.fixtures else work / "espn"
+        if not args.fixtures:
+            synthesize(fixture_dir, leagues=args.leagues, seed=args.seed)
+        seasons(work / "seasons", args.seasons, seed=args.seed)
+        benchmarks = build_benchmarks(fixture_dir, work / "seasons", work / "out")
+        unknown = set(args.only or ()) - set(benchmarks)
+        if unknown:
+            parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+        results: Dict[str, Dict[str, Any]] = {}
+        for name, (unit, benchmark) in benchmarks.items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = {**measure(benchmark, args.repeat, args.min_seconds), "unit": unit}
+
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": f"{platform.node()}/{platform.machine()}",
+        "params": {
+            "fixtures": args.fixtures,
+            "leagues": args.leagues,
+            "seasons": args.seasons,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    history_path = Path(args.history)
+    problems = regressions(entry, load_history(history_path), args.tolerance, args.window) if args.check else []
+
+    if args.json:
+        print(json.dumps(entry, indent=2))
+    else:
+        for name, result in results.items():
+            print(f"{name:<22}{result['seconds'] * 1000:>11.3f} ms{result['rate']:>14,.0f} {result['unit']}/sec")
+    if args.save:
+        with history_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry) + "\n")
+    if problems:
+        print("Regressions:", file=sys.stderr)
+        for problem in problems:
+            print(f"  {problem}", file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-row cost of converting season CSV rows to matchup JSON.
+
+Compares the original row pipeline (``csv.DictReader``, per-row team dict
+copies, ``datetime.strptime`` and ``json.dumps(indent=2)`` for every game)
+with the current one (precompiled ``TEAM_TABLE``, memoized ``game_date`` and
+the template-based ``MatchupRenderer``) and prints rows/sec for each.
+
+Usage:
+    python scripts/benchmarks/bench_season_rows.py --scale 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from generate_season_data import TEAM_META, MatchupRenderer, iter_matchups, parse_score  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def legacy_rows(input_path: Path, season: int) -> int:
+    """The per-row work ``generate_season_data.main`` used to do."""
+
+    base_week1 = datetime(season, 9, 4, tzinfo=timezone.utc)
+    rows = 0
+    with input_path.open(newline="") as handle:
+        for row in csv.DictReader(handle):
+            week_label = (row.get("Week") or "").strip()
+            home = (row.get("HomeTeam") or "").strip()
+            away = (row.get("AwayTeam") or "").strip()
+            if not week_label or not home or not away:
+                continue
+            week_num = int(week_label.split()[1])
+            date_token = (row.get("Date") or "").strip()
+            if date_token.upper() == "TBD":
+                dt = base_week1 + timedelta(days=7 * (week_num - 1))
+            else:
+                dt = datetime.strptime(f"{date_token}-{season}", "%d-%b-%Y").replace(tzinfo=timezone.utc)
+            kickoff = dt.replace(hour=17, minute=0)
+            teams = []
+            for name, score_key in ((away, "AwayScore"), (home, "HomeScore")):
+                meta = TEAM_META[name]
+                teams.append({
+                    "id": meta["id"],
+                    "name": meta["name"],
+                    "abbr": meta["abbr"],
+                    "record": "0-0",
+                    "primaryColor": meta["primary"],
+                    "secondaryColor": meta["secondary"],
+                    "score": parse_score(row.get(score_key)),
+                })
+            matchup = {
+                "id": f"{season}-w{week_num}-{rows + 1}",
+                "weekId": week_num,
+                "kickoff": kickoff.isoformat().replace("+00:00", "Z"),
+                "venue": f"{TEAM_META[home]['name']} Stadium",
+                "network": (row.get("Day") or "TBD").strip() or "TBD",
+                "spread": "EVEN",
+                "favorite": "even",
+                "status": "scheduled",
+                "homeTeam": teams[1],
+                "awayTeam": teams[0],
+            }
+            json.dumps(matchup, indent=2)
+            rows += 1
+    return rows
+
+
+def current_rows(input_path: Path, season: int) -> int:
+    renderer = MatchupRenderer(indent=2, depth=3)
+    rows = 0
+    for _, _, matchup in iter_matchups(input_path, season):
+        renderer.render(matchup)
+        rows += 1
+    return rows
+
+
+def scaled_csv(source: Path, scale: int, directory: Path) -> Path:
+    """Repeat the data rows of ``source`` ``scale`` times into a new CSV."""
+
+    lines = source.read_text().splitlines(keepends=True)
+    target = directory / f"scaled_x{scale}.csv"
+    with target.open("w") as handle:
+        handle.write(lines[0])
+        for _ in range(scale):
+            handle.writelines(lines[1:])
+    return target
+
+
+def best_rate(run: Callable[[Path, int], int], path: Path, season: int, repeat: int) -> float:
+    best = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = run(path, season)
+        best = max(best, rows / (time.perf_counter() - started))
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", default=str(REPO_ROOT / "data" / "2025_scores.csv"), help="Season CSV to replay")
+    parser.add_argument("--season", type=int, default=2025)
+    parser.add_argument("--scale", type=int, default=20, help="Repeat the CSV rows this many times")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant; the best is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = scaled_csv(Path(args.input), args.scale, Path(tmp))
+        legacy = best_rate(legacy_rows, path, args.season, args.repeat)
+        current = best_rate(current_rows, path, args.season, args.repeat)
+    print(f"legacy  {legacy:>12,.0f} rows/sec")
+    print(f"current {current:>12,.0f} rows/sec  ({current / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
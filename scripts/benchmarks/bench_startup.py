@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Startup benchmark: wall time of one ``pickem_agent.py --week N`` process.
+
+Compares, as fresh interpreter processes:
+
+    python          a bare ``python -c pass`` (interpreter floor)
+    fixtures        a full build from fixture files (decode, score, assemble)
+    week-cache      a query answered from a ``--refresh-week-cache`` file
+
+and reports whether the week-cache query imported ``requests`` or the transport
+modules. Fixtures are synthesized unless ``--fixtures`` points at a recorded
+directory.
+
+Usage:
+    python scripts/benchmarks/bench_startup.py --runs 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixtures import synthesize  # noqa: E402
+
+AGENT = Path(__file__).resolve().parents[1] / "pickem_agent.py"
+# Modules a week-cache query must not load.
+HEAVY_MODULES = ("requests", "urllib3", "httpx", "pickem_http", "pickem_cache")
+
+
+def timed_runs(command: List[str], runs: int) -> List[float]:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def imported_modules(command: List[str]) -> List[str]:
+    """Top-level modules imported by ``command`` according to ``-X importtime``."""
+
+    result = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    names = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            names.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    return sorted(names)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=None, help="Recorded ESPN fixture directory (default: synthesize one)")
+    parser.add_argument("--week", type=int, default=9)
+    parser.add_argument("--runs", type=int, default=10, help="Processes started per variant")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture_dir = args.fixtures or str(Path(tmp) / "espn")
+        if not args.fixtures:
+            synthesize(fixture_dir)
+        week_cache = str(Path(tmp) / "weeks.json")
+        agent = [sys.executable, str(AGENT), "--week", str(args.week)]
+        subprocess.run(
+            [*agent, "--fixtures", fixture_dir, "--week-cache", week_cache, "--refresh-week-cache"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        variants = {
+            "python": [sys.executable, "-c", "pass"],
+            "fixtures": [*agent, "--fixtures", fixture_dir],
+            "week-cache": [*agent, "--week-cache", week_cache],
+        }
+        results = {name: timed_runs(command, args.runs) for name, command in variants.items()}
+        heavy = [name for name in imported_modules(variants["week-cache"]) if name in HEAVY_MODULES]
+
+    floor = statistics.median(results["python"])
+    for name, samples in results.items():
+        median = statistics.median(samples)
+        extra = "" if name == "python" else f"  (+{(median - floor) * 1000:.1f} ms over python)"
+        print(f"{name:<12}{median * 1000:>9.1f} ms median  {min(samples) * 1000:>7.1f} ms best{extra}")
+    print(f"week-cache query imported: {', '.join(heavy) if heavy else 'none of ' + ', '.join(HEAVY_MODULES)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""Recorded and synthetic fixtures for the pick'em benchmarks.
+
+``record`` fetches the live ESPN documents ``pickem_agent.py`` reads (teams,
+per-team statistics, schedules and past performances, plus the scoreboard)
+and freezes them into a directory readable by ``FixtureTransport``. No
+recorded set is checked in (the documents are live ESPN data), so the
+benchmarks default to ``synthesize``; record one and pass it with
+``--fixtures`` to measure real payloads.
+
+``synthesize`` writes ESPN-shaped payloads without the network. Statistics
+carry the full ESPN category layout (~400 stats per team), schedules carry
+complete competitor, venue, broadcast and odds blocks, and ``--leagues``
+replicates the league with disjoint team ids to scale the team count.
+
+``seasons`` writes season CSVs in the ``data/2025_scores.csv`` layout for
+``generate_season_data.py``, reusing the real schedule with reseeded scores.
+
+Usage:
+    python scripts/benchmarks/fixtures.py record --output fixtures/espn
+    python scripts/benchmarks/fixtures.py synthesize --output /tmp/espn --leagues 4
+    python scripts/benchmarks/fixtures.py seasons --output /tmp/seasons --count 25
+
+Dependencies:
+    - requests (``record`` only)
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pickem_agent import (  # noqa: E402
+    PAST_PERFORMANCE_URL_TEMPLATE,
+    SCHEDULE_URL_TEMPLATE,
+    SCOREBOARD_URL,
+    STATS_URL_TEMPLATE,
+    TEAMS_URL,
+    CACHE_TTLS,
+    build_team_profiles,
+)
+from pickem_http import fixture_name  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+LEAGUE_TEAMS = 32
+# ESPN's team ids: 1-30 plus 33 (Ravens) and 34 (Texans).
+ESPN_TEAM_IDS = tuple(list(range(1, 31)) + [33, 34])
+# Category name and number of stats in ESPN's team statistics document.
+STAT_CATEGORIES = (
+    ("general", 30),
+    ("passing", 60),
+    ("rushing", 40),
+    ("receiving", 40),
+    ("defensive", 60),
+    ("defensiveInterceptions", 10),
+    ("kicking", 60),
+    ("returning", 50),
+    ("punting", 25),
+    ("scoring", 20),
+    ("miscellaneous", 15),
+)
+NETWORKS = ("CBS", "FOX", "NBC", "ESPN", "ABC", "Prime Video", "NFL Network")
+
+
+def _write(directory: Path, url: str, payload: Any) -> None:
+    (directory / fixture_name(url)).write_text(json.dumps(payload), encoding="utf-8")
+
+
+def _stat(name: str, value: float) -> Dict[str, Any]:
+    display = f"{value:,.1f}" if isinstance(value, float) else f"{value:,}"
+    return {
+        "name": name,
+        "displayName": name[:1].upper() + name[1:],
+        "shortDisplayName": name[:4].upper(),
+        "description": f"Season total of {name}",
+        "abbreviation": name[:3].upper(),
+        "value": value,
+        "displayValue": display,
+        "rank": 0,
+        "rankDisplayValue": "",
+    }
+
+
+def stats_payload(rng: random.Random, wins: int, losses: int, ties: int) -> Dict[str, Any]:
+    categories = []
+    for category, size in STAT_CATEGORIES:
+        stats = []
+        if category == "general":
+            points_for = rng.randint(15, 32) * (wins + losses + ties)
+            points_against = rng.randint(15, 32) * (wins + losses + ties)
+            stats += [_stat("wins", wins), _stat("losses", losses), _stat("ties", ties)]
+            stats += [_stat("pointsFor", points_for), _stat("pointsAgainst", points_against)]
+        while len(stats) < size:
+            stats.append(_stat(f"{category}Stat{len(stats)}", round(rng.uniform(0, 500), 1)))
+        categories.append({"name": category, "displayName": category.title(), "stats": stats})
+    return {"$ref": "", "splits": [{"id": "0", "name": "All Splits", "categories": categories}]}
+
+
+def _competitor(team_id: str, home: bool, score: int, winner: bool, completed: bool) -> Dict[str, Any]:
+    competitor: Dict[str, Any] = {
+        "id": team_id,
+        "type": "team",
+        "order": 0 if home else 1,
+        "homeAway": "home" if home else "away",
+        "team": {
+            "id": team_id,
+            "abbreviation": f"T{team_id}",
+            "displayName": f"Team {team_id}",
+            "shortDisplayName": f"Team {team_id}",
+            "logos": [{"href": f"https://a.espncdn.com/i/teamlogos/nfl/500/{team_id}.png", "width": 500, "height": 500}],
+            "links": [{"rel": ["clubhouse"], "href": f"https://www.espn.com/nfl/team/_/id/{team_id}"}],
+        },
+    }
+    if completed:
+        competitor["winner"] = winner
+        competitor["score"] = {"value": float(score), "displayValue": str(score)}
+        competitor["record"] = [{"type": "total", "displayValue": "0-0"}]
+    return competitor
+
+
+def league_schedule(
+    rng: random.Random,
+    team_ids: List[str],
+    event_prefix: str,
+    weeks: int,
+    completed_weeks: int,
+    season: int,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Random round of pairings per week; returns each team's event list."""
+
+    schedules: Dict[str, List[Dict[str, Any]]] = {team_id: [] for team_id in team_ids}
+    for week in range(1, weeks + 1):
+        order = team_ids[:]
+        rng.shuffle(order)
+        for game in range(len(order) // 2):
+            home, away = order[2 * game], order[2 * game + 1]
+            completed = week <= completed_weeks
+            home_score, away_score = rng.randint(3, 42), rng.randint(3, 42)
+            line = rng.randint(1, 10) + rng.choice((0, 0.5))
+            odds = {
+                "provider": {"id": "58", "name": "ESPN BET"},
+                "details": f"T{home if rng.random() < 0.6 else away} -{line:g}".replace(".5", "½"),
+                "overUnder": round(rng.uniform(37, 52), 1),
+                "spread": -line if rng.random() < 0.5 else None,
+            }
+            event = {
+                "id": f"{event_prefix}{week:02d}{game:02d}",
+                "uid": f"s:20~l:28~e:{event_prefix}{week:02d}{game:02d}",
+                "date": f"{season}-09-{(week % 28) + 1:02d}T17:00Z",
+                "name": f"Team {away} at Team {home}",
+                "shortName": f"T{away} @ T{home}",
+                "season": {"year": season, "type": 2, "displayName": str(season)},
+                "seasonType": {"id": "2", "type": 2, "name": "Regular Season"},
+                "week": {"number": week, "text": f"Week {week}"},
+                "timeValid": True,
+                "status": {
+                    "clock": 0.0,
+                    "period": 4 if completed else 0,
+                    "type": {"id": "3" if completed else "1", "state": "post" if completed else "pre", "completed": completed},
+                },
+                "competitions": [{
+                    "id": f"{event_prefix}{week:02d}{game:02d}",
+                    "neutralSite": False,
+                    "venue": {"fullName": f"Team {home} Stadium", "address": {"city": "City", "state": "ST"}},
+                    "broadcasts": [{"type": {"shortName": "TV"}, "media": {"shortName": rng.choice(NETWORKS)}}],
+                    "competitors": [
+                        _competitor(home, True, home_score, home_score > away_score, completed),
+                        _competitor(away, False, away_score, away_score > home_score, completed),
+                    ],
+                    "odds": [odds] if rng.random() < 0.9 else [],
+                }],
+            }
+            schedules[home].append(event)
+            schedules[away].append(event)
+    return schedules
+
+
+def synthesize(
+    directory: Path | str,
+    leagues: int = 1,
+    weeks: int = 18,
+    completed_weeks: int = 7,
+    season: int = 2025,
+    seed: int = 0,
+) -> int:
+    """Write a complete, consistent set of ESPN fixtures; returns the file count."""
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    teams: List[Dict[str, Any]] = []
+    scoreboard_events: List[Dict[str, Any]] = []
+    written = 0
+    for league in range(leagues):
+        team_ids = [str(league * 100 + team_id) for team_id in ESPN_TEAM_IDS]
+        teams += [{"id": team_id, "displayName": f"Team {team_id}", "abbreviation": f"T{team_id}"} for team_id in team_ids]
+        schedules = league_schedule(rng, team_ids, f"40{league:02d}", weeks, completed_weeks, season)
+        for team_id in team_ids:
+            events = schedules[team_id]
+            played = [event for event in events if event["status"]["type"]["completed"]]
+            wins = sum(1 for event in played for c in event["competitions"][0]["competitors"] if c["team"]["id"] == team_id and c["winner"])
+            ties = rng.randint(0, 1) if played else 0
+            losses = max(len(played) - wins - ties, 0)
+            _write(directory, STATS_URL_TEMPLATE.format(team_id=team_id), stats_payload(rng, wins, losses, ties))
+            _write(directory, SCHEDULE_URL_TEMPLATE.format(team_id=team_id), {"team": {"id": team_id}, "events": events})
+            past = [
+                {
+                    "spreadWinner": {"$ref": f"http://sports.core.api.espn.com/v2/sports/football/leagues/nfl/teams/{rng.choice(team_ids)}"},
+                    "lineDate": f"{season - 1}-10-01T00:00Z",
+                    "totalLine": round(rng.uniform(37, 52), 1),
+                }
+                for _ in range(134)
+            ]
+            _write(directory, PAST_PERFORMANCE_URL_TEMPLATE.format(team_id=team_id), {"count": len(past), "items": past})
+            written += 3
+            scoreboard_events += [
+                event for event in events
+                if event["week"]["number"] == completed_weeks + 1
+                and event["competitions"][0]["competitors"][0]["team"]["id"] == team_id
+            ]
+    _write(directory, TEAMS_URL, {"count": len(teams), "items": teams})
+    _write(directory, SCOREBOARD_URL, {"week": {"number": completed_weeks + 1}, "events": scoreboard_events})
+    return written + 2
+
+
+def seasons(directory: Path | str, count: int, first: int = 2000, seed: int = 0, template: Path | None = None) -> List[Path]:
+    """Write ``count`` season CSVs shaped like the real one, with reseeded scores."""
+
+    template = template or REPO_ROOT / "data" / "2025_scores.csv"
+    with template.open(newline="") as handle:
+        rows = list(csv.reader(handle))
+    header, body = rows[0], rows[1:]
+    column = {name: position for position, name in enumerate(header)}
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for year in range(first, first + count):
+        path = directory / f"{year}_scores.csv"
+        with path.open("w", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(header)
+            for row in body:
+                row = row[:]
+                row[column["Season"]] = str(year)
+                if row[column["AwayScore"]] and row[column["HomeScore"]]:
+                    away, home = rng.randint(3, 42), rng.randint(3, 42)
+                    row[column["AwayScore"]], row[column["HomeScore"]] = str(away), str(home)
+                    row[column["AwayWin"]], row[column["HomeWin"]] = str(int(away > home)), str(int(home > away))
+                writer.writerow(row)
+        paths.append(path)
+    return paths
+
+
+def record(directory: Path | str) -> int:
+    """Fetch the live ESPN documents through a throwaway cache and export them."""
+
+    from pickem_cache import CachingTransport, ResponseCache, TTLPolicy
+    from pickem_http import FetchEngine, RequestsTransport
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(tmp)
+        engine = FetchEngine(CachingTransport(RequestsTransport(), cache, TTLPolicy(CACHE_TTLS)))
+        build_team_profiles(engine)
+        engine.fetch_json(SCOREBOARD_URL)
+        cache.flush()
+        return cache.export_fixtures(directory)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    recorder = commands.add_parser("record", help="Record live ESPN payloads")
+    recorder.add_argument("--output", required=True, help="Fixture directory to write")
+    synth = commands.add_parser("synthesize", help="Write synthetic ESPN payloads")
+    synth.add_argument("--output", required=True, help="Fixture directory to write")
+    synth.add_argument("--leagues", type=int, default=1, help="Copies of the 32-team league")
+    synth.add_argument("--weeks", type=int, default=18)
+    synth.add_argument("--completed-weeks", type=int, default=7, help="Weeks whose games are final")
+    synth.add_argument("--seed", type=int, default=0)
+    season_csvs = commands.add_parser("seasons", help="Write synthetic season CSVs")
+    season_csvs.add_argument("--output", required=True, help="Directory for <YEAR>_scores.csv files")
+    season_csvs.add_argument("--count", type=int, default=10, help="Number of seasons")
+    season_csvs.add_argument("--first", type=int, default=2000, help="First season year")
+    season_csvs.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        written = record(args.output)
+    elif args.command == "synthesize":
+        written = synthesize(args.output, args.leagues, args.weeks, args.completed_weeks, seed=args.seed)
+    else:
+        written = len(seasons(args.output, args.count, args.first, args.seed))
+    print(f"Wrote {written} file(s) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
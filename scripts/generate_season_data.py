@@ -1,16 +1,53 @@
 #!/usr/bin/env python3
-"""Convert a CSV schedule into the mobile client mock JSON structure."""
+"""Convert a CSV schedule into the mobile client mock JSON structure.
+
+Batch mode (``--inputs``) converts a directory or glob of season CSVs in a
+process pool, writes ``season<YEAR>.json`` per season plus an ``index.json``
+and skips seasons whose CSV and generator version are unchanged.
+
+``--binary-output`` additionally writes the games to a memory-mappable
+columnar store (see ``pickem_season_store``; requires numpy). In batch mode
+each season gets a ``season<YEAR>.pkseason`` next to its JSON and the path
+receives every indexed season merged into one store.
+
+``--shards`` also writes the season as one file per week for clients that
+show a single week at a time: ``season<YEAR>-w<NN>.<hash>.json`` holds that
+week's matchups (compact JSON, named by a hash of its content) and
+``season<YEAR>.manifest.json`` lists ``weeks``, ``weeklySummaries`` and the
+shard file of every week. Unchanged weeks keep their file name, so clients can
+cache shards forever; only changed weeks are rewritten. The manifest is
+replaced only after the season JSON, and shards are deleted once neither the
+new nor the previous manifest references them, so a client still holding the
+previous manifest can fetch its shards.
+"""
 
 from __future__ import annotations
 
 import argparse
 import csv
+import glob
+import hashlib
 import json
+import re
+import sys
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from collections import defaultdict
-from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, time, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+from pickem_files import atomic_open, atomic_write
+from pickem_state import TeamState
+
+# Bump whenever the output schema or derivation changes so batch mode
+# regenerates every season instead of skipping unchanged CSVs.
+GENERATOR_VERSION = "1"
+INDEX_FILENAME = "index.json"
+# Hex digits of the content hash in week shard file names.
+SHARD_HASH_LENGTH = 16
 
 TEAM_META: Dict[str, Dict[str, str]] = {
     "49ers": {"id": "sf", "name": "San Francisco 49ers", "abbr": "SF", "primary": "#b00101", "secondary": "#ddb945"},
@@ -85,13 +122,60 @@ MISSING_TEAMS = REQUIRED_TEAMS - set(TEAM_META)
 if MISSING_TEAMS:
     raise SystemExit(f"Missing metadata for: {sorted(MISSING_TEAMS)}")
 
-@dataclass
-class TeamRecord:
-    wins: int = 0
-    losses: int = 0
 
-    def as_text(self) -> str:
-        return f"{self.wins}-{self.losses}"
+class TeamTable(NamedTuple):
+    """Column-oriented copy of ``TEAM_META`` addressed by a small team index.
+
+    Every value (including the derived venue name) is built once, so per-row
+    code only indexes tuples and references the same string objects.
+    """
+
+    nicknames: Tuple[str, ...]
+    index: Mapping[str, int]
+    ids: Tuple[str, ...]
+    names: Tuple[str, ...]
+    abbrs: Tuple[str, ...]
+    primary: Tuple[str, ...]
+    secondary: Tuple[str, ...]
+    venues: Tuple[str, ...]
+
+    @classmethod
+    def compile(cls, meta: Mapping[str, Mapping[str, str]]) -> "TeamTable":
+        nicknames = tuple(meta)
+
+        def column(key: str) -> Tuple[str, ...]:
+            return tuple(meta[team][key] for team in nicknames)
+
+        return cls(
+            nicknames=nicknames,
+            index={team: position for position, team in enumerate(nicknames)},
+            ids=column("id"),
+            names=column("name"),
+            abbrs=column("abbr"),
+            primary=column("primary"),
+            secondary=column("secondary"),
+            venues=tuple(f"{meta[team]['name']} Stadium" for team in nicknames),
+        )
+
+
+TEAM_TABLE = TeamTable.compile(TEAM_META)
+
+MATCHUP_KEYS = (
+    "id", "weekId", "kickoff", "venue", "network", "spread", "favorite", "status", "homeTeam", "awayTeam",
+)
+TEAM_KEYS = ("id", "name", "abbr", "record", "primaryColor", "secondaryColor", "score")
+
+
+def parse_workers(value: str) -> int:
+    """Accept a worker count of at least 1; ``ProcessPoolExecutor`` rejects 0."""
+
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        raise argparse.ArgumentTypeError(f"expected at least 1 worker, got {value!r}")
+    return workers
 
 
 def parse_args() -> argparse.Namespace:
@@ -99,6 +183,23 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--input", default="data/2025_scores.csv", help="CSV generated from the ESPN/NFL scrape")
     parser.add_argument("--output", default="mobile/src/data/season2025.json", help="Destination JSON file")
     parser.add_argument("--season", type=int, default=2025, help="Season year for computing ISO dates")
+    parser.add_argument("--compact", action="store_true", help="Write compact JSON instead of 2-space indentation")
+    parser.add_argument("--inputs", help="Batch mode: directory or glob of season CSVs to convert")
+    parser.add_argument("--output-dir", default="mobile/src/data", help="Batch mode: destination for season<YEAR>.json and index.json")
+    parser.add_argument(
+        "--workers", type=parse_workers, default=None, help="Batch mode: number of worker processes (default: CPU count)"
+    )
+    parser.add_argument("--force", action="store_true", help="Batch mode: regenerate seasons even if unchanged")
+    parser.add_argument("--binary-output", help="Also write a columnar binary season store (.pkseason) to this path")
+    parser.add_argument(
+        "--error-report",
+        help="Write rejected CSV rows to this JSON-lines file instead of listing them on stderr",
+    )
+    parser.add_argument(
+        "--shards",
+        action="store_true",
+        help="Also write per-week shard files and a season<YEAR>.manifest.json next to the season JSON",
+    )
     return parser.parse_args()
 
 
@@ -109,119 +210,744 @@ def parse_score(value: str | None) -> int | None:
         return None
 
 
-def main() -> None:
-    args = parse_args()
-    input_path = Path(args.input)
-    output_path = Path(args.output)
+@lru_cache(maxsize=4096)
+def game_date(date_token: str, season: int, tbd_week: int = 0) -> Tuple[datetime, str]:
+    """Resolve a CSV date token to the game date and its kickoff ISO string.
+
+    Seasons reuse a few dozen distinct tokens, so each is parsed once. ``TBD``
+    dates fall on the week's Thursday and are keyed by ``tbd_week``.
+    """
+
+    if tbd_week:
+        dt = datetime(season, 9, 4, tzinfo=timezone.utc) + timedelta(days=7 * (tbd_week - 1))
+    else:
+        dt = datetime.strptime(f"{date_token}-{season}", "%d-%b-%Y").replace(tzinfo=timezone.utc)
+    return dt, iso_z(dt.replace(hour=17, minute=0))
+
+
+class RowError(NamedTuple):
+    """A CSV row that was rejected during ingestion."""
+
+    source: str
+    line: int
+    reason: str
+    row: Tuple[str, ...]
+
+    def to_json(self) -> str:
+        return json.dumps(self._asdict())
+
+
+class SeasonCsvError(ValueError):
+    """Raised for a season CSV that cannot be ingested at all, e.g. a bad header."""
+
+    def __init__(self, error: RowError) -> None:
+        super().__init__(f"{error.source}:{error.line}: {error.reason}")
+        self.error = error
+
+
+# CSV columns read by ingestion; the first three must be present.
+REQUIRED_COLUMNS = ("Week", "HomeTeam", "AwayTeam")
+OPTIONAL_COLUMNS = ("Date", "Day", "HomeScore", "AwayScore", "GameStatus")
+NO_SCORE = -1
 
-    if not input_path.exists():
-        raise SystemExit(f"Input CSV not found: {input_path}")
 
-    records: Dict[str, TeamRecord] = {team: TeamRecord() for team in TEAM_META}
-    matchups_by_week: Dict[int, List[dict]] = defaultdict(list)
-    week_dates: Dict[int, List[datetime]] = defaultdict(list)
-    base_week1 = datetime(args.season, 9, 4, tzinfo=timezone.utc)
+class SeasonRows:
+    """Typed columns of the accepted game rows of one season CSV, in file order.
 
+    Weeks, team indices (into ``TEAM_TABLE``), scores (``NO_SCORE`` when
+    missing) and the final flag live in compact arrays; dates and network
+    labels are indices into small tables of distinct values. ``lines`` keeps
+    each row's CSV line number for error reports.
+    """
+
+    __slots__ = ("lines", "weeks", "home", "away", "home_scores", "away_scores", "final", "dates", "date_values", "days", "day_values")
+
+    def __init__(self) -> None:
+        self.lines = array("I")
+        self.weeks = array("B")
+        self.home = array("B")
+        self.away = array("B")
+        self.home_scores = array("h")
+        self.away_scores = array("h")
+        self.final = bytearray()
+        self.dates = array("H")
+        self.date_values: List[Tuple[datetime, str]] = []
+        self.days = array("H")
+        self.day_values: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.weeks)
+
+
+def _week_number(label: str) -> int:
+    parts = label.split()
+    if len(parts) != 2 or not parts[1].isdigit() or not 1 <= int(parts[1]) <= 255:
+        raise ValueError(f"unrecognized week {label!r}")
+    return int(parts[1])
+
+
+def _score(value: str) -> int:
+    score = parse_score(value)
+    if score is None:
+        return NO_SCORE
+    if not 0 <= score < 1 << 15:
+        raise ValueError(f"score out of range {value!r}")
+    return score
+
+
+def read_season_rows(input_path: Path, season: int, errors: List[RowError]) -> SeasonRows:
+    """Parse a season CSV into :class:`SeasonRows`, collecting bad rows in ``errors``.
+
+    Column positions are resolved from the header once and rows are read
+    with ``csv.reader``. Week labels, date tokens, scores and network labels
+    repeat across rows, so each distinct value is parsed once. Rows without a
+    week or teams are skipped silently as before; rows with an unknown team,
+    week or date are reported instead of aborting the run. A header without
+    the :data:`REQUIRED_COLUMNS` raises :class:`SeasonCsvError`, so the
+    previous output is never replaced by an empty season.
+    """
+
+    rows = SeasonRows()
+    source = str(input_path)
     with input_path.open(newline="") as handle:
-        reader = csv.DictReader(handle)
+        reader = csv.reader(handle)
+        header = [name.strip() for name in next(reader, [])]
+        position = {name: index for index, name in enumerate(header)}
+        missing = [name for name in REQUIRED_COLUMNS if name not in position]
+        if missing:
+            raise SeasonCsvError(RowError(source, 1, f"missing column(s) {', '.join(missing)}", tuple(header)))
+        width = len(header)
+        week_col, home_col, away_col = (position[name] for name in REQUIRED_COLUMNS)
+        # Rows are cut or padded to the header width plus one cell that is
+        # always "", which absent optional columns read from.
+        date_col, day_col, home_score_col, away_score_col, status_col = (
+            position.get(name, width) for name in OPTIONAL_COLUMNS
+        )
+        team_index = TEAM_TABLE.index
+        weeks: Dict[str, int] = {}
+        dates: Dict[Tuple[str, int], int] = {}
+        days: Dict[str, int] = {}
+        scores: Dict[str, int] = {}
+
         for row in reader:
-            week_label = (row.get("Week") or "").strip()
-            home = (row.get("HomeTeam") or "").strip()
-            away = (row.get("AwayTeam") or "").strip()
+            fields = row[:width]
+            fields += [""] * (width + 1 - len(fields))
+            week_label = fields[week_col].strip()
+            home = fields[home_col].strip()
+            away = fields[away_col].strip()
             if not week_label or not home or not away:
                 continue
-            if home not in TEAM_META or away not in TEAM_META:
-                raise SystemExit(f"Missing metadata for {home} or {away}")
-
-            week_num = int(week_label.split()[1])
-            date_token = (row.get("Date") or "").strip()
-            if date_token.upper() == "TBD":
-                dt = base_week1 + timedelta(days=7 * (week_num - 1))
-            else:
-                dt = datetime.strptime(f"{date_token}-{args.season}", "%d-%b-%Y").replace(tzinfo=timezone.utc)
-            kickoff = dt.replace(hour=17, minute=0)
-            week_dates[week_num].append(dt)
-
-            away_meta = TEAM_META[away]
-            home_meta = TEAM_META[home]
-            away_team = {
-                "id": away_meta["id"],
-                "name": away_meta["name"],
-                "abbr": away_meta["abbr"],
-                "record": records[away].as_text(),
-                "primaryColor": away_meta["primary"],
-                "secondaryColor": away_meta["secondary"],
-                "score": parse_score(row.get("AwayScore")),
-            }
-            home_team = {
-                "id": home_meta["id"],
-                "name": home_meta["name"],
-                "abbr": home_meta["abbr"],
-                "record": records[home].as_text(),
-                "primaryColor": home_meta["primary"],
-                "secondaryColor": home_meta["secondary"],
-                "score": parse_score(row.get("HomeScore")),
-            }
+            try:
+                week_num = weeks.get(week_label)
+                if week_num is None:
+                    week_num = weeks[week_label] = _week_number(week_label)
+                h = team_index.get(home)
+                a = team_index.get(away)
+                if h is None or a is None:
+                    raise ValueError(f"unknown team {home if h is None else away!r}")
+
+                date_token = fields[date_col].strip()
+                tbd_week = week_num if date_token.upper() == "TBD" else 0
+                date_key = (date_token, tbd_week)
+                date_index = dates.get(date_key)
+                if date_index is None:
+                    try:
+                        resolved = game_date("TBD" if tbd_week else date_token, season, tbd_week)
+                    except ValueError:
+                        raise ValueError(f"invalid date {date_token!r}") from None
+                    date_index = dates[date_key] = len(rows.date_values)
+                    rows.date_values.append(resolved)
+
+                home_token, away_token = fields[home_score_col], fields[away_score_col]
+                home_score = scores.get(home_token)
+                if home_score is None:
+                    home_score = scores[home_token] = _score(home_token)
+                away_score = scores.get(away_token)
+                if away_score is None:
+                    away_score = scores[away_token] = _score(away_token)
+            except ValueError as exc:
+                errors.append(RowError(source, reader.line_num, str(exc), tuple(row)))
+                continue
+
+            day = fields[day_col].strip() or "TBD"
+            day_index = days.get(day)
+            if day_index is None:
+                day_index = days[day] = len(rows.day_values)
+                rows.day_values.append(day)
+
+            rows.lines.append(reader.line_num)
+            rows.weeks.append(week_num)
+            rows.home.append(h)
+            rows.away.append(a)
+            rows.home_scores.append(home_score)
+            rows.away_scores.append(away_score)
+            rows.final.append(fields[status_col].strip().lower() == "final")
+            rows.dates.append(date_index)
+            rows.days.append(day_index)
+    return rows
+
+
+def report_row_errors(errors: List[RowError], report_path: Optional[Path] = None, limit: int = 20) -> None:
+    """Write rejected rows to ``report_path`` (JSON lines) or warn about them on stderr."""
+
+    if not errors:
+        return
+    if report_path is not None:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text("".join(error.to_json() + "\n" for error in errors), encoding="utf-8")
+        print(f"warning: rejected {len(errors)} row(s); see {report_path}", file=sys.stderr)
+        return
+    for error in errors[:limit]:
+        print(f"warning: {error.source}:{error.line}: {error.reason}", file=sys.stderr)
+    if len(errors) > limit:
+        print(f"warning: ... and {len(errors) - limit} more rejected row(s)", file=sys.stderr)
+
+
+def iter_matchups(
+    input_path: Path,
+    season: int,
+    errors: Optional[List[RowError]] = None,
+) -> Iterator[Tuple[int, datetime, dict]]:
+    """Yield ``(week, game date, matchup)`` for every accepted game row in CSV order.
+
+    Rejected rows are appended to ``errors``; without a list they are
+    reported on stderr.
+    """
+
+    table = TEAM_TABLE
+    records = [TeamState() for _ in table.nicknames]
+    week_counts: Dict[int, int] = defaultdict(int)
+    collected: List[RowError] = [] if errors is None else errors
+    rows = read_season_rows(input_path, season, collected)
+    if errors is None:
+        report_row_errors(collected)
+
+    for week_num, h, a, home_score, away_score, final, date_index, day_index in zip(
+        rows.weeks, rows.home, rows.away, rows.home_scores, rows.away_scores, rows.final, rows.dates, rows.days
+    ):
+        dt, kickoff = rows.date_values[date_index]
+        away_team = {
+            "id": table.ids[a],
+            "name": table.names[a],
+            "abbr": table.abbrs[a],
+            "record": records[a].record_text(),
+            "primaryColor": table.primary[a],
+            "secondaryColor": table.secondary[a],
+            "score": None if away_score == NO_SCORE else away_score,
+        }
+        home_team = {
+            "id": table.ids[h],
+            "name": table.names[h],
+            "abbr": table.abbrs[h],
+            "record": records[h].record_text(),
+            "primaryColor": table.primary[h],
+            "secondaryColor": table.secondary[h],
+            "score": None if home_score == NO_SCORE else home_score,
+        }
+        status = "final" if final else "scheduled"
+
+        week_counts[week_num] += 1
+        matchup = {
+            "id": f"{season}-w{week_num}-{week_counts[week_num]}",
+            "weekId": week_num,
+            "kickoff": kickoff,
+            "venue": table.venues[h],
+            "network": rows.day_values[day_index],
+            "spread": "EVEN",
+            "favorite": "even",
+            "status": status,
+            "homeTeam": home_team,
+            "awayTeam": away_team,
+        }
+        yield week_num, dt, matchup
+
+        # Like the original generator, any row with both scores counts toward
+        # the records, whatever its GameStatus says.
+        if home_score != NO_SCORE and away_score != NO_SCORE:
+            records[h].apply(home_score, away_score)
+            records[a].apply(away_score, home_score)
+
+
+def iso_z(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
 
-            status_raw = (row.get("GameStatus") or "").strip().lower()
-            status = "final" if status_raw == "final" else "scheduled"
-
-            matchup = {
-                "id": f"{args.season}-w{week_num}-{len(matchups_by_week[week_num]) + 1}",
-                "weekId": week_num,
-                "kickoff": kickoff.isoformat().replace("+00:00", "Z"),
-                "venue": f"{home_meta['name']} Stadium",
-                "network": (row.get("Day") or "TBD").strip() or "TBD",
-                "spread": "EVEN",
-                "favorite": "even",
-                "status": status,
-                "homeTeam": home_team,
-                "awayTeam": away_team,
+_encode_string: Callable[[str], str] = json.encoder.encode_basestring_ascii  # type: ignore[attr-defined]
+
+
+class MatchupRenderer:
+    """Serialize matchup dicts exactly as ``json.dumps`` would at a fixed depth.
+
+    ``json.dumps`` with indentation runs the pure-Python encoder and rebuilds
+    every team's static metadata text for every row. The renderer instead
+    interns one pre-rendered template per team (everything except the record
+    and score) and joins it with precomputed key prefixes. Dicts that do not
+    have the expected layout fall back to ``json.dumps``.
+    """
+
+    def __init__(self, indent: Optional[int], depth: int) -> None:
+        self.indent = indent
+        self.depth = depth
+        self._compact = json.JSONEncoder(separators=(",", ":"))
+        self._key_prefix = {key: self._prefix(key, depth + 1) for key in MATCHUP_KEYS}
+        self._close = self._newline(depth) + "}"
+        self._team_templates: Dict[Tuple[str, ...], Tuple[str, str, str]] = {}
+
+    def _newline(self, depth: int) -> str:
+        return "" if self.indent is None else "\n" + " " * (self.indent * depth)
+
+    def _prefix(self, key: str, depth: int) -> str:
+        separator = ":" if self.indent is None else ": "
+        return f"{self._newline(depth)}{_encode_string(key)}{separator}"
+
+    def dumps(self, value: object, depth: int) -> str:
+        if self.indent is None:
+            return self._compact.encode(value)
+        return json.dumps(value, indent=self.indent).replace("\n", self._newline(depth))
+
+    def _scalar(self, value: object) -> str:
+        if type(value) is str:
+            return _encode_string(value)
+        if type(value) is int:
+            return int.__repr__(value)
+        if value is None:
+            return "null"
+        return self.dumps(value, self.depth + 1)
+
+    def _team(self, team: dict) -> str:
+        if tuple(team) != TEAM_KEYS:
+            return self.dumps(team, self.depth + 1)
+        static = (team["id"], team["name"], team["abbr"], team["primaryColor"], team["secondaryColor"])
+        template = self._team_templates.get(static)
+        if template is None:
+            depth = self.depth + 2
+            head = "{" + ",".join(
+                self._prefix(key, depth) + _encode_string(value)
+                for key, value in zip(TEAM_KEYS[:3], static[:3])
+            ) + "," + self._prefix("record", depth)
+            middle = "," + ",".join(
+                self._prefix(key, depth) + _encode_string(value)
+                for key, value in zip(TEAM_KEYS[4:6], static[3:])
+            ) + "," + self._prefix("score", depth)
+            template = self._team_templates[static] = (head, middle, self._newline(depth - 1) + "}")
+        head, middle, tail = template
+        return head + self._scalar(team["record"]) + middle + self._scalar(team["score"]) + tail
+
+    def render(self, matchup: dict) -> str:
+        if tuple(matchup) != MATCHUP_KEYS:
+            return self.dumps(matchup, self.depth)
+        prefix = self._key_prefix
+        parts = ["{"]
+        for key in MATCHUP_KEYS[:-2]:
+            parts.append(prefix[key] + self._scalar(matchup[key]) + ",")
+        parts.append(prefix["homeTeam"] + self._team(matchup["homeTeam"]) + ",")
+        parts.append(prefix["awayTeam"] + self._team(matchup["awayTeam"]))
+        parts.append(self._close)
+        return "".join(parts)
+
+
+class SeasonJsonWriter:
+    """Stream the season payload to disk without holding the matchups in memory.
+
+    Each matchup is serialized as soon as it is added and appended to a spool
+    file next to the output; only byte offsets and per-week date bounds stay in
+    memory. :meth:`commit` assembles ``weeks``, ``matchupsByWeek`` and
+    ``weeklySummaries`` into a temporary file and renames it over the output,
+    so readers never observe a partially written file. With ``indent=2`` the
+    bytes are identical to ``json.dumps(payload, indent=2)``; ``indent=None``
+    writes compact JSON.
+    """
+
+    def __init__(self, output_path: Path, indent: Optional[int] = 2, shards: bool = False) -> None:
+        self.output_path = output_path
+        self.indent = indent
+        self.key_separator = ": " if indent is not None else ":"
+        self._renderer = MatchupRenderer(indent, depth=3)
+        self._spans: Dict[int, List[Tuple[int, int]]] = {}
+        self._bounds: Dict[int, Tuple[datetime, datetime]] = {}
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._spool = tempfile.TemporaryFile(dir=output_path.parent, prefix=f".{output_path.name}.", suffix=".spool")
+        # Week shards are compact, so their matchups are spooled a second time.
+        self._shard_renderer = MatchupRenderer(None, depth=0) if shards else None
+        self._shard_spans: Dict[int, List[Tuple[int, int]]] = {}
+        self._shard_spool = (
+            tempfile.TemporaryFile(dir=output_path.parent, prefix=f".{output_path.name}.", suffix=".spool")
+            if shards
+            else None
+        )
+        self._committed = False
+
+    def __enter__(self) -> "SeasonJsonWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:  # type: ignore[no-untyped-def]
+        try:
+            if exc_type is None and not self._committed:
+                self.commit()
+        finally:
+            self._spool.close()
+            if self._shard_spool is not None:
+                self._shard_spool.close()
+
+    @property
+    def week_count(self) -> int:
+        return len(self._spans)
+
+    def _newline(self, depth: int) -> str:
+        return "" if self.indent is None else "\n" + " " * (self.indent * depth)
+
+    def _dumps(self, value: object, depth: int) -> str:
+        return self._renderer.dumps(value, depth)
+
+    def add(self, week_num: int, game_date: datetime, matchup: dict) -> None:
+        data = self._renderer.render(matchup).encode("utf-8")
+        offset = self._spool.tell()
+        self._spool.write(data)
+        self._spans.setdefault(week_num, []).append((offset, len(data)))
+        if self._shard_renderer is not None and self._shard_spool is not None:
+            data = self._shard_renderer.render(matchup).encode("utf-8")
+            offset = self._shard_spool.tell()
+            self._shard_spool.write(data)
+            self._shard_spans.setdefault(week_num, []).append((offset, len(data)))
+        bounds = self._bounds.get(week_num)
+        if bounds is None:
+            self._bounds[week_num] = (game_date, game_date)
+        else:
+            self._bounds[week_num] = (min(bounds[0], game_date), max(bounds[1], game_date))
+
+    def week_entries(self) -> Tuple[List[dict], Dict[str, dict]]:
+        weeks = []
+        weekly_summaries: Dict[str, dict] = {}
+        for week_num in sorted(self._spans):
+            first, last = self._bounds[week_num]
+            games = len(self._spans[week_num])
+            weeks.append({
+                "id": week_num,
+                "weekNumber": week_num,
+                "startDate": iso_z(first.replace(hour=0, minute=0)),
+                "endDate": iso_z(last.replace(hour=23, minute=59)),
+                "lockDate": iso_z(first.replace(hour=17, minute=0)),
+                "isLocked": False,
+            })
+            weekly_summaries[str(week_num)] = {
+                "correctPicks": 0,
+                "totalGames": games,
+                "rank": 0,
+                "potentialPoints": games * 10,
+                "bonusTokens": 0,
             }
-            matchups_by_week[week_num].append(matchup)
-
-            home_score = home_team["score"]
-            away_score = away_team["score"]
-            if isinstance(home_score, int) and isinstance(away_score, int):
-                if home_score > away_score:
-                    records[home].wins += 1
-                    records[away].losses += 1
-                elif away_score > home_score:
-                    records[away].wins += 1
-                    records[home].losses += 1
-
-    weeks = []
-    weekly_summaries: Dict[str, dict] = {}
-    for week_num in sorted(matchups_by_week):
-        dates = week_dates[week_num]
-        start_dt = min(dates).replace(hour=0, minute=0)
-        end_dt = max(dates).replace(hour=23, minute=59)
-        lock_dt = min(dates).replace(hour=17, minute=0)
-        weeks.append({
-            "id": week_num,
-            "weekNumber": week_num,
-            "startDate": start_dt.isoformat().replace("+00:00", "Z"),
-            "endDate": end_dt.isoformat().replace("+00:00", "Z"),
-            "lockDate": lock_dt.isoformat().replace("+00:00", "Z"),
-            "isLocked": False,
-        })
-        weekly_summaries[str(week_num)] = {
-            "correctPicks": 0,
-            "totalGames": len(matchups_by_week[week_num]),
-            "rank": 0,
-            "potentialPoints": len(matchups_by_week[week_num]) * 10,
-            "bonusTokens": 0,
+        return weeks, weekly_summaries
+
+    def _write_matchups(self, out: BinaryIO) -> None:
+        if not self._spans:
+            out.write(b"{}")
+            return
+        out.write(b"{")
+        for week_index, week_num in enumerate(sorted(self._spans)):
+            prefix = "," if week_index else ""
+            out.write(f"{prefix}{self._newline(2)}{json.dumps(str(week_num))}{self.key_separator}[".encode("utf-8"))
+            for game_index, (offset, length) in enumerate(self._spans[week_num]):
+                out.write(f"{',' if game_index else ''}{self._newline(3)}".encode("utf-8"))
+                self._spool.seek(offset)
+                out.write(self._spool.read(length))
+            out.write(f"{self._newline(2)}]".encode("utf-8"))
+        out.write(f"{self._newline(1)}}}".encode("utf-8"))
+
+    def write_shards(self, season: int) -> str:
+        """Write one content-named file per week plus the manifest; return its name.
+
+        The season JSON is committed first, so a failure never leaves a new
+        manifest next to an old season file. Shards that already exist are
+        left untouched. Afterwards shards of ``season`` referenced by neither
+        the new nor the previous manifest are removed.
+        """
+
+        if self._shard_spool is None:
+            raise ValueError("writer was created without shards=True")
+        if not self._committed:
+            self.commit()
+        directory = self.output_path.parent
+        weeks, weekly_summaries = self.week_entries()
+        shards: Dict[str, dict] = {}
+        for week_num in sorted(self._shard_spans):
+            parts = []
+            for offset, length in self._shard_spans[week_num]:
+                self._shard_spool.seek(offset)
+                parts.append(self._shard_spool.read(length))
+            body = b'{"weekId":%d,"matchups":[%s]}\n' % (week_num, b",".join(parts))
+            digest = hashlib.sha256(body).hexdigest()
+            name = f"season{season}-w{week_num:02d}.{digest[:SHARD_HASH_LENGTH]}.json"
+            if not (directory / name).exists():
+                atomic_write(directory / name, body)
+            shards[str(week_num)] = {"file": name, "games": len(parts), "bytes": len(body), "sha256": digest}
+
+        manifest_name = f"season{season}.manifest.json"
+        try:
+            previous = json.loads((directory / manifest_name).read_text(encoding="utf-8"))["shards"]
+            kept = {shard["file"] for shard in previous.values()}
+        except (FileNotFoundError, KeyError, TypeError, AttributeError, ValueError):
+            kept = set()
+        manifest = {
+            "season": season,
+            "generatorVersion": GENERATOR_VERSION,
+            "weeks": weeks,
+            "weeklySummaries": weekly_summaries,
+            "shards": shards,
         }
+        atomic_write(directory / manifest_name, json.dumps(manifest, indent=self.indent) + "\n")
+
+        kept.update(shard["file"] for shard in shards.values())
+        for stale in directory.glob(f"season{season}-w*.json"):
+            if stale.name not in kept:
+                stale.unlink(missing_ok=True)
+        return manifest_name
+
+    def commit(self) -> None:
+        weeks, weekly_summaries = self.week_entries()
+        sep = self.key_separator
+        with atomic_open(self.output_path, fsync=True) as out:
+            out.write(f"{{{self._newline(1)}\"weeks\"{sep}{self._dumps(weeks, 1)},".encode("utf-8"))
+            out.write(f"{self._newline(1)}\"matchupsByWeek\"{sep}".encode("utf-8"))
+            self._write_matchups(out)
+            out.write(f",{self._newline(1)}\"weeklySummaries\"{sep}{self._dumps(weekly_summaries, 1)}".encode("utf-8"))
+            out.write(f"{self._newline(0)}}}\n".encode("utf-8"))
+        self._committed = True
+
+
+_NICKNAME_BY_ID = dict(zip(TEAM_TABLE.ids, TEAM_TABLE.nicknames))
+
+
+def generate_season(
+    input_path: Path,
+    output_path: Path,
+    season: int,
+    compact: bool = False,
+    store_path: Optional[Path] = None,
+    shards: bool = False,
+    errors: Optional[List[RowError]] = None,
+) -> int:
+    """Convert one season CSV and return the number of weeks written.
+
+    With ``store_path`` the games are also written as a binary season store;
+    ``shards`` adds the per-week files and manifest next to ``output_path``.
+    Rejected rows go to ``errors`` (see :func:`iter_matchups`).
+    """
+
+    builder = None
+    if store_path is not None:
+        from pickem_season_store import SeasonStoreBuilder
+
+        builder = SeasonStoreBuilder(TEAM_TABLE.nicknames)
+    with SeasonJsonWriter(output_path, indent=None if compact else 2, shards=shards) as writer:
+        for week_num, game_date, matchup in iter_matchups(input_path, season, errors):
+            writer.add(week_num, game_date, matchup)
+            if builder is not None:
+                home = matchup["homeTeam"]
+                away = matchup["awayTeam"]
+                builder.add(
+                    season,
+                    week_num,
+                    _NICKNAME_BY_ID[home["id"]],
+                    _NICKNAME_BY_ID[away["id"]],
+                    home["score"],
+                    away["score"],
+                    matchup["status"] == "final",
+                    int(game_date.replace(hour=17).timestamp()),
+                )
+        if shards:
+            writer.write_shards(season)
+    if builder is not None and store_path is not None:
+        builder.write(store_path)
+    return writer.week_count
 
-    payload = {
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def detect_season(path: Path) -> int:
+    """Read the season from the first data row, falling back to the file name."""
+
+    with path.open(newline="") as handle:
+        for row in csv.DictReader(handle):
+            value = (row.get("Season") or "").strip()
+            if value.isdigit():
+                return int(value)
+            break
+    match = re.search(r"(19|20)\d{2}", path.stem)
+    if match:
+        return int(match.group(0))
+    raise SystemExit(f"Cannot determine the season for {path}")
+
+
+def discover_inputs(spec: str) -> List[Path]:
+    candidate = Path(spec)
+    if candidate.is_dir():
+        return sorted(candidate.glob("*.csv"))
+    return sorted(Path(match) for match in glob.glob(spec))
+
+
+def _batch_job(
+    job: Tuple[str, str, int, bool, str, Optional[str], bool],
+) -> Tuple[Optional[Dict[str, Any]], List[RowError]]:
+    """Convert one season; the entry is ``None`` when the CSV was unreadable."""
+
+    input_name, output_name, season, compact, digest, store_name, shards = job
+    store_path = Path(store_name) if store_name else None
+    errors: List[RowError] = []
+    try:
+        weeks = generate_season(Path(input_name), Path(output_name), season, compact, store_path, shards, errors)
+    except SeasonCsvError as exc:
+        return None, [exc.error]
+    entry = {
+        "season": season,
+        "source": input_name,
+        "sourceHash": digest,
+        "file": Path(output_name).name,
         "weeks": weeks,
-        "matchupsByWeek": {str(k): v for k, v in sorted(matchups_by_week.items())},
-        "weeklySummaries": weekly_summaries,
+        "compact": compact,
+        "generatorVersion": GENERATOR_VERSION,
+        "rejectedRows": len(errors),
     }
+    if store_path is not None:
+        entry["binaryFile"] = store_path.name
+    if shards:
+        entry["manifestFile"] = f"season{season}.manifest.json"
+    return entry, errors
+
+
+def run_batch(
+    inputs: List[Path],
+    output_dir: Path,
+    compact: bool = False,
+    workers: Optional[int] = None,
+    force: bool = False,
+    binary_output: Optional[Path] = None,
+    shards: bool = False,
+) -> Dict[str, Any]:
+    """Convert several season CSVs in parallel and refresh the combined index.
+
+    With ``binary_output`` every season also gets a binary store and all of
+    them are merged into ``binary_output``. ``shards`` writes each season's
+    week shards and manifest into ``output_dir``. Rows rejected by the
+    converted seasons are returned under ``errors``; seasons whose CSV could
+    not be ingested at all are listed under ``failed`` and keep their previous
+    output and index entry.
+
+    Seasons already in the index but absent from ``inputs`` are kept as long
+    as their output file still exists, so a partial run only updates the
+    seasons it was given.
+    """
+
+    index_path = output_dir / INDEX_FILENAME
+    try:
+        previous = {entry["season"]: entry for entry in json.loads(index_path.read_text())["seasons"]}
+    except (FileNotFoundError, KeyError, ValueError):
+        previous = {}
+
+    entries: Dict[int, Dict[str, Any]] = {}
+    jobs: List[Tuple[str, str, int, bool, str, Optional[str], bool]] = []
+    for input_path in inputs:
+        season = detect_season(input_path)
+        if season in entries or any(job[2] == season for job in jobs):
+            raise SystemExit(f"Season {season} appears in more than one input ({input_path})")
+        output_path = output_dir / f"season{season}.json"
+        store_path = output_dir / f"season{season}.pkseason" if binary_output is not None else None
+        digest = file_digest(input_path)
+        known = previous.get(season)
+        unchanged = (
+            known is not None
+            and known.get("sourceHash") == digest
+            and known.get("generatorVersion") == GENERATOR_VERSION
+            and known.get("compact") == compact
+            and output_path.exists()
+            and (store_path is None or (known.get("binaryFile") == store_path.name and store_path.exists()))
+            and (not shards or (output_dir / known.get("manifestFile", "")).is_file())
+        )
+        if unchanged and not force:
+            entries[season] = {**known, "source": str(input_path)}
+        else:
+            store_name = str(store_path) if store_path is not None else None
+            jobs.append((str(input_path), str(output_path), season, compact, digest, store_name, shards))
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if jobs:
+        if len(jobs) == 1 or workers == 1:
+            results = [_batch_job(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_batch_job, jobs))
+        for entry, _ in results:
+            if entry is not None:
+                entries[entry["season"]] = entry
+    failed = sorted(job[2] for job in jobs if job[2] not in entries)
+    requested = set(entries)
+    for season, known in previous.items():
+        if season not in entries and (output_dir / known.get("file", f"season{season}.json")).is_file():
+            entries[season] = known
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(payload, indent=2) + "\n")
-    print(f"Wrote {output_path} with {len(weeks)} weeks")
+    index = {
+        "generatorVersion": GENERATOR_VERSION,
+        "seasons": [entries[season] for season in sorted(entries)],
+    }
+    atomic_write(index_path, json.dumps(index, indent=2) + "\n")
+
+    if binary_output is not None:
+        from pickem_season_store import merge_season_stores
+
+        stores = [output_dir / entries[season].get("binaryFile", "") for season in sorted(entries)]
+        merge_season_stores([path for path in stores if path.is_file()], binary_output)
+    return {
+        "generated": sorted(job[2] for job in jobs if job[2] not in failed),
+        "skipped": sorted(requested - {job[2] for job in jobs}),
+        "failed": failed,
+        "errors": [error for _, errors in results for error in errors] if jobs else [],
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    error_report = Path(args.error_report) if args.error_report else None
+
+    if args.inputs:
+        inputs = discover_inputs(args.inputs)
+        if not inputs:
+            raise SystemExit(f"No CSV files match {args.inputs}")
+        binary_output = Path(args.binary_output) if args.binary_output else None
+        summary = run_batch(
+            inputs, Path(args.output_dir), args.compact, args.workers, args.force, binary_output, args.shards
+        )
+        print(
+            f"Generated {len(summary['generated'])} season(s) {summary['generated']}, "
+            f"skipped {len(summary['skipped'])} unchanged {summary['skipped']}"
+        )
+        report_row_errors(summary["errors"], error_report)
+        if summary["failed"]:
+            raise SystemExit(f"Could not read the CSV of season(s) {summary['failed']}; kept their previous output")
+        return
+
+    input_path = Path(args.input)
+    output_path = Path(args.output)
+
+    if not input_path.exists():
+        raise SystemExit(f"Input CSV not found: {input_path}")
+
+    store_path = Path(args.binary_output) if args.binary_output else None
+    errors: List[RowError] = []
+    try:
+        weeks = generate_season(input_path, output_path, args.season, args.compact, store_path, args.shards, errors)
+    except SeasonCsvError as exc:
+        raise SystemExit(f"error: {exc}") from None
+    report_row_errors(errors, error_report)
+    print(f"Wrote {output_path} with {weeks} weeks")
+    if args.shards:
+        print(f"Wrote {weeks} week shards and season{args.season}.manifest.json to {output_path.parent}")
+    if store_path is not None:
+        print(f"Wrote {store_path}")
 
 
 if __name__ == "__main__":
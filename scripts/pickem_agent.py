@@ -5,20 +5,56 @@ matchups for a user-specified week, and produces a simple pick recommendation
 for each game along with the current point spread.
 
 Usage:
-    python nfl_pickem_agent.py --week 5
+    python scripts/pickem_agent.py --week 5
+    python scripts/pickem_agent.py --week 5 --concurrency 8 --rate-limit 5
+    python scripts/pickem_agent.py --week 5 --fixtures path/to/recorded/payloads
+    python scripts/pickem_agent.py --week 5 --cache-only --export-snapshot path/to/snapshot
+    python scripts/pickem_agent.py --week 5 --http2 --fetch-report
+    python scripts/pickem_agent.py --week 5 --profile trace.json
+    python scripts/pickem_agent.py --week all
+    python scripts/pickem_agent.py --week 5 --week-cache weeks.json --refresh-week-cache
+    python scripts/pickem_agent.py --week 6 --week-cache weeks.json
+
+Responses are cached on disk (see ``--cache-dir``) with a separate TTL for each
+ESPN endpoint, so repeated runs during a week are served locally.
+``--refresh-week-cache`` saves the built profiles and every week's matchups as
+a ``pickem_snapshot.py`` state file, and ``--week-cache`` queries answer from
+it without loading the network stack (see ``benchmarks/bench_startup.py``). A
+query warns when its file is older than ``--week-cache-max-age``.
 
 Dependencies:
     - requests
+    - httpx[http2] (optional, for ``--http2``)
 """
 
 from __future__ import annotations
 
 import argparse
+import atexit
+import json
 import math
+import sys
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, MutableSequence, Optional, Tuple
+
+from pickem_defaults import (
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_WEEK_CACHE_MAX_AGE,
+)
+from pickem_metrics import METRICS
+from pickem_state import FORM_LOOKBACK, RingCounter
+
+if TYPE_CHECKING:
+    from pickem_cache import ResponseCache
+    from pickem_http import FetchEngine, Transport
 
-import requests
+# The transport and cache modules are imported where they are used, so that
+# answering from a --week-cache never loads them (or requests). Their defaults
+# are filled in by build_transport/build_engine for options left as None.
 
 
 TEAMS_URL = "https://sports.core.api.espn.com/v2/sports/football/leagues/nfl/teams?limit=32"
@@ -33,33 +69,133 @@ PAST_PERFORMANCE_URL_TEMPLATE = (
     "https://sports.core.api.espn.com/v2/sports/football/leagues/nfl/"
     "teams/{team_id}/odds/1002/past-performances?limit=134"
 )
+SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
+
+# Seconds each ESPN resource may be served from the on-disk cache before it is
+# revalidated. Team lists rarely change; schedules carry the moving spreads.
+CACHE_TTLS = (
+    (TEAMS_URL, 7 * 24 * 3600),
+    (STATS_URL_TEMPLATE, 6 * 3600),
+    (SCHEDULE_URL_TEMPLATE, 3600),
+    (PAST_PERFORMANCE_URL_TEMPLATE, 24 * 3600),
+    (SCOREBOARD_URL, 60),
+)
+
+
+# Alternative stat names ESPN uses for the figures the rating depends on.
+STAT_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "wins": ("wins", "overallWins", "overallRecordWins"),
+    "losses": ("losses", "overallLosses", "overallRecordLosses"),
+    "ties": ("ties", "overallTies", "overallRecordTies"),
+    "pointsFor": ("pointsFor", "pointsForTotal"),
+    "pointsAgainst": ("pointsAgainst", "pointsAgainstTotal"),
+}
+
+RATING_CEILING = 1.5
+# Points of spread per point of rating difference.
+SPREAD_SCALE = 10.0
+# Minimum rating gap for each confidence label, strongest first.
+CONFIDENCE_LEVELS: Tuple[Tuple[float, str], ...] = ((0.3, "High"), (0.15, "Medium"))
+
+# Format version of the ProfileSnapshot state file (see pickem_snapshot.py),
+# kept here so --week-cache queries can check it without importing that module.
+SNAPSHOT_VERSION = 2
 
 
 class NFLPickemError(RuntimeError):
     """Custom error for workflow issues."""
 
 
+@dataclass(frozen=True)
+class RatingWeights:
+    """Blend of inputs used by :func:`compute_rating`."""
+
+    win_pct: float = 0.6
+    recent_form: float = 0.25
+    cover_rate: float = 0.15
+    margin_scale: float = 100.0
+
+
+DEFAULT_WEIGHTS = RatingWeights()
+
+
+@dataclass
+class ScheduleEvent:
+    """The fields of a scheduled game that matchup assembly and simulation need.
+
+    ``completed`` is set once the game is final, so its result is already
+    part of both teams' season stats.
+    """
+
+    __slots__ = ("event_id", "season", "season_type", "week", "home_id", "away_id", "point_spread", "completed")
+
+    event_id: str
+    season: Optional[int]
+    season_type: Optional[int]
+    week: Optional[int]
+    home_id: str
+    away_id: str
+    point_spread: str
+    completed: bool
+
+
 @dataclass
 class TeamProfile:
-    """Container describing a team's current state."""
+    """Container describing a team's current state.
+
+    Only the fields used for scoring are kept. The raw ESPN documents are not
+    retained; ``stats``, ``schedule_events`` and ``past_performance`` fetch them
+    again on access (normally a response-cache hit).
+    """
+
+    __slots__ = ("team_id", "name", "flat_stats", "events", "recent_form", "cover_rate", "rating")
 
     team_id: str
     name: str
-    stats: Dict[str, Any]
     flat_stats: Dict[str, float]
-    schedule_events: List[Dict[str, Any]]
-    past_performance: Dict[str, Any]
+    events: Tuple[ScheduleEvent, ...]
     recent_form: float
     cover_rate: float
     rating: float
 
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return fetch_json(STATS_URL_TEMPLATE.format(team_id=self.team_id))
+
+    @property
+    def schedule_events(self) -> List[Dict[str, Any]]:
+        return fetch_json(SCHEDULE_URL_TEMPLATE.format(team_id=self.team_id)).get("events", [])
+
+    @property
+    def past_performance(self) -> Dict[str, Any]:
+        return fetch_json(PAST_PERFORMANCE_URL_TEMPLATE.format(team_id=self.team_id))
+
+
+_FETCH_ENGINE: Optional[FetchEngine] = None
+
+
+def configure_fetch_engine(engine: FetchEngine) -> None:
+    """Install the engine used by :func:`fetch_json` and profile builds."""
+
+    global _FETCH_ENGINE
+    _FETCH_ENGINE = engine
+
+
+def get_fetch_engine() -> FetchEngine:
+    """Return the configured engine, creating a default one on first use."""
+
+    global _FETCH_ENGINE
+    if _FETCH_ENGINE is None:
+        from pickem_http import FetchEngine
+
+        _FETCH_ENGINE = FetchEngine()
+    return _FETCH_ENGINE
+
 
 def fetch_json(url: str) -> Dict[str, Any]:
     """Fetch JSON payload with basic error handling."""
 
-    response = requests.get(url, timeout=20)
-    response.raise_for_status()
-    return response.json()
+    return get_fetch_engine().fetch_json(url)
 
 
 def flatten_stats(stats_payload: Dict[str, Any]) -> Dict[str, float]:
@@ -83,10 +219,109 @@ def flatten_stats(stats_payload: Dict[str, Any]) -> Dict[str, float]:
     return flattened
 
 
-def compute_recent_form(events: List[Dict[str, Any]], team_id: str, lookback: int = 5) -> float:
+# (split, category, stat) position of a stat plus the name expected there.
+_StatSlot = Tuple[int, int, int, str]
+
+
+class StatSchema:
+    """Compiled layout of ESPN team statistics payloads.
+
+    Every team's statistics document has the same splits/categories/stats
+    shape, so the first one is walked once to record where the preferred
+    alias of each :data:`STAT_ALIASES` entry lives. Later payloads with the
+    same shape are read by indexing those slots directly, without building the
+    full name -> value dictionary. A payload whose shape or slot names differ
+    is handled by :func:`flatten_stats` and its layout is learned for the
+    next one, so the results always match the generic walk.
+    """
+
+    def __init__(self, aliases: Dict[str, Tuple[str, ...]] = STAT_ALIASES) -> None:
+        self.columns = tuple(aliases)
+        self._aliases = tuple(aliases.values())
+        self._shape: Optional[Tuple[Tuple[int, ...], ...]] = None
+        self._slots: Tuple[Optional[_StatSlot], ...] = ()
+        self.fast_reads = 0
+        self.slow_reads = 0
+
+    @staticmethod
+    def _shape_of(stats_payload: Dict[str, Any]) -> Tuple[Tuple[int, ...], ...]:
+        return tuple(
+            tuple(len(category.get("stats", [])) for category in split.get("categories", []))
+            for split in stats_payload.get("splits", [])
+        )
+
+    def learn(self, stats_payload: Dict[str, Any]) -> None:
+        """Record the slot of each stat from ``stats_payload``."""
+
+        # flatten_stats keeps the last occurrence of a repeated name.
+        last: Dict[str, _StatSlot] = {}
+        for s, split in enumerate(stats_payload.get("splits", [])):
+            for c, category in enumerate(split.get("categories", [])):
+                for i, stat in enumerate(category.get("stats", [])):
+                    name = stat.get("name")
+                    if name is not None:
+                        last[name] = (s, c, i, name)
+        self._slots = tuple(
+            next((last[alias] for alias in aliases if alias in last), None) for aliases in self._aliases
+        )
+        self._shape = self._shape_of(stats_payload)
+
+    def _read_slots(self, stats_payload: Dict[str, Any]) -> Optional[List[Optional[float]]]:
+        splits = stats_payload.get("splits") or []
+        values: List[Optional[float]] = []
+        for slot in self._slots:
+            if slot is None:
+                values.append(None)
+                continue
+            s, c, i, name = slot
+            stat = splits[s]["categories"][c]["stats"][i]
+            if stat.get("name") != name:
+                return None
+            value = stat.get("value")
+            if isinstance(value, (int, float)):
+                values.append(float(value))
+                continue
+            try:
+                values.append(float(value))
+            except (TypeError, ValueError):
+                # The generic walk would skip this value and may pick a
+                # lower-priority alias instead.
+                return None
+        return values
+
+    def values(self, stats_payload: Dict[str, Any]) -> List[Optional[float]]:
+        """Return one value per column, ``None`` where no alias is present."""
+
+        if self._shape is not None and self._shape_of(stats_payload) == self._shape:
+            values = self._read_slots(stats_payload)
+            if values is not None:
+                self.fast_reads += 1
+                return values
+        self.slow_reads += 1
+        self.learn(stats_payload)
+        flattened = flatten_stats(stats_payload)
+        return [
+            next((flattened[alias] for alias in aliases if alias in flattened), None) for aliases in self._aliases
+        ]
+
+    def extract_into(self, stats_payload: Dict[str, Any], out: MutableSequence[float], missing: float = 0.0) -> None:
+        """Write the column values into ``out`` (e.g. a preallocated array row)."""
+
+        for column, value in enumerate(self.values(stats_payload)):
+            out[column] = missing if value is None else value
+
+    def extract(self, stats_payload: Dict[str, Any]) -> Dict[str, float]:
+        """Return the present columns keyed by their canonical stat name."""
+
+        return {
+            name: value for name, value in zip(self.columns, self.values(stats_payload)) if value is not None
+        }
+
+
+def compute_recent_form(events: List[Dict[str, Any]], team_id: str, lookback: int = FORM_LOOKBACK) -> float:
     """Return the win percentage over the specified number of completed games."""
 
-    completed_results: List[int] = []
+    completed_results = RingCounter(lookback)
     for event in events:
         status = event.get("status", {})
         status_type = status.get("type", {})
@@ -100,12 +335,9 @@ def compute_recent_form(events: List[Dict[str, Any]], team_id: str, lookback: in
             team = competitor.get("team", {})
             if team.get("id") != team_id:
                 continue
-            completed_results.append(1 if competitor.get("winner") else 0)
+            completed_results.push(bool(competitor.get("winner")))
             break
-    if not completed_results:
-        return 0.5
-    sliced = completed_results[-lookback:]
-    return sum(sliced) / len(sliced)
+    return completed_results.rate()
 
 
 def compute_cover_rate(past_performance: Dict[str, Any], team_id: str, lookback: int = 10) -> float:
@@ -139,62 +371,172 @@ def lookup_stat(flat_stats: Dict[str, float], *names: str, default: float = 0.0)
     return default
 
 
-def compute_rating(flat_stats: Dict[str, float], recent_form: float, cover_rate: float) -> float:
+def compute_rating(
+    flat_stats: Dict[str, float],
+    recent_form: float,
+    cover_rate: float,
+    weights: RatingWeights = DEFAULT_WEIGHTS,
+) -> float:
     """Combine various stats into a normalized rating."""
 
-    wins = lookup_stat(flat_stats, "wins", "overallWins", "overallRecordWins")
-    losses = lookup_stat(flat_stats, "losses", "overallLosses", "overallRecordLosses")
-    ties = lookup_stat(flat_stats, "ties", "overallTies", "overallRecordTies")
+    wins = lookup_stat(flat_stats, *STAT_ALIASES["wins"])
+    losses = lookup_stat(flat_stats, *STAT_ALIASES["losses"])
+    ties = lookup_stat(flat_stats, *STAT_ALIASES["ties"])
     games = wins + losses + ties
     win_pct = wins / games if games else 0.5
 
-    points_for = lookup_stat(flat_stats, "pointsFor", "pointsForTotal")
-    points_against = lookup_stat(flat_stats, "pointsAgainst", "pointsAgainstTotal")
+    points_for = lookup_stat(flat_stats, *STAT_ALIASES["pointsFor"])
+    points_against = lookup_stat(flat_stats, *STAT_ALIASES["pointsAgainst"])
     scoring_margin = (points_for - points_against) / max(games, 1)
 
-    rating = (win_pct * 0.6) + (recent_form * 0.25) + (cover_rate * 0.15)
-    rating += scoring_margin / 100.0
-    return max(0.0, min(rating, 1.5))
+    rating = (win_pct * weights.win_pct) + (recent_form * weights.recent_form) + (cover_rate * weights.cover_rate)
+    rating += scoring_margin / weights.margin_scale
+    return max(0.0, min(rating, RATING_CEILING))
+
 
+def _optional_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def compact_event(event: Dict[str, Any]) -> Optional[ScheduleEvent]:
+    """Reduce a raw schedule event to a :class:`ScheduleEvent`.
+
+    Returns ``None`` for events without an identifier or without both a home
+    and an away competitor, which matchup assembly would skip anyway.
+    """
+
+    event_id = event.get("id") or event.get("uid")
+    if event_id is None:
+        return None
+    competitions = event.get("competitions", [])
+    if not competitions:
+        return None
+    competition = competitions[0]
+    competitors = competition.get("competitors", [])
+    if len(competitors) < 2:
+        return None
+    home_comp = next((c for c in competitors if c.get("homeAway") == "home"), None)
+    away_comp = next((c for c in competitors if c.get("homeAway") == "away"), None)
+    if not home_comp or not away_comp:
+        return None
+    season = event.get("season", {})
+    return ScheduleEvent(
+        event_id=event_id,
+        season=_optional_int(season.get("year")),
+        season_type=_optional_int(event.get("seasonType", {}).get("type", season.get("type"))),
+        week=event.get("week", {}).get("number"),
+        home_id=str(home_comp.get("team", {}).get("id")),
+        away_id=str(away_comp.get("team", {}).get("id")),
+        point_spread=parse_point_spread(competition),
+        completed=bool(event.get("status", {}).get("type", {}).get("completed")),
+    )
 
-def build_team_profiles() -> Dict[str, TeamProfile]:
-    """Fetch all required data to assemble team profiles."""
 
-    payload = fetch_json(TEAMS_URL)
+def team_resource_urls(team_id: str) -> tuple[str, str, str]:
+    """Return the statistics, schedule and past-performance URLs for a team."""
+
+    return (
+        STATS_URL_TEMPLATE.format(team_id=team_id),
+        SCHEDULE_URL_TEMPLATE.format(team_id=team_id),
+        PAST_PERFORMANCE_URL_TEMPLATE.format(team_id=team_id),
+    )
+
+
+def build_team_profiles(engine: Optional[FetchEngine] = None) -> Dict[str, TeamProfile]:
+    """Fetch all required data to assemble team profiles.
+
+    The per-team resources are requested concurrently through ``engine``
+    (the configured default when omitted). Each raw payload is released as soon
+    as its team has been scored, and games shared by two schedules are stored
+    once.
+    """
+
+    engine = engine or get_fetch_engine()
+    with METRICS.span("fetch_teams"):
+        payload = engine.fetch_json(TEAMS_URL)
     teams = payload.get("items", [])
     if not teams:
         raise NFLPickemError("Unable to retrieve NFL teams from ESPN API")
 
+    team_ids = [str(team.get("id")) for team in teams]
+    with METRICS.span("fetch_team_resources"):
+        payloads = engine.fetch_many(
+            (url for team_id in team_ids if team_id for url in team_resource_urls(team_id)),
+            skip_failures=True,
+        )
+
     profiles: Dict[str, TeamProfile] = {}
-    for team in teams:
-        team_id = str(team.get("id"))
+    shared_events: Dict[str, ScheduleEvent] = {}
+    schema = StatSchema()
+    for team, team_id in zip(teams, team_ids):
         if not team_id:
             continue
 
-        stats = fetch_json(STATS_URL_TEMPLATE.format(team_id=team_id))
-        schedule = fetch_json(SCHEDULE_URL_TEMPLATE.format(team_id=team_id))
-        past_perf = fetch_json(PAST_PERFORMANCE_URL_TEMPLATE.format(team_id=team_id))
-
-        flat_stats = flatten_stats(stats)
-        events = schedule.get("events", [])
-        recent_form = compute_recent_form(events, team_id)
-        cover_rate = compute_cover_rate(past_perf, team_id)
-        rating = compute_rating(flat_stats, recent_form, cover_rate)
-
-        profiles[team_id] = TeamProfile(
-            team_id=team_id,
-            name=team.get("displayName", team.get("name", f"Team {team_id}")),
-            stats=stats,
-            flat_stats=flat_stats,
-            schedule_events=events,
-            past_performance=past_perf,
-            recent_form=recent_form,
-            cover_rate=cover_rate,
-            rating=rating,
+        # A resource that still fails after retries degrades the team to
+        # neutral defaults instead of aborting the whole build.
+        urls = team_resource_urls(team_id)
+        for url in urls:
+            if url not in payloads:
+                print(f"warning: {engine.failures.get(url, 'fetch failed')}", file=sys.stderr)
+        stats, schedule, past_perf = (payloads.pop(url, {}) for url in urls)
+        profiles[team_id] = score_team(
+            team_id,
+            team.get("displayName", team.get("name", f"Team {team_id}")),
+            stats,
+            schedule,
+            past_perf,
+            schema,
+            shared_events,
         )
     return profiles
 
 
+def score_team(
+    team_id: str,
+    name: str,
+    stats: Dict[str, Any],
+    schedule: Dict[str, Any],
+    past_perf: Dict[str, Any],
+    schema: Optional[StatSchema] = None,
+    shared_events: Optional[Dict[str, ScheduleEvent]] = None,
+) -> TeamProfile:
+    """Build one team's profile from its three raw ESPN documents.
+
+    Events already present in ``shared_events`` are reused instead of copied.
+    """
+
+    schema = schema or StatSchema()
+    shared_events = shared_events if shared_events is not None else {}
+    with METRICS.span("score_team", team=team_id):
+        with METRICS.span("flatten_stats"):
+            flat_stats = schema.extract(stats)
+        events = schedule.get("events", [])
+        with METRICS.span("rating"):
+            recent_form = compute_recent_form(events, team_id)
+            cover_rate = compute_cover_rate(past_perf, team_id)
+            rating = compute_rating(flat_stats, recent_form, cover_rate)
+
+        with METRICS.span("compact_events"):
+            compact_events: List[ScheduleEvent] = []
+            for raw_event in events:
+                compact = compact_event(raw_event)
+                if compact is not None:
+                    compact_events.append(shared_events.setdefault(compact.event_id, compact))
+
+    return TeamProfile(
+        team_id=team_id,
+        name=name,
+        flat_stats=flat_stats,
+        events=tuple(compact_events),
+        recent_form=recent_form,
+        cover_rate=cover_rate,
+        rating=rating,
+    )
+
+
 def parse_point_spread(competition: Dict[str, Any]) -> str:
     """Extract the point spread string from the competition payload."""
 
@@ -209,8 +551,12 @@ def parse_point_spread(competition: Dict[str, Any]) -> str:
     return "N/A"
 
 
+@lru_cache(maxsize=1024)
 def point_spread_value(spread: str) -> Optional[float]:
-    """Convert a spread string into a float when possible."""
+    """Convert a spread string into a float when possible.
+
+    Lines repeat across games and polls, so each distinct string is parsed once.
+    """
 
     if spread in (None, "N/A"):
         return None
@@ -247,18 +593,16 @@ def evaluate_matchup(
     rating_diff = home.rating - away.rating
     adjusted_diff = rating_diff
     if spread_value is not None:
-        adjusted_diff -= spread_value / 10.0
+        adjusted_diff -= spread_value / SPREAD_SCALE
 
     winner = home if adjusted_diff >= 0 else away
     loser = away if winner is home else home
 
     confidence_gap = abs(winner.rating - loser.rating)
-    if confidence_gap >= 0.3:
-        confidence = "High"
-    elif confidence_gap >= 0.15:
-        confidence = "Medium"
-    else:
-        confidence = "Low"
+    confidence = next(
+        (label for threshold, label in CONFIDENCE_LEVELS if confidence_gap >= threshold),
+        "Low",
+    )
 
     rationale = [
         f"Rating edge: {winner.rating:.2f} vs {loser.rating:.2f}",
@@ -280,49 +624,97 @@ def evaluate_matchup(
     }
 
 
-def gather_week_matchups(profiles: Dict[str, TeamProfile], week: int) -> List[Dict[str, Any]]:
-    """Compile the list of matchups for the specified week."""
-
-    processed_events: set[str] = set()
-    matchups: List[Dict[str, Any]] = []
-
-    for profile in profiles.values():
-        for event in profile.schedule_events:
-            event_week = event.get("week", {}).get("number")
-            if event_week != week:
-                continue
-
-            event_id = event.get("id") or event.get("uid")
-            if event_id is None or event_id in processed_events:
-                continue
-            processed_events.add(event_id)
+class EventIndex:
+    """Lookup tables over every team's compact schedule events.
+
+    Built once from the profiles; events are keyed by ``(season, season_type,
+    week)``, by week alone and by event id, so each week query touches only
+    that week's games.
+    """
+
+    def __init__(self) -> None:
+        self.by_key: Dict[Tuple[Optional[int], Optional[int], Optional[int]], List[ScheduleEvent]] = {}
+        self.by_week: Dict[Optional[int], List[ScheduleEvent]] = {}
+        self.by_id: Dict[str, ScheduleEvent] = {}
+
+    @classmethod
+    def from_profiles(cls, profiles: Dict[str, TeamProfile]) -> "EventIndex":
+        index = cls()
+        for profile in profiles.values():
+            for event in profile.events:
+                index.add(event)
+        return index
+
+    def add(self, event: ScheduleEvent) -> None:
+        if event.event_id in self.by_id:
+            return
+        self.by_id[event.event_id] = event
+        key = (event.season, event.season_type, event.week)
+        self.by_key.setdefault(key, []).append(event)
+        self.by_week.setdefault(event.week, []).append(event)
+
+    def week_events(
+        self,
+        week: int,
+        season: Optional[int] = None,
+        season_type: Optional[int] = None,
+    ) -> List[ScheduleEvent]:
+        """Return the events of ``week``, optionally narrowed to a season/type."""
+
+        if season is not None and season_type is not None:
+            return self.by_key.get((season, season_type, week), [])
+        events = self.by_week.get(week, [])
+        if season is None and season_type is None:
+            return events
+        return [
+            event
+            for event in events
+            if (season is None or event.season == season)
+            and (season_type is None or event.season_type == season_type)
+        ]
+
+    def weeks(self) -> List[int]:
+        return sorted(week for week in self.by_week if week is not None)
+
+
+def gather_week_matchups(
+    profiles: Dict[str, TeamProfile],
+    week: int,
+    index: Optional[EventIndex] = None,
+) -> List[Dict[str, Any]]:
+    """Compile the list of matchups for the specified week.
 
-            competitions = event.get("competitions", [])
-            if not competitions:
-                continue
-            competition = competitions[0]
-            competitors = competition.get("competitors", [])
-            if len(competitors) < 2:
-                continue
+    Pass a prebuilt ``index`` when querying several weeks from the same
+    profiles; otherwise one is built on the fly.
+    """
 
-            home_comp = next((c for c in competitors if c.get("homeAway") == "home"), None)
-            away_comp = next((c for c in competitors if c.get("homeAway") == "away"), None)
-            if not home_comp or not away_comp:
-                continue
+    index = index or EventIndex.from_profiles(profiles)
+    matchups: List[Dict[str, Any]] = []
 
-            home_profile = profiles.get(str(home_comp.get("team", {}).get("id")))
-            away_profile = profiles.get(str(away_comp.get("team", {}).get("id")))
+    with METRICS.span("matchups", week=week):
+        for event in index.week_events(week):
+            home_profile = profiles.get(event.home_id)
+            away_profile = profiles.get(event.away_id)
             if not home_profile or not away_profile:
                 continue
 
-            spread = parse_point_spread(competition)
-            matchup = evaluate_matchup(week, home_profile, away_profile, spread)
+            matchup = evaluate_matchup(week, home_profile, away_profile, event.point_spread)
             matchups.append(matchup)
 
-    matchups.sort(key=lambda item: item["home_team"])
+        matchups.sort(key=lambda item: item["home_team"])
     return matchups
 
 
+def gather_all_matchups(
+    profiles: Dict[str, TeamProfile],
+    index: Optional[EventIndex] = None,
+) -> Dict[int, List[Dict[str, Any]]]:
+    """Compile matchups for every week present in the schedules."""
+
+    index = index or EventIndex.from_profiles(profiles)
+    return {week: gather_week_matchups(profiles, week, index) for week in index.weeks()}
+
+
 def render_matchups(matchups: List[Dict[str, Any]], week: int) -> None:
     """Pretty-print matchup results to stdout."""
 
@@ -342,29 +734,290 @@ def render_matchups(matchups: List[Dict[str, Any]], week: int) -> None:
         print()
 
 
+def parse_week(value: str) -> int | str:
+    """Accept a week number or the literal ``all``."""
+
+    if value.strip().lower() == "all":
+        return "all"
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid week: {value!r}") from None
+
+
+def parse_positive_int(value: str) -> int:
+    """Accept an integer of at least 1."""
+
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected an integer of at least 1, got {value!r}")
+    return number
+
+
+def build_arg_parser(
+    description: str = "Weekly NFL pick'em agent",
+    with_week: bool = True,
+) -> argparse.ArgumentParser:
+    """Return the CLI parser; other scripts extend it with their own flags."""
+
+    parser = argparse.ArgumentParser(description=description)
+    if with_week:
+        parser.add_argument(
+            "--week",
+            type=parse_week,
+            required=True,
+            help="Regular-season week number (1-18), or 'all' for every scheduled week",
+        )
+    parser.add_argument(
+        "--concurrency",
+        type=parse_positive_int,
+        default=None,
+        help=f"Maximum number of requests in flight at once (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Maximum requests per second sent to any single host",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--fixtures",
+        default=None,
+        help="Serve ESPN payloads from a directory of recorded JSON fixtures",
+    )
+    parser.add_argument(
+        "--retries",
+        type=parse_positive_int,
+        default=None,
+        help=f"Attempts per request for HTTP 429/5xx and connection errors (default: {DEFAULT_RETRY_ATTEMPTS})",
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Use the HTTP/2 transport (requires httpx[http2])",
+    )
+    parser.add_argument(
+        "--fetch-report",
+        action="store_true",
+        help="Print retry, connection reuse and endpoint latency statistics to stderr",
+    )
+    source.add_argument(
+        "--base-url",
+        default=None,
+        help="Send requests to this scheme://host instead of ESPN (e.g. a local stub server)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory holding cached ESPN responses (default: $XDG_CACHE_HOME/pickem/http)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=None,
+        help=f"Evict least-recently-used responses beyond this size (default: {DEFAULT_CACHE_MAX_BYTES // 2**20})",
+    )
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch from the network and leave the cache untouched",
+    )
+    cache_mode.add_argument(
+        "--cache-only",
+        action="store_true",
+        help="Offline mode: answer exclusively from the cache, even if entries are stale",
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="Write a trace of stage timings and requests to this JSON file "
+        "(chrome://tracing, Perfetto or speedscope) when the run ends",
+    )
+    parser.add_argument(
+        "--export-snapshot",
+        default=None,
+        help="After the run, copy the cached responses into a fixture directory for replay",
+    )
+    return parser
+
+
 def parse_args() -> argparse.Namespace:
     """Parse CLI arguments."""
 
-    parser = argparse.ArgumentParser(description="Weekly NFL pick'em agent")
+    parser = build_arg_parser()
     parser.add_argument(
-        "--week",
-        type=int,
-        required=True,
-        help="Regular-season week number (1-18)",
+        "--week-cache",
+        default=None,
+        help="Answer from this precomputed profile snapshot without fetching anything",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--refresh-week-cache",
+        action="store_true",
+        help="Build the profiles as usual and save them to --week-cache for later queries",
+    )
+    parser.add_argument(
+        "--week-cache-max-age",
+        type=float,
+        default=DEFAULT_WEEK_CACHE_MAX_AGE,
+        help="Warn when a --week-cache query reads a file older than this many seconds "
+        f"(default: {DEFAULT_WEEK_CACHE_MAX_AGE}; 0 disables the check)",
+    )
+    args = parser.parse_args()
+    if args.refresh_week_cache and not args.week_cache:
+        parser.error("--refresh-week-cache requires --week-cache PATH")
+    if args.week_cache and not args.refresh_week_cache and args.fetch_report:
+        print("warning: --fetch-report has nothing to report for a --week-cache query", file=sys.stderr)
+    return args
+
+
+def save_week_cache(path: str, profiles: Dict[str, TeamProfile], index: EventIndex) -> int:
+    """Evaluate every matchup and save the profiles as a ``ProfileSnapshot``.
+
+    The file is the JSON state of ``pickem_snapshot.py``, so either script can
+    refresh it. Returns the number of weeks stored.
+    """
+
+    from pickem_snapshot import ProfileSnapshot
+
+    snapshot = ProfileSnapshot(profiles=profiles, events=dict(index.by_id))
+    snapshot.evaluate()
+    snapshot.save(path)
+    return len(snapshot.weeks())
+
+
+def load_week_cache(path: str, max_age: float = DEFAULT_WEEK_CACHE_MAX_AGE) -> Dict[int, List[Dict[str, Any]]]:
+    """Return the per-week matchups of a file written by :func:`save_week_cache`.
+
+    Reads the snapshot JSON directly rather than through ``pickem_snapshot``,
+    which would load the transport and cache modules. Warns on stderr when the
+    file was written more than ``max_age`` seconds ago (``0`` disables the
+    check).
+    """
+
+    try:
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+    except FileNotFoundError:
+        raise NFLPickemError(f"No week cache at {path}; create it with --refresh-week-cache") from None
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        raise NFLPickemError(f"Week cache {path} is unreadable or from another version; rerun with --refresh-week-cache")
+    age = time.time() - data.get("updatedAt", 0.0)
+    if max_age > 0 and age > max_age:
+        print(
+            f"warning: week cache {path} is {age / 3600:.1f} h old; refresh it with --refresh-week-cache",
+            file=sys.stderr,
+        )
+    weeks: Dict[int, List[Dict[str, Any]]] = {}
+    for event_id, matchup in data["matchups"].items():
+        weeks.setdefault(data["events"][event_id][2], []).append(matchup)
+    for matchups in weeks.values():
+        matchups.sort(key=lambda item: item["home_team"])
+    return weeks
+
+
+def build_transport(args: argparse.Namespace) -> tuple[Transport, Optional[ResponseCache]]:
+    """Create the transport stack described by the CLI arguments."""
+
+    from pickem_cache import CachingTransport, ResponseCache, TTLPolicy, default_cache_dir
+    from pickem_http import FixtureTransport, HttpxTransport, RequestsTransport
+
+    if args.fixtures:
+        return FixtureTransport(args.fixtures), None
+    inner: Optional[Transport] = None
+    if not args.cache_only:
+        transport_class = HttpxTransport if args.http2 else RequestsTransport
+        pool_size = args.concurrency if args.concurrency is not None else DEFAULT_CONCURRENCY
+        inner = transport_class(args.base_url, pool_size=pool_size)
+    if args.no_cache:
+        return inner, None
+    max_bytes = int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb is not None else DEFAULT_CACHE_MAX_BYTES
+    cache = ResponseCache(args.cache_dir or default_cache_dir(), max_bytes=max_bytes)
+    policy = TTLPolicy(CACHE_TTLS)
+    return CachingTransport(inner, cache, policy, offline=args.cache_only), cache
+
+
+def check_week(week: int | str) -> None:
+    if week != "all" and (week < 1 or week > 18):
+        raise NFLPickemError("Week must be between 1 and 18")
+
+
+def enable_profile(args: argparse.Namespace) -> None:
+    """Trace the run and write the trace at exit when ``--profile`` is given."""
+
+    if getattr(args, "profile", None):
+        METRICS.enable_tracing()
+        atexit.register(METRICS.write_trace, args.profile)
+
+
+def build_engine(args: argparse.Namespace) -> tuple[FetchEngine, Optional[ResponseCache]]:
+    """Create and install the fetch engine described by the CLI arguments."""
+
+    from pickem_http import FetchEngine, RetryPolicy
+
+    check_week(getattr(args, "week", "all"))
+    enable_profile(args)
+
+    transport, cache = build_transport(args)
+    engine = FetchEngine(
+        transport,
+        concurrency=args.concurrency if args.concurrency is not None else DEFAULT_CONCURRENCY,
+        per_host_rate=args.rate_limit,
+        retry=RetryPolicy(attempts=args.retries if args.retries is not None else DEFAULT_RETRY_ATTEMPTS),
+    )
+    configure_fetch_engine(engine)
+    return engine, cache
 
 
 def main() -> None:
     """Program entrypoint."""
 
     args = parse_args()
-    if args.week < 1 or args.week > 18:
-        raise NFLPickemError("Week must be between 1 and 18")
+    if args.week_cache and not args.refresh_week_cache:
+        check_week(args.week)
+        enable_profile(args)
+        with METRICS.span("load_week_cache"):
+            weeks = load_week_cache(args.week_cache, args.week_cache_max_age)
+        for week in sorted(weeks) if args.week == "all" else [args.week]:
+            with METRICS.span("render"):
+                render_matchups(weeks.get(week, []), week)
+        return
+
+    engine, cache = build_engine(args)
 
-    profiles = build_team_profiles()
-    matchups = gather_week_matchups(profiles, args.week)
-    render_matchups(matchups, args.week)
+    try:
+        with METRICS.span("build_team_profiles"):
+            profiles = build_team_profiles()
+    finally:
+        if cache is not None:
+            cache.flush()
+        if args.fetch_report:
+            print(json.dumps(engine.report(), indent=2), file=sys.stderr)
+    with METRICS.span("index"):
+        index = EventIndex.from_profiles(profiles)
+    if args.refresh_week_cache:
+        with METRICS.span("save_week_cache"):
+            stored = save_week_cache(args.week_cache, profiles, index)
+        print(f"Wrote {stored} week(s) to {args.week_cache}", file=sys.stderr)
+    if args.week == "all":
+        for week, matchups in gather_all_matchups(profiles, index).items():
+            with METRICS.span("render"):
+                render_matchups(matchups, week)
+    else:
+        matchups = gather_week_matchups(profiles, args.week, index)
+        with METRICS.span("render"):
+            render_matchups(matchups, args.week)
+
+    if args.export_snapshot:
+        if cache is None:
+            raise NFLPickemError("--export-snapshot requires the response cache to be enabled")
+        cache.export_fixtures(args.export_snapshot)
 
 
 if __name__ == "__main__":
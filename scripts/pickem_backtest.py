@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""Backtest the pick'em rating model over historical weeks.
+
+Games come from a scores CSV (``data/2025_scores.csv``), a binary season store
+written by ``generate_season_data.py --binary-output`` or from recorded ESPN
+schedule payloads (a fixture directory or an exported cache snapshot, which
+also carry point spreads). For every week the harness rebuilds each team's
+profile from the games played *before* that week only, runs
+:func:`pickem_agent.evaluate_matchup` on the week's finished games, and reports
+straight-up (SU) and against-the-spread (ATS) accuracy.
+
+The same point-in-time features feed a vectorized search over the rating
+weights (grid or random), split across a process pool.
+
+Usage:
+    python scripts/pickem_backtest.py --scores data/2025_scores.csv
+    python scripts/pickem_backtest.py --fixtures path/to/snapshot --objective ats
+    python scripts/pickem_backtest.py --season-store mobile/src/data/seasons.pkseason
+    python scripts/pickem_backtest.py --scores data/2025_scores.csv \\
+        --grid win_pct=0:1:0.05 --grid recent_form=0:1:0.05 --grid cover_rate=0:0.5:0.05
+    python scripts/pickem_backtest.py --scores data/2025_scores.csv --random 50000 --workers 8
+
+Dependencies:
+    - numpy
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pickem_agent import (
+    DEFAULT_WEIGHTS,
+    SCHEDULE_URL_TEMPLATE,
+    TEAMS_URL,
+    RatingWeights,
+    TeamProfile,
+    compute_rating,
+    evaluate_matchup,
+    point_spread_value,
+    parse_point_spread,
+)
+from generate_season_data import (
+    NO_SCORE,
+    TEAM_TABLE,
+    RowError,
+    detect_season,
+    read_season_rows,
+    report_row_errors,
+)
+from pickem_batch import TeamBatch, batch_ratings, evaluate_games
+from pickem_http import FetchEngine, FixtureTransport
+from pickem_season_store import STATUS_FINAL, SeasonStore
+from pickem_state import LeagueState
+
+WEIGHT_FIELDS: Tuple[str, ...] = ("win_pct", "recent_form", "cover_rate", "margin_scale")
+
+
+class BacktestError(RuntimeError):
+    """Raised when historical data cannot be loaded or evaluated."""
+
+
+@dataclass
+class HistoricalGame:
+    """One scheduled game; scores are ``None`` until it is final."""
+
+    __slots__ = ("season", "week", "home_id", "away_id", "home_score", "away_score", "spread")
+
+    season: int
+    week: int
+    home_id: str
+    away_id: str
+    home_score: Optional[int]
+    away_score: Optional[int]
+    spread: Optional[float]
+
+    @property
+    def completed(self) -> bool:
+        return self.home_score is not None and self.away_score is not None
+
+
+def load_scores_csv(path: Path | str, errors: Optional[List[RowError]] = None) -> List[HistoricalGame]:
+    """Read finished and upcoming games from a scores CSV (no spreads).
+
+    Rows go through the generator's :func:`read_season_rows`, so a bad week,
+    team, date or score rejects that row instead of aborting the backtest.
+    Rejected rows are appended to ``errors``; without a list they are
+    reported on stderr. A final game without both scores counts as rejected.
+    """
+
+    path = Path(path)
+    collected: List[RowError] = [] if errors is None else errors
+    season = detect_season(path)
+    rows = read_season_rows(path, season, collected)
+    nicknames = TEAM_TABLE.nicknames
+    games: List[HistoricalGame] = []
+    for line, week, home, away, home_score, away_score, final in zip(
+        rows.lines, rows.weeks, rows.home, rows.away, rows.home_scores, rows.away_scores, rows.final
+    ):
+        if final and NO_SCORE in (home_score, away_score):
+            row = (str(week), nicknames[home], nicknames[away])
+            collected.append(RowError(str(path), line, "final game without both scores", row))
+            continue
+        games.append(
+            HistoricalGame(
+                season=season,
+                week=week,
+                home_id=nicknames[home],
+                away_id=nicknames[away],
+                home_score=home_score if final else None,
+                away_score=away_score if final else None,
+                spread=None,
+            )
+        )
+    if errors is None:
+        report_row_errors(collected)
+    return games
+
+
+def load_season_store(path: Path | str, seasons: Optional[Sequence[int]] = None) -> List[HistoricalGame]:
+    """Read games from a binary season store, optionally limited to ``seasons``."""
+
+    games: List[HistoricalGame] = []
+    with SeasonStore(path) as store:
+        teams = store.teams
+        for season in seasons if seasons is not None else store.seasons():
+            rows = store.season_slice(season)
+            final = (store["status"][rows] == STATUS_FINAL).tolist()
+            columns = zip(
+                store["week"][rows].tolist(),
+                store["home"][rows].tolist(),
+                store["away"][rows].tolist(),
+                store["home_score"][rows].tolist(),
+                store["away_score"][rows].tolist(),
+                final,
+            )
+            for week, home, away, home_score, away_score, completed in columns:
+                games.append(
+                    HistoricalGame(
+                        season=season,
+                        week=week,
+                        home_id=teams[home],
+                        away_id=teams[away],
+                        home_score=home_score if completed else None,
+                        away_score=away_score if completed else None,
+                        spread=None,
+                    )
+                )
+    return games
+
+
+def _score(competitor: Dict[str, Any]) -> Optional[int]:
+    score = competitor.get("score")
+    if isinstance(score, dict):
+        score = score.get("value", score.get("displayValue"))
+    try:
+        return int(float(score))
+    except (TypeError, ValueError):
+        return None
+
+
+def load_schedule_payloads(engine: FetchEngine) -> List[HistoricalGame]:
+    """Collect games, scores and closing spreads from ESPN team schedules."""
+
+    teams = engine.fetch_json(TEAMS_URL).get("items", [])
+    urls = [SCHEDULE_URL_TEMPLATE.format(team_id=team.get("id")) for team in teams if team.get("id")]
+    seen: set[str] = set()
+    games: List[HistoricalGame] = []
+    for schedule in engine.fetch_many(urls, skip_failures=True).values():
+        for event in schedule.get("events", []):
+            event_id = event.get("id") or event.get("uid")
+            week = event.get("week", {}).get("number")
+            competitions = event.get("competitions", [])
+            if event_id is None or week is None or not competitions or event_id in seen:
+                continue
+            competitors = competitions[0].get("competitors", [])
+            home = next((c for c in competitors if c.get("homeAway") == "home"), None)
+            away = next((c for c in competitors if c.get("homeAway") == "away"), None)
+            if not home or not away:
+                continue
+            seen.add(event_id)
+            completed = bool(event.get("status", {}).get("type", {}).get("completed"))
+            games.append(
+                HistoricalGame(
+                    season=int(event.get("season", {}).get("year") or 0),
+                    week=int(week),
+                    home_id=str(home.get("team", {}).get("id")),
+                    away_id=str(away.get("team", {}).get("id")),
+                    home_score=_score(home) if completed else None,
+                    away_score=_score(away) if completed else None,
+                    spread=point_spread_value(parse_point_spread(competitions[0])),
+                )
+            )
+    return games
+
+
+@dataclass
+class WeekSlate:
+    """Point-in-time inputs for one week: team features and that week's games."""
+
+    season: int
+    week: int
+    team_ids: List[str]
+    flat_stats: List[Dict[str, float]]
+    recent_form: List[float]
+    cover_rate: List[float]
+    games: List[HistoricalGame]
+
+
+def point_in_time_slates(games: Iterable[HistoricalGame], min_week: int = 2) -> List[WeekSlate]:
+    """Build one slate per (season, week) using only earlier results.
+
+    Results are applied to a :class:`LeagueState` in week order and each slate
+    reads the snapshot frozen *before* the week's games, so no result leaks
+    into its own prediction.
+    """
+
+    by_week: Dict[Tuple[int, int], List[HistoricalGame]] = {}
+    for game in games:
+        by_week.setdefault((game.season, game.week), []).append(game)
+
+    slates: List[WeekSlate] = []
+    league = LeagueState()
+    current_season: Optional[int] = None
+    for (season, week) in sorted(by_week):
+        if season != current_season:
+            league = LeagueState()
+            current_season = season
+        week_games = by_week[(season, week)]
+        for game in week_games:
+            league.team(game.home_id)
+            league.team(game.away_id)
+        league.begin_week(week)
+
+        finished = [game for game in week_games if game.completed]
+        if week >= min_week and finished:
+            snapshots = league.as_of(week)
+            team_ids = sorted(snapshots)
+            slates.append(
+                WeekSlate(
+                    season=season,
+                    week=week,
+                    team_ids=team_ids,
+                    flat_stats=[snapshots[team_id].flat_stats() for team_id in team_ids],
+                    recent_form=[snapshots[team_id].recent_form for team_id in team_ids],
+                    cover_rate=[snapshots[team_id].cover_rate for team_id in team_ids],
+                    games=finished,
+                )
+            )
+
+        for game in finished:
+            league.apply_game(week, game.home_id, game.away_id, game.home_score, game.away_score, game.spread)
+    return slates
+
+
+@dataclass
+class Accuracy:
+    """Straight-up and against-the-spread hit counts."""
+
+    su_correct: int = 0
+    su_games: int = 0
+    ats_correct: int = 0
+    ats_games: int = 0
+
+    @property
+    def su_rate(self) -> Optional[float]:
+        return self.su_correct / self.su_games if self.su_games else None
+
+    @property
+    def ats_rate(self) -> Optional[float]:
+        return self.ats_correct / self.ats_games if self.ats_games else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "su_rate": self.su_rate, "ats_rate": self.ats_rate}
+
+
+def _grade(accuracy: Accuracy, game: HistoricalGame, picked_home: bool) -> None:
+    margin = game.home_score - game.away_score
+    if margin != 0:
+        accuracy.su_games += 1
+        accuracy.su_correct += int(picked_home == (margin > 0))
+    if game.spread is not None and margin + game.spread != 0:
+        accuracy.ats_games += 1
+        accuracy.ats_correct += int(picked_home == (margin + game.spread > 0))
+
+
+def replay(slates: Sequence[WeekSlate], weights: RatingWeights = DEFAULT_WEIGHTS) -> Accuracy:
+    """Score every slate through the agent's own ``evaluate_matchup``."""
+
+    accuracy = Accuracy()
+    for slate in slates:
+        profiles = {
+            team_id: TeamProfile(
+                team_id=team_id,
+                name=team_id,
+                flat_stats=stats,
+                events=(),
+                recent_form=form,
+                cover_rate=cover,
+                rating=compute_rating(stats, form, cover, weights),
+            )
+            for team_id, stats, form, cover in zip(
+                slate.team_ids, slate.flat_stats, slate.recent_form, slate.cover_rate
+            )
+        }
+        for game in slate.games:
+            spread = "N/A" if game.spread is None else str(game.spread)
+            matchup = evaluate_matchup(slate.week, profiles[game.home_id], profiles[game.away_id], spread)
+            _grade(accuracy, game, matchup["recommended_pick"] == game.home_id)
+    return accuracy
+
+
+@dataclass
+class PackedSlates:
+    """All slates flattened into one team batch plus per-game index arrays.
+
+    Row ``r`` of ``batch`` is one team's state as of one week, so a single
+    :func:`batch_ratings` call rates every team in every week for every weight
+    set.
+    """
+
+    batch: TeamBatch
+    home_idx: np.ndarray
+    away_idx: np.ndarray
+    spreads: np.ndarray
+    margins: np.ndarray
+
+
+def pack_slates(slates: Sequence[WeekSlate]) -> PackedSlates:
+    row_ids: List[str] = []
+    flat_stats: List[Dict[str, float]] = []
+    recent_form: List[float] = []
+    cover_rate: List[float] = []
+    home_idx: List[int] = []
+    away_idx: List[int] = []
+    spreads: List[float] = []
+    margins: List[int] = []
+    for slate in slates:
+        offset = len(row_ids)
+        position = {team_id: offset + row for row, team_id in enumerate(slate.team_ids)}
+        row_ids.extend(f"{slate.season}:{slate.week}:{team_id}" for team_id in slate.team_ids)
+        flat_stats.extend(slate.flat_stats)
+        recent_form.extend(slate.recent_form)
+        cover_rate.extend(slate.cover_rate)
+        for game in slate.games:
+            home_idx.append(position[game.home_id])
+            away_idx.append(position[game.away_id])
+            spreads.append(np.nan if game.spread is None else game.spread)
+            margins.append(game.home_score - game.away_score)
+    return PackedSlates(
+        batch=TeamBatch.from_flat_stats(row_ids, flat_stats, recent_form, cover_rate),
+        home_idx=np.asarray(home_idx, dtype=np.intp),
+        away_idx=np.asarray(away_idx, dtype=np.intp),
+        spreads=np.asarray(spreads, dtype=np.float64),
+        margins=np.asarray(margins, dtype=np.float64),
+    )
+
+
+def score_weight_grid(packed: PackedSlates, weights: np.ndarray) -> np.ndarray:
+    """Return ``(n, 4)`` SU/ATS correct and graded counts for each weight row."""
+
+    ratings = batch_ratings(packed.batch, weights)
+    picks = evaluate_games(ratings, packed.home_idx, packed.away_idx, packed.spreads).home_pick
+    su_mask = packed.margins != 0
+    ats_margin = packed.margins + packed.spreads
+    ats_mask = ~np.isnan(ats_margin) & (ats_margin != 0)
+    su_correct = ((picks == (packed.margins > 0)) & su_mask).sum(axis=-1)
+    ats_correct = ((picks == (ats_margin > 0)) & ats_mask).sum(axis=-1)
+    games = np.broadcast_to([su_mask.sum(), ats_mask.sum()], (len(ratings), 2))
+    return np.column_stack([su_correct, games[:, 0], ats_correct, games[:, 1]])
+
+
+_WORKER_PACKED: Optional[PackedSlates] = None
+
+
+def _init_worker(packed: PackedSlates) -> None:
+    global _WORKER_PACKED
+    _WORKER_PACKED = packed
+
+
+def _score_chunk(weights: np.ndarray) -> np.ndarray:
+    assert _WORKER_PACKED is not None
+    return score_weight_grid(_WORKER_PACKED, weights)
+
+
+def search_weights(
+    packed: PackedSlates,
+    candidates: np.ndarray,
+    workers: int = 1,
+    chunk_size: int = 4096,
+) -> np.ndarray:
+    """Score every candidate weight row, optionally across a process pool."""
+
+    chunks = [candidates[start:start + chunk_size] for start in range(0, len(candidates), chunk_size)]
+    if workers <= 1 or len(chunks) <= 1:
+        results = [score_weight_grid(packed, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(packed,)) as pool:
+            results = list(pool.map(_score_chunk, chunks))
+    return np.concatenate(results) if results else np.empty((0, 4))
+
+
+def parse_range(spec: str) -> Tuple[str, np.ndarray]:
+    """Parse ``name=start:stop:step`` (inclusive) or ``name=v1,v2,...``."""
+
+    name, _, values = spec.partition("=")
+    name = name.strip()
+    if name not in WEIGHT_FIELDS:
+        raise argparse.ArgumentTypeError(f"unknown weight {name!r}; expected one of {', '.join(WEIGHT_FIELDS)}")
+    if ":" in values:
+        start, stop, step = (float(part) for part in values.split(":"))
+        return name, np.arange(start, stop + step / 2, step)
+    return name, np.array([float(part) for part in values.split(",")])
+
+
+def grid_candidates(ranges: Dict[str, np.ndarray]) -> np.ndarray:
+    axes = [ranges.get(name, np.array([getattr(DEFAULT_WEIGHTS, name)])) for name in WEIGHT_FIELDS]
+    mesh = np.meshgrid(*axes, indexing="ij")
+    return np.column_stack([axis.ravel() for axis in mesh])
+
+
+def random_candidates(count: int, seed: Optional[int] = None) -> np.ndarray:
+    """Draw blend weights uniformly from the simplex and log-uniform margin scales."""
+
+    rng = np.random.default_rng(seed)
+    blend = rng.dirichlet(np.ones(3), size=count)
+    margin_scale = np.exp(rng.uniform(np.log(25.0), np.log(400.0), size=count))
+    return np.column_stack([blend, margin_scale])
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backtest the pick'em rating model")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--scores", help="Scores CSV in the data/2025_scores.csv format")
+    source.add_argument("--fixtures", help="Directory of recorded ESPN payloads (see pickem_agent --export-snapshot)")
+    source.add_argument("--season-store", help="Binary season store (see generate_season_data --binary-output)")
+    parser.add_argument("--season", type=int, action="append", help="With --season-store: only replay this season (repeatable)")
+    parser.add_argument("--min-week", type=int, default=2, help="First week to evaluate (earlier weeks only build state)")
+    parser.add_argument("--grid", action="append", type=parse_range, default=[], help="Weight range name=start:stop:step or name=v1,v2")
+    parser.add_argument("--random", type=int, default=0, help="Number of random weight configurations to try")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for --random")
+    parser.add_argument("--objective", choices=("su", "ats"), default="su", help="Metric used to rank configurations")
+    parser.add_argument("--top", type=int, default=10, help="Number of configurations to report")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes used for the search")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.scores:
+        games = load_scores_csv(args.scores)
+    elif args.season_store:
+        games = load_season_store(args.season_store, args.season)
+    else:
+        games = load_schedule_payloads(FetchEngine(FixtureTransport(args.fixtures)))
+    slates = point_in_time_slates(games, min_week=args.min_week)
+    if not slates:
+        raise BacktestError("No completed games to evaluate")
+
+    report: Dict[str, Any] = {
+        "weeks": len(slates),
+        "games": sum(len(slate.games) for slate in slates),
+        "baseline": {"weights": asdict(DEFAULT_WEIGHTS), **replay(slates).as_dict()},
+    }
+
+    candidates = np.empty((0, 4))
+    if args.grid:
+        candidates = grid_candidates(dict(args.grid))
+    if args.random:
+        candidates = np.concatenate([candidates, random_candidates(args.random, args.seed)])
+    if len(candidates):
+        started = time.perf_counter()
+        scores = search_weights(pack_slates(slates), candidates, workers=args.workers)
+        correct, graded = (scores[:, 0], scores[:, 1]) if args.objective == "su" else (scores[:, 2], scores[:, 3])
+        rates = np.divide(correct, graded, out=np.zeros(len(correct)), where=graded > 0)
+        order = np.argsort(-rates, kind="stable")[: args.top]
+        report["search"] = {
+            "objective": args.objective,
+            "configurations": len(candidates),
+            "seconds": round(time.perf_counter() - started, 3),
+            "top": [
+                {
+                    "weights": dict(zip(WEIGHT_FIELDS, (round(float(v), 6) for v in candidates[i]))),
+                    "su_rate": float(scores[i, 0] / scores[i, 1]) if scores[i, 1] else None,
+                    "ats_rate": float(scores[i, 2] / scores[i, 3]) if scores[i, 3] else None,
+                }
+                for i in order
+            ],
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    baseline = report["baseline"]
+    print(f"Backtest over {report['weeks']} weeks, {report['games']} games")
+    print(f"Baseline weights {baseline['weights']}")
+    print(f"  SU:  {_format_rate(baseline['su_correct'], baseline['su_games'])}")
+    print(f"  ATS: {_format_rate(baseline['ats_correct'], baseline['ats_games'])}")
+    if "search" in report:
+        search = report["search"]
+        print(
+            f"\nSearched {search['configurations']} configurations in {search['seconds']}s "
+            f"(ranked by {search['objective'].upper()})"
+        )
+        for rank, item in enumerate(search["top"], start=1):
+            su = "n/a" if item["su_rate"] is None else f"{item['su_rate']:.3f}"
+            ats = "n/a" if item["ats_rate"] is None else f"{item['ats_rate']:.3f}"
+            print(f"{rank:>3}. SU {su}  ATS {ats}  {item['weights']}")
+
+
+def _format_rate(correct: int, games: int) -> str:
+    if not games:
+        return "n/a (no graded games)"
+    return f"{correct}/{games} ({correct / games:.1%})"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Vectorized rating and matchup evaluation for the pick'em agent.
+
+The scalar helpers in ``pickem_agent`` score one team or one game at a time.
+This module packs every team's rating inputs into dense arrays, resolving the
+stat aliases to column indices once, so ratings, rating differences, spread
+adjustments and confidence buckets for whole slates, every possible pairing or
+thousands of weight variations come out of a handful of NumPy operations.
+
+The results match :func:`pickem_agent.compute_rating` and
+:func:`pickem_agent.evaluate_matchup` exactly for the same inputs.
+
+Dependencies:
+    - numpy
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pickem_agent import (
+    CONFIDENCE_LEVELS,
+    DEFAULT_WEIGHTS,
+    RATING_CEILING,
+    SPREAD_SCALE,
+    STAT_ALIASES,
+    RatingWeights,
+    ScheduleEvent,
+    StatSchema,
+    TeamProfile,
+    point_spread_value,
+)
+
+STAT_COLUMNS: Tuple[str, ...] = tuple(STAT_ALIASES)
+_COLUMN = {name: index for index, name in enumerate(STAT_COLUMNS)}
+WINS, LOSSES, TIES, POINTS_FOR, POINTS_AGAINST = (
+    _COLUMN[name] for name in ("wins", "losses", "ties", "pointsFor", "pointsAgainst")
+)
+
+# Labels indexed by confidence code: 0 is the weakest bucket.
+CONFIDENCE_LABELS: Tuple[str, ...] = ("Low",) + tuple(label for _, label in reversed(CONFIDENCE_LEVELS))
+_CONFIDENCE_EDGES = np.array(sorted(threshold for threshold, _ in CONFIDENCE_LEVELS))
+
+
+def _alias_slots() -> Dict[str, Tuple[int, int]]:
+    """Map every alias to ``(column, priority)``; lower priority wins."""
+
+    slots: Dict[str, Tuple[int, int]] = {}
+    for column, aliases in enumerate(STAT_ALIASES.values()):
+        for priority, alias in enumerate(aliases):
+            slots.setdefault(alias, (column, priority))
+    return slots
+
+
+_ALIAS_SLOTS = _alias_slots()
+
+
+@dataclass
+class TeamBatch:
+    """Dense rating inputs for a set of teams.
+
+    ``stats`` has one row per team and one column per entry of
+    :data:`STAT_COLUMNS`; missing stats are zero, as in ``lookup_stat``.
+    """
+
+    team_ids: List[str]
+    stats: np.ndarray
+    recent_form: np.ndarray
+    cover_rate: np.ndarray
+
+    def __post_init__(self) -> None:
+        self.position = {team_id: row for row, team_id in enumerate(self.team_ids)}
+
+    def __len__(self) -> int:
+        return len(self.team_ids)
+
+    @classmethod
+    def from_flat_stats(
+        cls,
+        team_ids: Sequence[str],
+        flat_stats: Iterable[Mapping[str, float]],
+        recent_form: Sequence[float],
+        cover_rate: Sequence[float],
+    ) -> "TeamBatch":
+        matrix = np.zeros((len(team_ids), len(STAT_COLUMNS)), dtype=np.float64)
+        for row, stats in enumerate(flat_stats):
+            best = [len(aliases) for aliases in STAT_ALIASES.values()]
+            for name, value in stats.items():
+                slot = _ALIAS_SLOTS.get(name)
+                if slot is None:
+                    continue
+                column, priority = slot
+                if priority < best[column]:
+                    best[column] = priority
+                    matrix[row, column] = value
+        return cls(
+            team_ids=list(team_ids),
+            stats=matrix,
+            recent_form=np.asarray(recent_form, dtype=np.float64),
+            cover_rate=np.asarray(cover_rate, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_stat_payloads(
+        cls,
+        team_ids: Sequence[str],
+        stats_payloads: Iterable[Dict[str, object]],
+        recent_form: Sequence[float],
+        cover_rate: Sequence[float],
+        schema: Optional[StatSchema] = None,
+    ) -> "TeamBatch":
+        """Build the batch straight from raw ESPN statistics documents.
+
+        Values are read through a compiled :class:`StatSchema` into the
+        preallocated stats matrix, skipping the per-team flattened dicts.
+        """
+
+        schema = schema or StatSchema()
+        matrix = np.zeros((len(team_ids), len(STAT_COLUMNS)), dtype=np.float64)
+        for row, payload in enumerate(stats_payloads):
+            schema.extract_into(payload, matrix[row])
+        return cls(
+            team_ids=list(team_ids),
+            stats=matrix,
+            recent_form=np.asarray(recent_form, dtype=np.float64),
+            cover_rate=np.asarray(cover_rate, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_profiles(cls, profiles: Mapping[str, TeamProfile]) -> "TeamBatch":
+        ordered = list(profiles.values())
+        return cls.from_flat_stats(
+            [profile.team_id for profile in ordered],
+            (profile.flat_stats for profile in ordered),
+            [profile.recent_form for profile in ordered],
+            [profile.cover_rate for profile in ordered],
+        )
+
+    def indices(self, team_ids: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.position[team_id] for team_id in team_ids), dtype=np.intp)
+
+
+def weights_matrix(weights: Iterable[RatingWeights]) -> np.ndarray:
+    """Stack weight sets into a ``(n, 4)`` array usable by :func:`batch_ratings`."""
+
+    return np.array(
+        [(w.win_pct, w.recent_form, w.cover_rate, w.margin_scale) for w in weights],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+
+
+def batch_ratings(batch: TeamBatch, weights: RatingWeights | np.ndarray = DEFAULT_WEIGHTS) -> np.ndarray:
+    """Rate every team in ``batch``.
+
+    ``weights`` is either a single :class:`RatingWeights` (result shape
+    ``(teams,)``) or an array of shape ``(n, 4)`` from :func:`weights_matrix`
+    holding ``win_pct, recent_form, cover_rate, margin_scale`` rows (result
+    shape ``(n, teams)``).
+    """
+
+    stats = batch.stats
+    wins = stats[:, WINS]
+    games = wins + stats[:, LOSSES] + stats[:, TIES]
+    has_games = games != 0
+    win_pct = np.where(has_games, wins / np.where(has_games, games, 1.0), 0.5)
+    margin = (stats[:, POINTS_FOR] - stats[:, POINTS_AGAINST]) / np.maximum(games, 1.0)
+
+    if isinstance(weights, RatingWeights):
+        w = np.array([[weights.win_pct, weights.recent_form, weights.cover_rate, weights.margin_scale]])
+        squeeze = True
+    else:
+        w = np.asarray(weights, dtype=np.float64).reshape(-1, 4)
+        squeeze = False
+
+    rating = (win_pct * w[:, 0:1]) + (batch.recent_form * w[:, 1:2]) + (batch.cover_rate * w[:, 2:3])
+    rating += margin / w[:, 3:4]
+    np.clip(rating, 0.0, RATING_CEILING, out=rating)
+    return rating[0] if squeeze else rating
+
+
+def spread_values(spreads: Iterable[str]) -> np.ndarray:
+    """Parse spread strings once into floats, with NaN where no line exists."""
+
+    parsed = [point_spread_value(spread) for spread in spreads]
+    return np.array([np.nan if value is None else value for value in parsed], dtype=np.float64)
+
+
+def confidence_codes(rating_gap: np.ndarray) -> np.ndarray:
+    """Bucket absolute rating gaps into indices of :data:`CONFIDENCE_LABELS`."""
+
+    return np.searchsorted(_CONFIDENCE_EDGES, np.abs(rating_gap), side="right")
+
+
+@dataclass
+class MatchupBatch:
+    """Vectorized outcome of evaluating many games.
+
+    Arrays have the games on their last axis and an optional leading axis per
+    weight set.
+    """
+
+    rating_diff: np.ndarray
+    adjusted_diff: np.ndarray
+    home_pick: np.ndarray
+    confidence: np.ndarray
+
+    def confidence_labels(self) -> np.ndarray:
+        return np.asarray(CONFIDENCE_LABELS, dtype=object)[self.confidence]
+
+
+def evaluate_games(
+    ratings: np.ndarray,
+    home_idx: np.ndarray,
+    away_idx: np.ndarray,
+    spreads: Optional[np.ndarray] = None,
+) -> MatchupBatch:
+    """Evaluate games given team ratings and home/away row indices.
+
+    ``ratings`` may be ``(teams,)`` or ``(n, teams)``; ``spreads`` holds the
+    home line per game (NaN when unavailable) as in ``evaluate_matchup``.
+    """
+
+    rating_diff = ratings[..., home_idx] - ratings[..., away_idx]
+    adjusted_diff = rating_diff
+    if spreads is not None:
+        adjusted_diff = rating_diff - np.nan_to_num(spreads, nan=0.0) / SPREAD_SCALE
+    return MatchupBatch(
+        rating_diff=rating_diff,
+        adjusted_diff=adjusted_diff,
+        home_pick=adjusted_diff >= 0,
+        confidence=confidence_codes(rating_diff),
+    )
+
+
+def evaluate_events(
+    batch: TeamBatch,
+    events: Sequence[ScheduleEvent],
+    ratings: Optional[np.ndarray] = None,
+) -> Tuple[List[ScheduleEvent], MatchupBatch]:
+    """Evaluate compact schedule events, skipping games with unknown teams.
+
+    Returns the events that were evaluated alongside the batch result so the
+    caller can line them up.
+    """
+
+    if ratings is None:
+        ratings = batch_ratings(batch)
+    playable = [e for e in events if e.home_id in batch.position and e.away_id in batch.position]
+    home_idx = batch.indices(e.home_id for e in playable)
+    away_idx = batch.indices(e.away_id for e in playable)
+    spreads = spread_values(e.point_spread for e in playable)
+    return playable, evaluate_games(ratings, home_idx, away_idx, spreads)
+
+
+def pairing_matrix(ratings: np.ndarray) -> MatchupBatch:
+    """Evaluate every ordered ``home x away`` pairing without a spread.
+
+    With ``ratings`` of shape ``(teams,)`` the result arrays are
+    ``(teams, teams)``; element ``[h, a]`` describes team ``h`` hosting ``a``.
+    """
+
+    rating_diff = ratings[..., :, None] - ratings[..., None, :]
+    return MatchupBatch(
+        rating_diff=rating_diff,
+        adjusted_diff=rating_diff,
+        home_pick=rating_diff >= 0,
+        confidence=confidence_codes(rating_diff),
+    )
@@ -0,0 +1,344 @@
+"""Persistent HTTP response cache for the pick'em scripts.
+
+Responses are stored on disk keyed by URL, each URL family gets its own
+time-to-live, stale entries are revalidated with ``ETag``/``Last-Modified``
+conditional requests, and the store is bounded in size with LRU eviction.
+:class:`CachingTransport` plugs the cache underneath a :class:`FetchEngine`
+without the callers noticing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Pattern, Tuple
+
+from pickem_defaults import DEFAULT_CACHE_MAX_BYTES
+from pickem_files import atomic_write
+from pickem_http import DEFAULT_TIMEOUT, OFFLINE_MISS, Transport, TransportError, TransportResponse, fixture_name
+
+INDEX_VERSION = 1
+DEFAULT_MAX_BYTES = DEFAULT_CACHE_MAX_BYTES
+# Request headers that make :class:`CachingTransport` revalidate a fresh entry.
+REVALIDATE_HEADERS: Mapping[str, str] = {"Cache-Control": "no-cache"}
+
+
+def default_cache_dir() -> Path:
+    """Return the per-user cache directory (honours ``XDG_CACHE_HOME``)."""
+
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(root) / "pickem" / "http"
+
+
+def template_pattern(template: str) -> Pattern[str]:
+    """Compile a URL template such as ``.../teams/{team_id}/schedule`` to a regex."""
+
+    pieces = re.split(r"\{[^}]+\}", template)
+    return re.compile("^" + "[^/?]+".join(re.escape(piece) for piece in pieces) + "$")
+
+
+class TTLPolicy:
+    """Map URLs to a time-to-live in seconds using their URL template."""
+
+    def __init__(self, rules: Iterable[Tuple[str, float]], default: float = 0.0) -> None:
+        self.rules: List[Tuple[Pattern[str], float]] = [(template_pattern(t), ttl) for t, ttl in rules]
+        self.default = default
+
+    def ttl_for(self, url: str) -> float:
+        for pattern, ttl in self.rules:
+            if pattern.match(url):
+                return ttl
+        return self.default
+
+
+@dataclass
+class CacheEntry:
+    """Metadata kept in the cache index for one stored response."""
+
+    url: str
+    stored_at: float
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def _cache_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    lowered = name.lower()
+    for key, value in headers.items():
+        if key.lower() == lowered:
+            return value
+    return None
+
+
+class ResponseCache:
+    """Size-bounded on-disk store of response bodies with an LRU index."""
+
+    def __init__(
+        self,
+        directory: Path | str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._load_index()
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / "index.json"
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / "bodies" / key[:2] / key
+
+    def _load_index(self) -> None:
+        try:
+            raw = json.loads(self.index_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return
+        if raw.get("version") != INDEX_VERSION:
+            return
+        for key, data in raw.get("entries", {}).items():
+            entry = CacheEntry(**data)
+            self._entries[key] = entry
+            self._total_bytes += entry.size
+
+    def _write_index(self) -> None:
+        payload = {
+            "version": INDEX_VERSION,
+            "entries": {key: asdict(entry) for key, entry in self._entries.items()},
+        }
+        atomic_write(self.index_path, json.dumps(payload).encode("utf-8"))
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Return the index entry for ``url`` and mark it as recently used."""
+
+        key = _cache_key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._dirty = True
+            return entry
+
+    def record(self, outcome: str) -> None:
+        """Count one ``"hits"``, ``"misses"`` or ``"revalidated"`` outcome."""
+
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def read_body(self, url: str) -> Optional[bytes]:
+        try:
+            return self._body_path(_cache_key(url)).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def store(self, url: str, body: bytes, headers: Mapping[str, str]) -> CacheEntry:
+        """Persist a response body and evict least-recently-used entries."""
+
+        key = _cache_key(url)
+        entry = CacheEntry(
+            url=url,
+            stored_at=self.clock(),
+            size=len(body),
+            etag=_header(headers, "ETag"),
+            last_modified=_header(headers, "Last-Modified"),
+        )
+        atomic_write(self._body_path(key), body)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous.size
+            self._entries[key] = entry
+            self._total_bytes += entry.size
+            self._dirty = True
+            if self._evict_locked():
+                self._write_index()
+        return entry
+
+    def touch(self, url: str, headers: Mapping[str, str]) -> None:
+        """Record a successful revalidation (HTTP 304) for ``url``."""
+
+        key = _cache_key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.stored_at = self.clock()
+            entry.etag = _header(headers, "ETag") or entry.etag
+            entry.last_modified = _header(headers, "Last-Modified") or entry.last_modified
+            self._dirty = True
+
+    def _evict_locked(self) -> bool:
+        """Drop least-recently-used entries; returns whether any were removed."""
+
+        evicted = False
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry.size
+            try:
+                self._body_path(key).unlink()
+            except FileNotFoundError:
+                pass
+            evicted = True
+        return evicted
+
+    def flush(self) -> None:
+        """Persist index changes made since the last write.
+
+        Stores, revalidations and cache hits only mark the index dirty, so a
+        refresh of many URLs writes it once here instead of once per response.
+        Eviction still writes it immediately because it deletes body files.
+        """
+
+        with self._lock:
+            if self._dirty:
+                self._write_index()
+
+    def clear(self) -> None:
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._entries.clear()
+            self._total_bytes = 0
+            self._dirty = False
+
+    def export_fixtures(self, destination: Path | str) -> int:
+        """Copy every cached body into a directory readable by ``FixtureTransport``.
+
+        This freezes the current cache contents into a snapshot that tests can
+        replay without network access. Returns the number of files written.
+        """
+
+        destination = Path(destination)
+        destination.mkdir(parents=True, exist_ok=True)
+        written = 0
+        with self._lock:
+            entries = list(self._entries.items())
+        for key, entry in entries:
+            try:
+                body = self._body_path(key).read_bytes()
+            except FileNotFoundError:
+                continue
+            (destination / fixture_name(entry.url)).write_bytes(body)
+            written += 1
+        return written
+
+
+class CachingTransport:
+    """Transport wrapper that answers from a :class:`ResponseCache` when possible.
+
+    Fresh entries are returned without touching the network; stale entries are
+    revalidated with conditional headers and served if the origin answers 304,
+    fails with a server error or cannot be reached at all. Requests carrying :data:`REVALIDATE_HEADERS`
+    revalidate even fresh entries. With ``offline=True`` the inner transport is
+    never used and uncached URLs fail with HTTP 504.
+    """
+
+    def __init__(
+        self,
+        inner: Optional[Transport],
+        cache: ResponseCache,
+        policy: TTLPolicy,
+        offline: bool = False,
+    ) -> None:
+        if inner is None and not offline:
+            raise ValueError("An inner transport is required unless running offline")
+        self.inner = inner
+        self.cache = cache
+        self.policy = policy
+        self.offline = offline
+
+    def connection_stats(self) -> Optional[Dict[str, int]]:
+        stats = getattr(self.inner, "connection_stats", None)
+        return stats() if callable(stats) else None
+
+    def _cached_response(self, url: str, entry: CacheEntry, state: str) -> Optional[TransportResponse]:
+        body = self.cache.read_body(url)
+        if body is None:
+            return None
+        headers = {"X-Cache": state}
+        if entry.etag:
+            headers["ETag"] = entry.etag
+        if entry.last_modified:
+            headers["Last-Modified"] = entry.last_modified
+        return TransportResponse(url=url, status=200, body=body, headers=headers)
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> TransportResponse:
+        entry = self.cache.lookup(url)
+        if entry is not None:
+            fresh = self.cache.clock() - entry.stored_at < self.policy.ttl_for(url)
+            if fresh and (_header(headers or {}, "Cache-Control") or "").lower() == "no-cache":
+                fresh = False
+            if fresh or self.offline:
+                cached = self._cached_response(url, entry, "hit" if fresh else "stale")
+                if cached is not None:
+                    self.cache.record("hits")
+                    return cached
+                entry = None
+
+        if self.offline or self.inner is None:
+            self.cache.record("misses")
+            return TransportResponse(url=url, status=504, body=b"", headers={"X-Cache": OFFLINE_MISS})
+
+        request_headers: Dict[str, str] = dict(headers or {})
+        if entry is not None:
+            if entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request_headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            response = self.inner.get(url, headers=request_headers, timeout=timeout)
+        except TransportError:
+            cached = self._cached_response(url, entry, "stale") if entry is not None else None
+            if cached is None:
+                raise
+            self.cache.record("hits")
+            return cached
+        if entry is not None and (response.status == 304 or response.status >= 500):
+            cached = self._cached_response(url, entry, "revalidated" if response.status == 304 else "stale")
+            if cached is not None:
+                if response.status == 304:
+                    self.cache.touch(url, response.headers)
+                    self.cache.record("revalidated")
+                else:
+                    self.cache.record("hits")
+                return cached
+
+        self.cache.record("misses")
+        if response.status == 200:
+            self.cache.store(url, response.body, response.headers)
+        return response
+
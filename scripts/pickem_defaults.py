@@ -0,0 +1,13 @@
+"""Tunable defaults shared by the fetch engine, the cache and the CLI.
+
+Kept free of third-party and network imports so ``pickem_agent.py`` can show
+them in ``--help`` and resolve unset flags without loading the HTTP stack.
+"""
+
+DEFAULT_TIMEOUT = 20.0
+DEFAULT_CONCURRENCY = 16
+# Attempts per request for HTTP 429/5xx answers and connection errors.
+DEFAULT_RETRY_ATTEMPTS = 4
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Age (seconds) after which a --week-cache query warns that its file is stale.
+DEFAULT_WEEK_CACHE_MAX_AGE = 24 * 60 * 60
@@ -0,0 +1,72 @@
+"""Atomic file replacement shared by the pick'em scripts.
+
+Every output the scripts rewrite (season JSON, shards, binary stores, cache
+bodies, snapshots, indexes) is written to a temporary file in the target
+directory and renamed over the destination, so readers see either the old or
+the new file and never a partial one. The replacement keeps the permissions of
+the file it replaces, or gets the umask default for new files instead of the
+0600 of ``tempfile``.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator, Union
+
+# Read once: querying the umask means setting it, which races with other
+# threads creating files.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def file_mode(path: Union[Path, str]) -> int:
+    """Keep an existing file's permissions, else use the umask default."""
+
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_open(path: Union[Path, str], mode: str = "wb", fsync: bool = False) -> Iterator[IO[Any]]:
+    """Yield a handle whose contents replace ``path`` when the block succeeds.
+
+    ``mode`` is ``"wb"`` or ``"w"`` (UTF-8). On any exception the temporary
+    file is removed and ``path`` is left untouched.
+    """
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle = tempfile.NamedTemporaryFile(
+        mode,
+        dir=path.parent,
+        prefix=f".{path.name}.",
+        suffix=".tmp",
+        delete=False,
+        encoding=None if "b" in mode else "utf-8",
+    )
+    try:
+        with handle as out:
+            yield out
+            if fsync:
+                out.flush()
+                os.fsync(out.fileno())
+        os.chmod(handle.name, file_mode(path))
+        os.replace(handle.name, path)
+    except BaseException:
+        try:
+            os.unlink(handle.name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write(path: Union[Path, str], data: Union[bytes, str], fsync: bool = False) -> None:
+    """Replace ``path`` with ``data`` atomically."""
+
+    with atomic_open(path, "wb" if isinstance(data, bytes) else "w", fsync=fsync) as out:
+        out.write(data)
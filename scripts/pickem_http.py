@@ -0,0 +1,576 @@
+"""HTTP fetch engine shared by the pick'em scripts.
+
+The engine issues GET requests through a pluggable transport so the same code
+path can talk to ESPN, to a local stub server, or to a directory of recorded
+fixtures. Requests run on a bounded thread pool with an optional per-host rate
+limit, so fetching a batch of resources costs roughly the time of the slowest
+request instead of the sum of all of them.
+
+Network transports keep connections alive in a shared pool. The engine retries
+HTTP 429/5xx answers and connection errors with jittered exponential backoff,
+trips a circuit breaker for hosts that keep failing, and records retry,
+connection-reuse and per-endpoint latency statistics.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Protocol
+from urllib.parse import urlsplit
+
+from pickem_defaults import DEFAULT_CONCURRENCY, DEFAULT_RETRY_ATTEMPTS, DEFAULT_TIMEOUT
+from pickem_metrics import METRICS
+
+# Consecutive URLs on one host that exhausted their retries before its circuit
+# opens, so a few bad team documents cannot fail the rest of a batch fast.
+DEFAULT_BREAKER_THRESHOLD = 10
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Latency samples kept per endpoint; percentiles cover the most recent ones,
+# so a long-running service does not grow without bound.
+LATENCY_WINDOW = 2048
+
+
+class FetchError(RuntimeError):
+    """Raised when a resource cannot be retrieved or decoded."""
+
+    def __init__(self, url: str, message: str, status: Optional[int] = None) -> None:
+        super().__init__(f"{message} ({url})")
+        self.url = url
+        self.status = status
+
+
+class TransportError(FetchError):
+    """Raised by transports for connection-level failures (resets, timeouts)."""
+
+
+class CircuitOpenError(FetchError):
+    """Raised without contacting the endpoint while its circuit breaker is open."""
+
+
+class OfflineMissError(FetchError):
+    """Raised for a URL missing from the cache in offline mode; never retried."""
+
+
+# ``X-Cache`` value of the synthesized 504 an offline cache returns on a miss.
+OFFLINE_MISS = "offline-miss"
+
+
+@dataclass
+class TransportResponse:
+    """Minimal response object returned by every transport."""
+
+    url: str
+    status: int
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class Transport(Protocol):
+    """Anything that can perform a GET request for the engine."""
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> TransportResponse:
+        ...
+
+
+class RequestsTransport:
+    """Transport backed by a pooled, keep-alive ``requests.Session``.
+
+    ``base_url`` rewrites the scheme and host of every request, which lets the
+    agent run unchanged against a local stub server. ``pool_size`` should be at
+    least the engine concurrency so no worker waits for a free connection.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, pool_size: int = DEFAULT_CONCURRENCY) -> None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._requests = requests
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.session = requests.Session()
+        self.connections = ConnectionCounter()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.connections.instrument(adapter)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def resolve(self, url: str) -> str:
+        if not self.base_url:
+            return url
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.base_url}{parts.path}{query}"
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> TransportResponse:
+        self.connections.record_request()
+        try:
+            response = self.session.get(self.resolve(url), headers=dict(headers or {}), timeout=timeout)
+        except self._requests.RequestException as exc:
+            raise TransportError(url, f"{type(exc).__name__}: {exc}") from exc
+        return TransportResponse(
+            url=url,
+            status=response.status_code,
+            body=response.content,
+            headers=dict(response.headers),
+        )
+
+    def connection_stats(self) -> Dict[str, int]:
+        return self.connections.snapshot()
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class HttpxTransport:
+    """HTTP/2 transport backed by ``httpx`` (requires ``httpx[http2]``).
+
+    HTTP/2 multiplexes every concurrent request to a host over a single
+    connection, so the whole profile build pays for one TLS handshake per host.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, pool_size: int = DEFAULT_CONCURRENCY) -> None:
+        import httpx
+
+        self._httpx = httpx
+        self.base_url = base_url.rstrip("/") if base_url else None
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self.client = httpx.Client(http2=True, limits=limits)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._connections: set[tuple[str, str]] = set()
+
+    resolve = RequestsTransport.resolve
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> TransportResponse:
+        try:
+            response = self.client.get(self.resolve(url), headers=dict(headers or {}), timeout=timeout)
+        except self._httpx.HTTPError as exc:
+            raise TransportError(url, f"{type(exc).__name__}: {exc}") from exc
+        with self._lock:
+            self._requests += 1
+            self._connections.add((response.url.host, response.http_version))
+        return TransportResponse(
+            url=url,
+            status=response.status_code,
+            body=response.content,
+            headers=dict(response.headers),
+        )
+
+    def connection_stats(self) -> Dict[str, int]:
+        # Approximation: one multiplexed connection per (host, protocol) pair.
+        with self._lock:
+            opened = len(self._connections)
+            return {"requests": self._requests, "opened": opened, "reused": max(self._requests - opened, 0)}
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class ConnectionCounter:
+    """Count new connections opened by a ``requests`` adapter's urllib3 pools."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.opened = 0
+
+    def instrument(self, adapter: Any) -> None:
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+        counter = self
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):  # type: ignore[no-untyped-def]
+                counter.record_open()
+                return super()._new_conn()
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):  # type: ignore[no-untyped-def]
+                counter.record_open()
+                return super()._new_conn()
+
+        adapter.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_open(self) -> None:
+        with self._lock:
+            self.opened += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "opened": self.opened,
+                "reused": max(self.requests - self.opened, 0),
+            }
+
+
+def fixture_name(url: str) -> str:
+    """Return the file name used to store ``url`` inside a fixture directory."""
+
+    parts = urlsplit(url)
+    slug = f"{parts.netloc}{parts.path}"
+    if parts.query:
+        slug = f"{slug}_{parts.query}"
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", slug).strip("_") + ".json"
+
+
+class FixtureTransport:
+    """Transport that serves responses from a directory of JSON files.
+
+    Files are looked up by :func:`fixture_name`; a missing file behaves like an
+    HTTP 404 so callers exercise the same error handling as in production.
+    """
+
+    def __init__(self, directory: Path | str) -> None:
+        self.directory = Path(directory)
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> TransportResponse:
+        path = self.directory / fixture_name(url)
+        try:
+            body = path.read_bytes()
+        except FileNotFoundError:
+            return TransportResponse(url=url, status=404, body=b"")
+        return TransportResponse(url=url, status=200, body=body, headers={"Content-Type": "application/json"})
+
+
+class HostRateLimiter:
+    """Space out requests to each host to at most ``rate`` per second."""
+
+    def __init__(self, rate: Optional[float]) -> None:
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> None:
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def endpoint_key(url: str) -> str:
+    """Collapse a URL to its endpoint by replacing numeric path segments.
+
+    ``.../teams/12/schedule`` and ``.../teams/7/schedule`` share the key
+    ``host/.../teams/{id}/schedule`` for latency stats.
+    """
+
+    parts = urlsplit(url)
+    path = re.sub(r"/\d+(?=/|$)", "/{id}", parts.path)
+    return f"{parts.netloc}{path}"
+
+
+def breaker_key(url: str) -> str:
+    """Circuit breaker key of ``url``: its host, so one outage opens one circuit."""
+
+    return urlsplit(url).netloc or url
+
+
+@dataclass
+class RetryPolicy:
+    """Jittered exponential backoff for retryable failures.
+
+    Attempt ``n`` (zero based) sleeps a uniformly random time in
+    ``[0, min(max_delay, base_delay * 2**n)]`` ("full jitter"), or the server's
+    ``Retry-After`` value when it sends one.
+    """
+
+    attempts: int = DEFAULT_RETRY_ATTEMPTS
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        hinted = _parse_retry_after(retry_after)
+        if hinted is not None:
+            return min(hinted, self.max_delay)
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Stop calling a host after repeated consecutive failures.
+
+    A failure is one URL giving up after its retries. After ``threshold``
+    consecutive failures the circuit opens for ``cooldown`` seconds;
+    the first call after that is let through as a probe and either closes the
+    circuit on success or re-opens it on failure.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_BREAKER_THRESHOLD, cooldown: float = 30.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+
+    def allow(self, endpoint: str) -> bool:
+        with self._lock:
+            opened_at = self._opened_at.get(endpoint)
+            if opened_at is None:
+                return True
+            if self.clock() - opened_at >= self.cooldown:
+                # Half-open: admit this probe and hold the circuit open for others.
+                self._opened_at[endpoint] = self.clock()
+                return True
+            return False
+
+    def record_success(self, endpoint: str) -> None:
+        with self._lock:
+            self._failures.pop(endpoint, None)
+            self._opened_at.pop(endpoint, None)
+
+    def record_failure(self, endpoint: str) -> None:
+        with self._lock:
+            failures = self._failures.get(endpoint, 0) + 1
+            self._failures[endpoint] = failures
+            if failures >= self.threshold:
+                self._opened_at[endpoint] = self.clock()
+
+    def open_endpoints(self) -> List[str]:
+        with self._lock:
+            return sorted(self._opened_at)
+
+
+@dataclass
+class EndpointStats:
+    """Request outcomes and the last :data:`LATENCY_WINDOW` latencies (seconds) of one endpoint."""
+
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(int(fraction * len(ordered)), len(ordered) - 1)] * 1000, 2)
+
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "latency_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "max": percentile(1.0)},
+        }
+
+
+class FetchEngine:
+    """Fetch JSON documents concurrently through a transport."""
+
+    def __init__(
+        self,
+        transport: Optional[Transport] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_host_rate: Optional[float] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.transport: Transport = (
+            transport if transport is not None else RequestsTransport(pool_size=concurrency)
+        )
+        self.concurrency = concurrency
+        self.rate_limiter = HostRateLimiter(per_host_rate)
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.sleep = sleep
+        self.failures: Dict[str, FetchError] = {}
+        self.rejected: List[str] = []
+        self._stats: Dict[str, EndpointStats] = {}
+        self._stats_lock = threading.Lock()
+
+    def _endpoint_stats(self, endpoint: str) -> EndpointStats:
+        with self._stats_lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = EndpointStats()
+            return stats
+
+    def _record(
+        self,
+        stats: EndpointStats,
+        latency: Optional[float] = None,
+        retried: bool = False,
+        failed: bool = False,
+    ) -> None:
+        with self._stats_lock:
+            if latency is not None:
+                stats.requests += 1
+                stats.latencies.append(latency)
+            if retried:
+                stats.retries += 1
+            if failed:
+                stats.failures += 1
+
+    def fetch_json(self, url: str, headers: Optional[Mapping[str, str]] = None) -> Any:
+        """Fetch and decode a single JSON document, retrying transient errors."""
+
+        endpoint = endpoint_key(url)
+        host = breaker_key(url)
+        stats = self._endpoint_stats(endpoint)
+        if not self.breaker.allow(host):
+            self._record(stats, failed=True)
+            with self._stats_lock:
+                self.rejected.append(url)
+            raise CircuitOpenError(url, f"Circuit open for {host}")
+        for attempt in range(self.retry.attempts):
+            self.rate_limiter.acquire(url)
+            started = time.perf_counter()
+            retry_after: Optional[str] = None
+            try:
+                response = self.transport.get(url, headers=headers, timeout=self.timeout)
+            except TransportError as exc:
+                error: FetchError = exc
+            else:
+                if response.status < 400:
+                    latency = time.perf_counter() - started
+                    self._record(stats, latency=latency)
+                    self.breaker.record_success(host)
+                    cache_state = response.headers.get("X-Cache")
+                    METRICS.record_span("fetch", started, latency, {"endpoint": endpoint, "cache": cache_state})
+                    METRICS.observe_request(endpoint, latency, len(response.body), cache_state)
+                    try:
+                        with METRICS.span("decode"):
+                            return response.json()
+                    except ValueError as exc:
+                        raise FetchError(url, f"Invalid JSON payload: {exc}", status=response.status) from exc
+                if response.headers.get("X-Cache") == OFFLINE_MISS:
+                    # Retrying cannot help and the host is not at fault.
+                    self._record(stats, failed=True)
+                    raise OfflineMissError(url, "Not in the cache (offline mode)", status=response.status)
+                error = FetchError(url, f"HTTP {response.status}", status=response.status)
+                if response.status not in RETRYABLE_STATUSES:
+                    self._record(stats, latency=time.perf_counter() - started, failed=True)
+                    raise error
+                retry_after = next(
+                    (value for key, value in response.headers.items() if key.lower() == "retry-after"),
+                    None,
+                )
+            final = attempt + 1 >= self.retry.attempts
+            self._record(stats, latency=time.perf_counter() - started, retried=not final, failed=final)
+            if final:
+                self.breaker.record_failure(host)
+                raise error
+            self.sleep(self.retry.delay(attempt, retry_after))
+        raise AssertionError("unreachable")
+
+    def fetch_many(
+        self,
+        urls: Iterable[str],
+        skip_failures: bool = False,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Fetch every URL concurrently and return payloads keyed by URL.
+
+        Duplicate URLs are fetched once. By default the first failure is
+        re-raised after the in-flight requests finish; with ``skip_failures``
+        failed URLs are left out of the result and recorded in ``failures``.
+        """
+
+        unique: List[str] = list(dict.fromkeys(urls))
+        if not unique:
+            return {}
+        workers = min(self.concurrency, len(unique))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pickem-fetch") as pool:
+            futures = {url: pool.submit(self.fetch_json, url, headers) for url in unique}
+        results: Dict[str, Any] = {}
+        for url, future in futures.items():
+            error = future.exception()
+            if error is None:
+                results[url] = future.result()
+            elif skip_failures and isinstance(error, FetchError):
+                self.failures[url] = error
+            else:
+                raise error
+        return results
+
+    def reset_failures(self) -> None:
+        """Forget skipped and circuit-rejected URLs, e.g. before each refresh cycle.
+
+        Counters and latencies in :meth:`report` are kept.
+        """
+
+        with self._stats_lock:
+            self.failures = {}
+            self.rejected = []
+
+    def report(self) -> Dict[str, Any]:
+        """Summarise retries, connection reuse, per-endpoint latency and failed URLs."""
+
+        with self._stats_lock:
+            endpoints = {name: stats.summary() for name, stats in sorted(self._stats.items())}
+            rejected = sorted(set(self.rejected))
+        connection_stats = getattr(self.transport, "connection_stats", None)
+        return {
+            "requests": sum(item["requests"] for item in endpoints.values()),
+            "retries": sum(item["retries"] for item in endpoints.values()),
+            "failures": sum(item["failures"] for item in endpoints.values()),
+            "connections": connection_stats() if callable(connection_stats) else None,
+            "open_circuits": self.breaker.open_endpoints(),
+            "circuit_rejected": rejected,
+            "skipped": sorted(self.failures),
+            "endpoints": endpoints,
+        }
@@ -0,0 +1,255 @@
+"""Timers, counters and latency histograms for the pick'em scripts.
+
+A single process-wide :data:`METRICS` registry collects:
+
+* per-stage wall time and call counts (``with METRICS.span("stage"):``),
+* labelled counters, e.g. bytes downloaded and responses by cache state,
+* per-endpoint request latency histograms.
+
+Optionally every span is also kept as a Chrome trace event, so a run can be
+written with :meth:`Metrics.write_trace` and opened in ``chrome://tracing``,
+Perfetto or speedscope (flamegraph view). :meth:`Metrics.prometheus_text`
+renders the registry in the Prometheus text exposition format.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Upper bounds (seconds) of the request latency buckets; +Inf is implicit.
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Trace events kept per process; later spans are still timed but not traced.
+MAX_TRACE_EVENTS = 1_000_000
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+@dataclass
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    counts: List[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given quantile."""
+
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _label_text(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"') for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+class Metrics:
+    """Thread-safe registry of stage timers, counters and histograms."""
+
+    def __init__(self, clock: Any = time.perf_counter) -> None:
+        self.clock = clock
+        self.tracing = False
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.latency: Dict[str, Histogram] = {}
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._origin = clock()
+        self._lock = threading.Lock()
+
+    def enable_tracing(self) -> None:
+        """Keep every span as a trace event from now on."""
+
+        self.tracing = True
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages.clear()
+            self.counters.clear()
+            self.latency.clear()
+            self._events.clear()
+            self._threads.clear()
+            self._origin = self.clock()
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        """Time the enclosed block as stage ``name``."""
+
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.record_span(name, started, self.clock() - started, args)
+
+    def record_span(self, name: str, started: float, seconds: float, args: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = StageStats()
+            stage.calls += 1
+            stage.seconds += seconds
+            stage.max_seconds = max(stage.max_seconds, seconds)
+            if self.tracing and len(self._events) < MAX_TRACE_EVENTS:
+                thread = threading.current_thread()
+                self._threads.setdefault(thread.ident or 0, thread.name)
+                event = {
+                    "name": name,
+                    "ph": "X",
+                    "ts": round((started - self._origin) * 1e6, 3),
+                    "dur": round(seconds * 1e6, 3),
+                    "pid": os.getpid(),
+                    "tid": thread.ident or 0,
+                }
+                if args:
+                    event["args"] = args
+                self._events.append(event)
+
+    def count(self, name: str, amount: float = 1, **labels: Any) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe_request(self, endpoint: str, seconds: float, body_bytes: int, cache_state: Optional[str]) -> None:
+        """Record one successful fetch; ``cache_state`` is None for network bodies."""
+
+        with self._lock:
+            histogram = self.latency.get(endpoint)
+            if histogram is None:
+                histogram = self.latency[endpoint] = Histogram()
+            histogram.observe(seconds)
+        source = cache_state or "network"
+        self.count("responses", source=source)
+        self.count("bytes_downloaded" if cache_state is None else "bytes_from_cache", body_bytes)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {
+                name: {
+                    "calls": stage.calls,
+                    "total_ms": round(stage.seconds * 1000, 3),
+                    "max_ms": round(stage.max_seconds * 1000, 3),
+                }
+                for name, stage in sorted(self.stages.items(), key=lambda item: -item[1].seconds)
+            }
+            endpoints = {
+                endpoint: {
+                    "requests": histogram.count,
+                    "mean_ms": round(histogram.total / histogram.count * 1000, 3),
+                    "p50_le_ms": _ms(histogram.quantile(0.5)),
+                    "p95_le_ms": _ms(histogram.quantile(0.95)),
+                }
+                for endpoint, histogram in sorted(self.latency.items())
+            }
+            responses = {dict(labels)["source"]: value for (name, labels), value in self.counters.items() if name == "responses"}
+            counters = {
+                name + _label_text(labels): value
+                for (name, labels), value in sorted(self.counters.items())
+                if name != "responses"
+            }
+        total = sum(responses.values())
+        cached = total - responses.get("network", 0)
+        return {
+            "stages": stages,
+            "endpoints": endpoints,
+            "responses": responses,
+            "cache_hit_rate": round(cached / total, 4) if total else None,
+            "counters": counters,
+        }
+
+    def trace(self) -> Dict[str, Any]:
+        """Chrome trace-event document of the recorded spans."""
+
+        with self._lock:
+            pid = os.getpid()
+            names = [
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self._threads.items()
+            ]
+            events = names + list(self._events)
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": self.summary()}
+
+    def write_trace(self, path: "Path | str") -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.trace(), handle)
+
+    def prometheus_text(self, prefix: str = "pickem") -> str:
+        """Render the registry in the Prometheus text exposition format."""
+
+        lines: List[str] = []
+        with self._lock:
+            lines.append(f"# TYPE {prefix}_stage_seconds_total counter")
+            for name, stage in sorted(self.stages.items()):
+                lines.append(f"{prefix}_stage_seconds_total{_label_text((('stage', name),))} {stage.seconds:.6f}")
+            lines.append(f"# TYPE {prefix}_stage_calls_total counter")
+            for name, stage in sorted(self.stages.items()):
+                lines.append(f"{prefix}_stage_calls_total{_label_text((('stage', name),))} {stage.calls}")
+            seen = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = f"{prefix}_{name}_total"
+                if metric not in seen:
+                    seen.add(metric)
+                    lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric}{_label_text(labels)} {value:g}")
+            metric = f"{prefix}_request_duration_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for endpoint, histogram in sorted(self.latency.items()):
+                label = _label_text((("endpoint", endpoint),))[1:-1]
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f'{metric}_bucket{{{label},le="{le}"}} {cumulative}')
+                lines.append(f"{metric}_sum{{{label}}} {histogram.total:.6f}")
+                lines.append(f"{metric}_count{{{label}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    if seconds is None:
+        return None
+    return None if seconds == float("inf") else round(seconds * 1000, 3)
+
+
+METRICS = Metrics()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""Track point-spread movement and re-evaluate only the games whose line moved.
+
+Odds updates arrive either by polling the league scoreboard or as a stream of
+JSON lines (``{"event_id": "...", "spread": "-3½", "ts": 1700000000}``). Each
+game keeps a compact time series of its home line (only moves are recorded).
+When a line moves, the game's matchup is re-evaluated against the warm profile
+snapshot and change events are written to stdout as JSON lines:
+
+    line_move           the home line changed
+    pick_flip           the recommended pick changed sides
+    confidence_change   the confidence label changed
+
+Usage:
+    python scripts/pickem_odds.py --poll-interval 15
+    python scripts/pickem_odds.py --stream odds.jsonl
+    some-feed | python scripts/pickem_odds.py --stream -
+
+All transport and cache options of ``pickem_agent.py`` are accepted.
+
+Dependencies:
+    - requests
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import sys
+import time
+from array import array
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from pickem_agent import SCOREBOARD_URL, build_arg_parser, build_engine, parse_point_spread, point_spread_value
+from pickem_cache import REVALIDATE_HEADERS
+from pickem_http import FetchEngine, FetchError
+from pickem_snapshot import ProfileSnapshot, default_state_path, load_snapshot, refresh_snapshot
+
+DEFAULT_POLL_INTERVAL = 30.0
+
+
+class SpreadSeries:
+    """Timestamps and home lines of one game; NaN means off the board."""
+
+    __slots__ = ("times", "lines")
+
+    def __init__(self) -> None:
+        self.times = array("d")
+        self.lines = array("d")
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def last(self) -> Optional[float]:
+        if not self.lines:
+            return None
+        value = self.lines[-1]
+        return None if math.isnan(value) else value
+
+    def record(self, at: float, line: Optional[float]) -> bool:
+        """Append ``line`` if it differs from the latest one; return whether it did."""
+
+        value = math.nan if line is None else line
+        if self.lines:
+            previous = self.lines[-1]
+            if previous == value or (math.isnan(previous) and math.isnan(value)):
+                return False
+        self.times.append(at)
+        self.lines.append(value)
+        return True
+
+    def points(self) -> List[Tuple[float, Optional[float]]]:
+        return [(t, None if math.isnan(v) else v) for t, v in zip(self.times, self.lines)]
+
+
+@dataclass
+class ChangeEvent:
+    """One observable consequence of a line move."""
+
+    kind: str
+    event_id: str
+    week: Optional[int]
+    home_team: str
+    away_team: str
+    at: float
+    before: Any
+    after: Any
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+
+class OddsTracker:
+    """Per-game spread history on top of a :class:`ProfileSnapshot`."""
+
+    def __init__(self, snapshot: ProfileSnapshot, clock: Any = time.time) -> None:
+        self.snapshot = snapshot
+        self.clock = clock
+        self.series: Dict[str, SpreadSeries] = {}
+        self.evaluations = 0
+        started = clock()
+        for event_id, event in snapshot.events.items():
+            series = self.series[event_id] = SpreadSeries()
+            series.record(started, point_spread_value(event.point_spread))
+
+    def ingest(self, event_id: str, spread: str, at: Optional[float] = None) -> List[ChangeEvent]:
+        """Apply one spread quote; re-evaluate the game only if its line moved.
+
+        A move is reported as ``line_move`` even when the game cannot be
+        evaluated (e.g. a team is missing from the snapshot).
+        """
+
+        event = self.snapshot.events.get(event_id)
+        if event is None:
+            return []
+        at = self.clock() if at is None else at
+        series = self.series.setdefault(event_id, SpreadSeries())
+        before = series.last
+        event.point_spread = spread
+        previous = self.snapshot.matchups.get(event_id)
+        if not series.record(at, point_spread_value(spread)):
+            # Same number, possibly a different rendering ("-3.5" vs "X -3½").
+            if previous is not None:
+                previous["point_spread"] = spread
+            return []
+
+        current: Optional[Dict[str, Any]] = None
+        if self.snapshot.evaluate([event_id]):
+            self.evaluations += 1
+            current = self.snapshot.matchups[event_id]
+            week, home_team, away_team = current["week"], current["home_team"], current["away_team"]
+        else:
+            profiles = self.snapshot.profiles
+            home, away = profiles.get(event.home_id), profiles.get(event.away_id)
+            week = event.week
+            home_team = home.name if home is not None else event.home_id
+            away_team = away.name if away is not None else event.away_id
+
+        def change(kind: str, old: Any, new: Any) -> ChangeEvent:
+            return ChangeEvent(kind, event_id, week, home_team, away_team, at, old, new)
+
+        changes = [change("line_move", before, series.last)]
+        if previous is not None and current is not None:
+            if previous["recommended_pick"] != current["recommended_pick"]:
+                changes.append(change("pick_flip", previous["recommended_pick"], current["recommended_pick"]))
+            if previous["confidence"] != current["confidence"]:
+                changes.append(change("confidence_change", previous["confidence"], current["confidence"]))
+        return changes
+
+    def ingest_scoreboard(self, scoreboard: Dict[str, Any], at: Optional[float] = None) -> List[ChangeEvent]:
+        changes: List[ChangeEvent] = []
+        for quote_event_id, spread in scoreboard_quotes(scoreboard):
+            changes.extend(self.ingest(quote_event_id, spread, at))
+        return changes
+
+
+def scoreboard_quotes(scoreboard: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """Yield ``(event_id, spread)`` for every scoreboard game."""
+
+    for event in scoreboard.get("events", []):
+        event_id = event.get("id") or event.get("uid")
+        competitions = event.get("competitions", [])
+        if event_id is not None and competitions:
+            yield str(event_id), parse_point_spread(competitions[0])
+
+
+def stream_quotes(lines: Iterable[str]) -> Iterator[Tuple[str, str, Optional[float]]]:
+    """Parse JSON-line quotes, skipping (and reporting) malformed lines.
+
+    ``ts`` is optional (the quote is stamped on arrival) but must be a finite
+    number of seconds when present.
+    """
+
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            quote = json.loads(line)
+            at = quote.get("ts")
+            if at is not None and (
+                isinstance(at, bool) or not isinstance(at, (int, float)) or not math.isfinite(at)
+            ):
+                raise ValueError(f"ts must be a number of seconds, got {at!r}")
+            yield str(quote["event_id"]), str(quote["spread"]), None if at is None else float(at)
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            print(f"warning: skipping quote on line {number}: {exc}", file=sys.stderr)
+
+
+def emit(changes: Iterable[ChangeEvent], out: TextIO = sys.stdout) -> None:
+    for change in changes:
+        out.write(change.to_json() + "\n")
+    out.flush()
+
+
+def poll(tracker: OddsTracker, engine: FetchEngine, interval: float, once: bool = False) -> None:
+    """Poll the scoreboard every ``interval`` seconds; failed polls are skipped."""
+
+    while True:
+        try:
+            scoreboard = engine.fetch_json(SCOREBOARD_URL, headers=REVALIDATE_HEADERS)
+        except FetchError as exc:
+            print(f"warning: scoreboard poll failed: {exc}", file=sys.stderr)
+        else:
+            emit(tracker.ingest_scoreboard(scoreboard))
+        if once:
+            return
+        time.sleep(interval)
+
+
+def main() -> None:
+    parser = build_arg_parser("Track spread movement and emit pick changes", with_week=False)
+    parser.add_argument(
+        "--state",
+        default=str(default_state_path()),
+        help="Profile snapshot to evaluate against (built if missing)",
+    )
+    parser.add_argument("--stream", default=None, help="Read JSON-line quotes from this file ('-' for stdin)")
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="Seconds between scoreboard polls when not reading a stream",
+    )
+    parser.add_argument("--once", action="store_true", help="Poll the scoreboard a single time and exit")
+    args = parser.parse_args()
+    engine, cache = build_engine(args)
+
+    snapshot = load_snapshot(args.state)
+    if snapshot is None:
+        snapshot = ProfileSnapshot.build(engine)
+    else:
+        refresh_snapshot(snapshot, engine)
+    tracker = OddsTracker(snapshot)
+    try:
+        if args.stream:
+            source = sys.stdin if args.stream == "-" else Path(args.stream).open()
+            with source:
+                for event_id, spread, at in stream_quotes(source):
+                    emit(tracker.ingest(event_id, spread, at))
+        else:
+            poll(tracker, engine, args.poll_interval, once=args.once)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if cache is not None:
+            cache.flush()
+        snapshot.save(args.state)
+        print(f"Re-evaluated {tracker.evaluations} matchup(s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Columnar binary season store.
+
+A season file holds one fixed-width column per game attribute (season, week,
+home/away team index, scores, status, kickoff epoch) plus a string table with
+the team names the indices refer to. Rows are sorted by season and week.
+:class:`SeasonStore` memory-maps the file and exposes every column as a
+read-only NumPy view into the mapping, so opening even many seasons costs a
+header parse and no text decoding.
+
+Layout (little endian)::
+
+    magic "PKSN" | version u16 | column count u16 | row count u64
+    string table offset u64 | string table length u64
+    column directory: name 16s | dtype 8s | offset u64   (per column)
+    column data, each aligned to 8 bytes
+    string table: count u32 | (count + 1) u32 offsets | UTF-8 blob
+
+Dependencies:
+    - numpy
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from pickem_files import atomic_open
+
+MAGIC = b"PKSN"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHQQQ")
+COLUMN_ENTRY = struct.Struct("<16s8sQ")
+
+STATUS_SCHEDULED = 0
+STATUS_FINAL = 1
+NO_SCORE = -1
+
+# Column name -> dtype. Order is the on-disk order.
+COLUMNS: Dict[str, str] = {
+    "season": "<u2",
+    "week": "<u1",
+    "home": "<u1",
+    "away": "<u1",
+    "home_score": "<i2",
+    "away_score": "<i2",
+    "status": "<u1",
+    "kickoff": "<i8",
+}
+
+
+class SeasonStoreError(ValueError):
+    """Raised for files that are not valid season stores."""
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _encode_strings(strings: Sequence[str]) -> bytes:
+    blobs = [value.encode("utf-8") for value in strings]
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    return struct.pack(f"<I{len(offsets)}I", len(blobs), *offsets) + b"".join(blobs)
+
+
+def write_season_store(
+    path: Path | str,
+    columns: Mapping[str, Union[np.ndarray, Sequence[int]]],
+    teams: Sequence[str],
+) -> int:
+    """Write ``columns`` (one sequence per entry of :data:`COLUMNS`) atomically.
+
+    Rows are reordered by ``(season, week)`` with a stable sort. Returns the
+    number of rows written.
+    """
+
+    missing = set(COLUMNS) - set(columns)
+    if missing:
+        raise SeasonStoreError(f"missing columns: {sorted(missing)}")
+    arrays = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in COLUMNS.items()}
+    rows = len(arrays["season"])
+    if any(len(array) != rows for array in arrays.values()):
+        raise SeasonStoreError("columns have different lengths")
+    order = np.lexsort((arrays["week"], arrays["season"]))
+    arrays = {name: array[order] for name, array in arrays.items()}
+
+    offset = _align(HEADER.size + COLUMN_ENTRY.size * len(COLUMNS))
+    directory = []
+    for name, array in arrays.items():
+        directory.append((name, array, offset))
+        offset = _align(offset + array.nbytes)
+    strings = _encode_strings(teams)
+
+    with atomic_open(path) as out:
+        out.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(directory), rows, offset, len(strings)))
+        for name, array, column_offset in directory:
+            out.write(COLUMN_ENTRY.pack(name.encode("ascii"), array.dtype.str.encode("ascii"), column_offset))
+        for _, array, column_offset in directory:
+            out.write(b"\0" * (column_offset - out.tell()))
+            out.write(array.tobytes())
+        out.write(b"\0" * (offset - out.tell()))
+        out.write(strings)
+    return rows
+
+
+class SeasonStore:
+    """Read-only, memory-mapped view of a season store file."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size < HEADER.size:
+                # mmap cannot map an empty file and would fail with ValueError.
+                raise SeasonStoreError(f"{self.path} is too short to be a season store")
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_layout(size)
+        except SeasonStoreError:
+            self.columns = {}
+            self._mmap.close()
+            raise
+        self._teams: Optional[List[str]] = None
+
+    def _read_layout(self, size: int) -> None:
+        """Parse the header and column directory, checking every range against ``size``."""
+
+        magic, version, column_count, rows, strings_offset, strings_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise SeasonStoreError(f"{self.path} is not a version {FORMAT_VERSION} season store")
+        if HEADER.size + column_count * COLUMN_ENTRY.size > size or strings_offset + strings_length > size:
+            raise SeasonStoreError(f"{self.path} is truncated")
+        self.rows = rows
+        self.columns: Dict[str, np.ndarray] = {}
+        for position in range(column_count):
+            raw_name, raw_dtype, offset = COLUMN_ENTRY.unpack_from(self._mmap, HEADER.size + position * COLUMN_ENTRY.size)
+            name = raw_name.rstrip(b"\0").decode("ascii", "replace")
+            try:
+                dtype = np.dtype(raw_dtype.rstrip(b"\0").decode("ascii"))
+            except (TypeError, UnicodeDecodeError) as exc:
+                raise SeasonStoreError(f"{self.path}: column {name!r} has an invalid dtype") from exc
+            if offset + rows * dtype.itemsize > size:
+                raise SeasonStoreError(f"{self.path} is truncated in column {name!r}")
+            self.columns[name] = np.frombuffer(self._mmap, dtype=dtype, count=rows, offset=offset)
+        self._strings_offset = strings_offset
+        self._strings_length = strings_length
+
+    def __enter__(self) -> "SeasonStore":
+        return self
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        try:
+            self.close()
+        except BufferError:
+            # Views held by the failing code's frames must not mask its error.
+            if exc_type is None:
+                raise
+
+    def close(self) -> None:
+        """Unmap the file.
+
+        Raises :class:`BufferError` while arrays taken from :meth:`__getitem__`
+        or :meth:`season` are still alive; copy what must outlive the store.
+        """
+
+        self.columns = {}
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @property
+    def teams(self) -> List[str]:
+        """Team names indexed by the ``home``/``away`` columns (decoded lazily)."""
+
+        if self._teams is None:
+            base = self._strings_offset
+            (count,) = struct.unpack_from("<I", self._mmap, base)
+            offsets = struct.unpack_from(f"<{count + 1}I", self._mmap, base + 4)
+            blob_start = base + 4 + 4 * (count + 1)
+            blob = self._mmap[blob_start:blob_start + offsets[-1]]
+            self._teams = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(count)]
+        return self._teams
+
+    def seasons(self) -> List[int]:
+        return [int(value) for value in np.unique(self.columns["season"])]
+
+    def season_slice(self, season: int) -> slice:
+        """Row range of ``season``; slicing a column with it is zero-copy."""
+
+        seasons = self.columns["season"]
+        start = int(np.searchsorted(seasons, season, side="left"))
+        stop = int(np.searchsorted(seasons, season, side="right"))
+        return slice(start, stop)
+
+    def season(self, season: int) -> Dict[str, np.ndarray]:
+        rows = self.season_slice(season)
+        return {name: column[rows] for name, column in self.columns.items()}
+
+
+class SeasonStoreBuilder:
+    """Accumulate games row by row, then write them as a season store."""
+
+    def __init__(self, teams: Sequence[str]) -> None:
+        self.teams = list(teams)
+        self._index = {team: position for position, team in enumerate(self.teams)}
+        self._columns: Dict[str, List[int]] = {name: [] for name in COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self._columns["season"])
+
+    def add(
+        self,
+        season: int,
+        week: int,
+        home: str,
+        away: str,
+        home_score: Optional[int],
+        away_score: Optional[int],
+        final: bool,
+        kickoff: int,
+    ) -> None:
+        columns = self._columns
+        columns["season"].append(season)
+        columns["week"].append(week)
+        columns["home"].append(self._index[home])
+        columns["away"].append(self._index[away])
+        columns["home_score"].append(NO_SCORE if home_score is None else home_score)
+        columns["away_score"].append(NO_SCORE if away_score is None else away_score)
+        columns["status"].append(STATUS_FINAL if final else STATUS_SCHEDULED)
+        columns["kickoff"].append(kickoff)
+
+    def write(self, path: Path | str) -> int:
+        return write_season_store(path, self._columns, self.teams)
+
+
+def merge_season_stores(paths: Iterable[Path | str], destination: Path | str) -> int:
+    """Combine several stores into one, remapping team indices by name."""
+
+    teams: List[str] = []
+    index: Dict[str, int] = {}
+    merged: Dict[str, List[np.ndarray]] = {name: [] for name in COLUMNS}
+    for path in paths:
+        with SeasonStore(path) as store:
+            remap = np.empty(max(len(store.teams), 1), dtype=np.uint8)
+            for position, team in enumerate(store.teams):
+                if team not in index:
+                    index[team] = len(teams)
+                    teams.append(team)
+                remap[position] = index[team]
+            for name in COLUMNS:
+                # Copy out of the mapping so the store can be closed.
+                if name in ("home", "away"):
+                    merged[name].append(remap[store[name]])
+                else:
+                    merged[name].append(np.array(store[name]))
+    columns = {
+        name: np.concatenate(parts) if parts else np.empty(0, dtype=COLUMNS[name])
+        for name, parts in merged.items()
+    }
+    return write_season_store(destination, columns, teams)
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""Resident pick'em service with warm in-memory state.
+
+Builds (or loads) a :class:`pickem_snapshot.ProfileSnapshot` once, keeps it in
+memory, refreshes it from the scoreboard in the background and answers JSON
+queries over a small HTTP/1.1 server on TCP or a Unix socket. Every response
+body is encoded when the snapshot changes, so a query is a dictionary lookup
+and a socket write; keep-alive connections avoid reconnect costs.
+
+Endpoints:
+    GET  /health              status, snapshot age and refresh counters
+    GET  /metrics             stage timings, fetch counters and latency
+                              histograms in the Prometheus text format
+    GET  /weeks               weeks that have matchups
+    GET  /matchups?week=N     matchups for week N (same fields as the agent)
+    POST /refresh             run a delta refresh now and return its summary
+
+Usage:
+    python scripts/pickem_service.py --port 8787
+    python scripts/pickem_service.py --unix /tmp/pickem.sock --refresh-interval 120
+    python scripts/pickem_service.py --base-url http://127.0.0.1:8765 --no-cache
+
+All transport and cache options of ``pickem_agent.py`` are accepted, so the
+service can run against recorded fixtures or a local stub of ESPN.
+
+Dependencies:
+    - requests
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from pickem_agent import build_arg_parser, build_engine
+from pickem_cache import ResponseCache
+from pickem_http import FetchEngine
+from pickem_metrics import METRICS
+from pickem_snapshot import (
+    ProfileSnapshot,
+    RefreshSummary,
+    default_state_path,
+    load_snapshot,
+    refresh_snapshot,
+)
+
+DEFAULT_PORT = 8787
+DEFAULT_REFRESH_INTERVAL = 300.0
+MAX_HEADER_BYTES = 16 * 1024
+JSON_CONTENT_TYPE = "application/json"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 503: "Service Unavailable"}
+
+
+def _json_bytes(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _response(status: int, body: bytes, keep_alive: bool, content_type: str = JSON_CONTENT_TYPE) -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("ascii") + body
+
+
+class PickemService:
+    """Warm snapshot plus the pre-encoded responses served from it."""
+
+    def __init__(
+        self,
+        engine: FetchEngine,
+        cache: Optional[ResponseCache] = None,
+        state_path: Optional[Path] = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        full: bool = False,
+    ) -> None:
+        self.engine = engine
+        self.cache = cache
+        self.state_path = state_path
+        self.refresh_interval = refresh_interval
+        self.full = full
+        self.snapshot: Optional[ProfileSnapshot] = None
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.last_summary: Optional[RefreshSummary] = None
+        self.refreshed_at = 0.0
+        # Replaced wholesale after each refresh; request handlers only read it.
+        self._bodies: Dict[int, bytes] = {}
+        self._weeks_body = _json_bytes({"weeks": []})
+        self._refresh_lock = asyncio.Lock()
+
+    def _load(self) -> ProfileSnapshot:
+        snapshot = None
+        if self.state_path is not None and not self.full:
+            snapshot = load_snapshot(self.state_path)
+        if snapshot is None:
+            snapshot = ProfileSnapshot.build(self.engine)
+        else:
+            try:
+                self.last_summary = refresh_snapshot(snapshot, self.engine)
+            except Exception as exc:  # serve the stored state rather than nothing
+                self.refresh_errors += 1
+                print(f"warning: startup refresh failed, serving {self.state_path}: {exc}", file=sys.stderr)
+        self._persist(snapshot)
+        return snapshot
+
+    def _refresh(self) -> RefreshSummary:
+        assert self.snapshot is not None
+        # The engine lives as long as the service; keep only this cycle's failures.
+        self.engine.reset_failures()
+        summary = refresh_snapshot(self.snapshot, self.engine)
+        if summary.changed_events:
+            self._persist(self.snapshot)
+        return summary
+
+    def _persist(self, snapshot: ProfileSnapshot) -> None:
+        if self.cache is not None:
+            self.cache.flush()
+        if self.state_path is not None:
+            snapshot.save(self.state_path)
+
+    def _encode(self, snapshot: ProfileSnapshot) -> Tuple[Dict[int, bytes], bytes]:
+        weeks = snapshot.weeks()
+        bodies = {week: _json_bytes({"week": week, "matchups": snapshot.week_matchups(week)}) for week in weeks}
+        return bodies, _json_bytes({"weeks": weeks})
+
+    async def start(self) -> None:
+        """Build or load the snapshot off the event loop."""
+
+        def load() -> Tuple[ProfileSnapshot, Dict[int, bytes], bytes]:
+            snapshot = self._load()
+            return (snapshot, *self._encode(snapshot))
+
+        self.snapshot, self._bodies, self._weeks_body = await asyncio.to_thread(load)
+        self.refreshed_at = time.time()
+
+    async def refresh(self) -> RefreshSummary:
+        """Run one delta refresh in a worker thread and publish the result.
+
+        Handlers keep serving the previous bodies until the new ones are
+        swapped in, so a refresh never blocks or tears a query.
+        """
+
+        async with self._refresh_lock:
+            def work() -> Tuple[RefreshSummary, Optional[Tuple[Dict[int, bytes], bytes]]]:
+                with METRICS.span("refresh"):
+                    summary = self._refresh()
+                assert self.snapshot is not None
+                if not summary.rescored_matchups:
+                    return summary, None
+                with METRICS.span("encode"):
+                    return summary, self._encode(self.snapshot)
+
+            summary, encoded = await asyncio.to_thread(work)
+            if encoded is not None:
+                self._bodies, self._weeks_body = encoded
+            self.refreshes += 1
+            self.refreshed_at = time.time()
+            self.last_summary = summary
+            return summary
+
+    async def refresh_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as exc:  # keep serving the last good state
+                self.refresh_errors += 1
+                print(f"warning: background refresh failed: {exc}", file=sys.stderr)
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok" if self.snapshot is not None else "starting",
+            "teams": len(self.snapshot.profiles) if self.snapshot is not None else 0,
+            "refreshedAt": self.refreshed_at,
+            "refreshes": self.refreshes,
+            "refreshErrors": self.refresh_errors,
+            "lastRefresh": vars(self.last_summary) if self.last_summary is not None else None,
+        }
+
+    async def route(self, method: str, target: str) -> Tuple[int, bytes]:
+        url = urlsplit(target)
+        if url.path == "/matchups":
+            if method != "GET":
+                return 405, _json_bytes({"error": "use GET"})
+            values = parse_qs(url.query).get("week", [])
+            try:
+                week = int(values[0])
+            except (IndexError, ValueError):
+                return 400, _json_bytes({"error": "week must be an integer"})
+            body = self._bodies.get(week)
+            return 200, body if body is not None else _json_bytes({"week": week, "matchups": []})
+        if url.path == "/weeks":
+            return 200, self._weeks_body
+        if url.path == "/health":
+            return 200, _json_bytes(self.health())
+        if url.path == "/metrics":
+            return 200, METRICS.prometheus_text().encode("utf-8")
+        if url.path == "/refresh":
+            if method != "POST":
+                return 405, _json_bytes({"error": "use POST"})
+            try:
+                summary = await self.refresh()
+            except Exception as exc:
+                self.refresh_errors += 1
+                return 503, _json_bytes({"error": str(exc)})
+            return 200, _json_bytes(vars(summary))
+        return 404, _json_bytes({"error": f"unknown path {url.path}"})
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one connection until it closes."""
+
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    writer.write(_response(400, _json_bytes({"error": "headers too large"}), False))
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    writer.write(_response(400, _json_bytes({"error": "malformed request line"}), False))
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    writer.write(_response(400, _json_bytes({"error": "invalid Content-Length"}), False))
+                    return
+                if length:
+                    await reader.readexactly(length)
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+                status, body = await self.route(method.upper(), target)
+                content_type = PROMETHEUS_CONTENT_TYPE if target.startswith("/metrics") else JSON_CONTENT_TYPE
+                writer.write(_response(status, body, keep_alive, content_type))
+                await writer.drain()
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+
+async def serve(args: Any) -> None:
+    engine, cache = build_engine(args)
+    service = PickemService(
+        engine,
+        cache,
+        state_path=None if args.no_state else Path(args.state),
+        refresh_interval=args.refresh_interval,
+        full=args.full,
+    )
+    await service.start()
+
+    if args.unix:
+        Path(args.unix).unlink(missing_ok=True)
+        server = await asyncio.start_unix_server(service.handle, path=args.unix, limit=MAX_HEADER_BYTES)
+        where = args.unix
+    else:
+        server = await asyncio.start_server(service.handle, args.host, args.port, limit=MAX_HEADER_BYTES)
+        where = ", ".join(f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+    print(f"Serving {len(service.snapshot.profiles) if service.snapshot else 0} teams on {where}", file=sys.stderr)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    background = asyncio.create_task(service.refresh_forever()) if args.refresh_interval > 0 else None
+    async with server:
+        await stop.wait()
+    if background is not None:
+        background.cancel()
+    if args.unix:
+        Path(args.unix).unlink(missing_ok=True)
+    if cache is not None:
+        cache.flush()
+        if args.export_snapshot:
+            cache.export_fixtures(args.export_snapshot)
+
+
+def main() -> None:
+    parser = build_arg_parser("Serve pick'em matchups from warm in-memory state", with_week=False)
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port to listen on")
+    parser.add_argument("--unix", default=None, help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument(
+        "--refresh-interval",
+        type=float,
+        default=DEFAULT_REFRESH_INTERVAL,
+        help="Seconds between background delta refreshes (0 disables them)",
+    )
+    parser.add_argument(
+        "--state",
+        default=str(default_state_path()),
+        help="Snapshot file to start from and keep up to date",
+    )
+    parser.add_argument("--no-state", action="store_true", help="Keep the snapshot in memory only")
+    parser.add_argument("--full", action="store_true", help="Rebuild every team on startup")
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""Monte Carlo simulation of the rest of the season and of pick'em pools.
+
+Game win probabilities come from the same adjusted rating difference
+``evaluate_matchup`` picks from (rating gap minus spread / ``SPREAD_SCALE``),
+mapped through a logistic curve. The remaining schedule is then played out
+many times with batched NumPy draws to estimate each team's final record,
+division title and playoff odds (four division winners plus three wild cards
+per conference, ties broken at random) and the score distribution of every
+pool entrant, optionally split across worker processes.
+
+Entries are a JSON object mapping entrant name to picks keyed by event id,
+either a team id or ``{"team": id, "points": n}`` for confidence pools. When
+no entries file is given the agent's own picks are scored.
+
+Usage:
+    python scripts/pickem_sim.py --from-week 9 --sims 1000000
+    python scripts/pickem_sim.py --from-week 9 --entries pool.json --workers 8 --json
+
+All transport and cache options of ``pickem_agent.py`` are accepted.
+
+Dependencies:
+    - numpy
+    - requests
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pickem_agent import NFLPickemError, STAT_ALIASES, ScheduleEvent, build_arg_parser, build_engine, lookup_stat
+from pickem_batch import TeamBatch, batch_ratings, evaluate_games, spread_values
+from pickem_snapshot import ProfileSnapshot, default_state_path, load_snapshot, refresh_snapshot
+
+# Logistic slope: a rating edge of 0.3 ("High" confidence) is roughly a 77%
+# favourite, 0.15 ("Medium") roughly 65%.
+PROBABILITY_SCALE = 4.0
+DEFAULT_SIMS = 100_000
+CHUNK_SIZE = 50_000
+PLAYOFF_SPOTS = 7
+
+# ESPN team id -> (conference, division).
+DIVISIONS: Dict[str, Tuple[str, str]] = {
+    **{team_id: ("AFC", "East") for team_id in ("2", "15", "17", "20")},
+    **{team_id: ("AFC", "North") for team_id in ("33", "4", "5", "23")},
+    **{team_id: ("AFC", "South") for team_id in ("34", "11", "30", "10")},
+    **{team_id: ("AFC", "West") for team_id in ("7", "12", "13", "24")},
+    **{team_id: ("NFC", "East") for team_id in ("6", "19", "21", "28")},
+    **{team_id: ("NFC", "North") for team_id in ("3", "8", "9", "16")},
+    **{team_id: ("NFC", "South") for team_id in ("1", "29", "18", "27")},
+    **{team_id: ("NFC", "West") for team_id in ("22", "14", "25", "26")},
+}
+
+
+def win_probabilities(
+    ratings: np.ndarray,
+    home_idx: np.ndarray,
+    away_idx: np.ndarray,
+    spreads: Optional[np.ndarray] = None,
+    scale: float = PROBABILITY_SCALE,
+) -> np.ndarray:
+    """Home win probability per game from the agent's adjusted rating edge."""
+
+    adjusted = evaluate_games(ratings, home_idx, away_idx, spreads).adjusted_diff
+    return 1.0 / (1.0 + np.exp(-scale * adjusted))
+
+
+@dataclass
+class SeasonModel:
+    """Everything a simulation worker needs, as plain arrays."""
+
+    team_ids: List[str]
+    event_ids: List[str]
+    base_wins: np.ndarray
+    base_games: np.ndarray
+    home_idx: np.ndarray
+    away_idx: np.ndarray
+    p_home: np.ndarray
+    divisions: np.ndarray
+    conferences: np.ndarray
+    pick_home: np.ndarray
+    pick_away: np.ndarray
+
+    @property
+    def games(self) -> int:
+        return len(self.p_home)
+
+
+@dataclass
+class SimulationTotals:
+    """Counters accumulated over simulated seasons; shards add up."""
+
+    sims: int
+    wins: np.ndarray
+    division_titles: np.ndarray
+    playoffs: np.ndarray
+    top_seeds: np.ndarray
+    score_counts: np.ndarray
+    pool_wins: np.ndarray
+
+    def __add__(self, other: "SimulationTotals") -> "SimulationTotals":
+        return SimulationTotals(
+            self.sims + other.sims,
+            self.wins + other.wins,
+            self.division_titles + other.division_titles,
+            self.playoffs + other.playoffs,
+            self.top_seeds + other.top_seeds,
+            self.score_counts + other.score_counts,
+            self.pool_wins + other.pool_wins,
+        )
+
+
+def build_model(
+    snapshot: ProfileSnapshot,
+    events: Sequence[ScheduleEvent],
+    entries: Mapping[str, Mapping[str, Any]],
+    scale: float = PROBABILITY_SCALE,
+) -> SeasonModel:
+    """Pack ratings, records, remaining games and entrant picks into arrays."""
+
+    batch = TeamBatch.from_profiles(snapshot.profiles)
+    ratings = batch_ratings(batch)
+    playable = [e for e in events if e.home_id in batch.position and e.away_id in batch.position]
+    home_idx = batch.indices(e.home_id for e in playable)
+    away_idx = batch.indices(e.away_id for e in playable)
+    p_home = win_probabilities(ratings, home_idx, away_idx, spread_values(e.point_spread for e in playable), scale)
+
+    base_wins = np.zeros(len(batch))
+    base_games = np.zeros(len(batch))
+    for row, team_id in enumerate(batch.team_ids):
+        stats = snapshot.profiles[team_id].flat_stats
+        wins = lookup_stat(stats, *STAT_ALIASES["wins"])
+        losses = lookup_stat(stats, *STAT_ALIASES["losses"])
+        ties = lookup_stat(stats, *STAT_ALIASES["ties"])
+        base_wins[row] = wins + 0.5 * ties
+        base_games[row] = wins + losses + ties
+
+    division_names = sorted({DIVISIONS.get(team_id, ("", "")) for team_id in batch.team_ids})
+    divisions = np.array([division_names.index(DIVISIONS.get(team_id, ("", ""))) for team_id in batch.team_ids])
+    conference_names = sorted({conference for conference, _ in division_names})
+    conferences = np.array([conference_names.index(DIVISIONS.get(team_id, ("", ""))[0]) for team_id in batch.team_ids])
+
+    # Points an entrant earns when the home (away) team wins each game.
+    pick_home = np.zeros((len(entries), len(playable)), dtype=np.float32)
+    pick_away = np.zeros((len(entries), len(playable)), dtype=np.float32)
+    column = {event.event_id: position for position, event in enumerate(playable)}
+    for row, picks in enumerate(entries.values()):
+        for event_id, pick in picks.items():
+            position = column.get(str(event_id))
+            if position is None:
+                continue
+            team, points = (pick.get("team"), pick.get("points", 1)) if isinstance(pick, dict) else (pick, 1)
+            event = playable[position]
+            if str(team) == event.home_id:
+                pick_home[row, position] = points
+            elif str(team) == event.away_id:
+                pick_away[row, position] = points
+
+    return SeasonModel(
+        team_ids=list(batch.team_ids),
+        event_ids=[event.event_id for event in playable],
+        base_wins=base_wins,
+        base_games=base_games,
+        home_idx=home_idx,
+        away_idx=away_idx,
+        p_home=p_home,
+        divisions=divisions,
+        conferences=conferences,
+        pick_home=pick_home,
+        pick_away=pick_away,
+    )
+
+
+def simulate(model: SeasonModel, sims: int, seed: Any = None, chunk_size: int = CHUNK_SIZE) -> SimulationTotals:
+    """Play the remaining games ``sims`` times and accumulate the outcomes."""
+
+    rng = np.random.default_rng(seed)
+    teams = len(model.team_ids)
+    entrants = len(model.pick_home)
+    max_score = int(np.maximum(model.pick_home, model.pick_away).sum(axis=1).max(initial=0))
+    totals = SimulationTotals(
+        sims=0,
+        wins=np.zeros(teams),
+        division_titles=np.zeros(teams),
+        playoffs=np.zeros(teams),
+        top_seeds=np.zeros(teams),
+        score_counts=np.zeros((entrants, max_score + 1)),
+        pool_wins=np.zeros(entrants),
+    )
+
+    # With one-hot game -> team maps, a block of home-win indicators becomes
+    # win totals in one matrix product: every away team starts with its
+    # remaining away games won and hands one back for each home win.
+    home_map = np.zeros((model.games, teams), dtype=np.float32)
+    away_map = np.zeros((model.games, teams), dtype=np.float32)
+    home_map[np.arange(model.games), model.home_idx] = 1.0
+    away_map[np.arange(model.games), model.away_idx] = 1.0
+    swing = home_map - away_map
+    start_wins = (model.base_wins + away_map.sum(axis=0)).astype(np.float32)
+    games_played = np.maximum(model.base_games + home_map.sum(axis=0) + away_map.sum(axis=0), 1.0).astype(np.float32)
+    # Same trick for entrant scores.
+    pick_swing = (model.pick_home - model.pick_away).T
+    start_scores = model.pick_away.sum(axis=1)
+    division_ids = np.unique(model.divisions)
+    conference_ids = np.unique(model.conferences)
+    p_home = model.p_home.astype(np.float32)
+
+    done = 0
+    while done < sims:
+        size = min(chunk_size, sims - done)
+        home_won = (rng.random((size, model.games), dtype=np.float32) < p_home).astype(np.float32)
+        wins = start_wins + home_won @ swing
+        totals.wins += wins.sum(axis=0)
+
+        # Random jitter far below one game breaks ties.
+        pct = wins / games_played + rng.random((size, teams), dtype=np.float32) * 1e-5
+        seeded = np.zeros((size, teams), dtype=bool)
+        for division in division_ids:
+            members = np.flatnonzero(model.divisions == division)
+            winner = members[np.argmax(pct[:, members], axis=1)]
+            seeded[np.arange(size), winner] = True
+        totals.division_titles += seeded.sum(axis=0)
+
+        playoffs = seeded.copy()
+        for conference in conference_ids:
+            members = np.flatnonzero(model.conferences == conference)
+            leaders = np.where(seeded[:, members], pct[:, members], -np.inf)
+            top = members[np.argmax(leaders, axis=1)]
+            totals.top_seeds += np.bincount(top, minlength=teams)
+            wildcard_slots = PLAYOFF_SPOTS - len(np.unique(model.divisions[members]))
+            if wildcard_slots > 0:
+                others = np.where(seeded[:, members], -np.inf, pct[:, members])
+                picks = np.argpartition(-others, wildcard_slots - 1, axis=1)[:, :wildcard_slots]
+                playoffs[np.arange(size)[:, None], members[picks]] = True
+        totals.playoffs += playoffs.sum(axis=0)
+
+        if entrants:
+            scores = start_scores + home_won @ pick_swing
+            rounded = np.rint(scores).astype(np.int64)
+            for row in range(entrants):
+                totals.score_counts[row] += np.bincount(rounded[:, row], minlength=max_score + 1)
+            best = scores.max(axis=1, keepdims=True)
+            leaders = scores == best
+            totals.pool_wins += (leaders / leaders.sum(axis=1, keepdims=True)).sum(axis=0)
+
+        done += size
+        totals.sims += size
+    return totals
+
+
+def _simulate_shard(job: Tuple[SeasonModel, int, np.random.SeedSequence]) -> SimulationTotals:
+    model, sims, seed = job
+    return simulate(model, sims, seed)
+
+
+def run_simulation(model: SeasonModel, sims: int, workers: int = 1, seed: Optional[int] = None) -> SimulationTotals:
+    """Split ``sims`` across ``workers`` processes with independent streams."""
+
+    if workers <= 1 or sims < 2 * CHUNK_SIZE:
+        return simulate(model, sims, seed)
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    shares = [sims // workers + (1 if i < sims % workers else 0) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_simulate_shard, [(model, n, s) for n, s in zip(shares, seeds) if n]))
+    total = results[0]
+    for result in results[1:]:
+        total = total + result
+    return total
+
+
+def remaining_events(snapshot: ProfileSnapshot, from_week: int, to_week: int) -> List[ScheduleEvent]:
+    """Games in ``from_week..to_week`` that are not final yet.
+
+    Final games already count through the season stats ``build_model`` starts
+    every record from, so simulating them again would count them twice.
+    """
+
+    return [
+        event
+        for event in snapshot.events.values()
+        if event.week is not None and from_week <= event.week <= to_week and not event.completed
+    ]
+
+
+def agent_entries(snapshot: ProfileSnapshot, events: Sequence[ScheduleEvent]) -> Dict[str, Dict[str, str]]:
+    """The agent's own picks as a single pool entry."""
+
+    picks: Dict[str, str] = {}
+    for event in events:
+        matchup = snapshot.matchups.get(event.event_id)
+        if matchup is None:
+            continue
+        home_name = snapshot.profiles[event.home_id].name
+        picks[event.event_id] = event.home_id if matchup["recommended_pick"] == home_name else event.away_id
+    return {"agent": picks}
+
+
+def summarize(
+    model: SeasonModel,
+    totals: SimulationTotals,
+    entries: Sequence[str],
+    snapshot: ProfileSnapshot,
+) -> Dict[str, Any]:
+    """Turn the accumulated counters into per-team, per-entrant and per-game rates."""
+
+    sims = max(totals.sims, 1)
+    teams = []
+    for row, team_id in enumerate(model.team_ids):
+        teams.append({
+            "team_id": team_id,
+            "name": snapshot.profiles[team_id].name,
+            "expected_wins": round(totals.wins[row] / sims, 2),
+            "division_title": round(totals.division_titles[row] / sims, 4),
+            "playoffs": round(totals.playoffs[row] / sims, 4),
+            "top_seed": round(totals.top_seeds[row] / sims, 4),
+        })
+    teams.sort(key=lambda item: -item["expected_wins"])
+
+    pool = []
+    for row, name in enumerate(entries):
+        counts = totals.score_counts[row]
+        points = np.arange(len(counts))
+        mean = float((counts * points).sum() / sims)
+        cumulative = np.cumsum(counts) / sims
+        pool.append({
+            "entrant": name,
+            "mean_score": round(mean, 3),
+            "std_score": round(float(np.sqrt(max((counts * points**2).sum() / sims - mean**2, 0.0))), 3),
+            "p10": int(np.searchsorted(cumulative, 0.1)),
+            "p50": int(np.searchsorted(cumulative, 0.5)),
+            "p90": int(np.searchsorted(cumulative, 0.9)),
+            "win_pool": round(float(totals.pool_wins[row] / sims), 4),
+        })
+
+    games = [
+        {
+            "event_id": event_id,
+            "week": snapshot.events[event_id].week,
+            "home_team": snapshot.profiles[model.team_ids[h]].name,
+            "away_team": snapshot.profiles[model.team_ids[a]].name,
+            "home_win_probability": round(float(p), 4),
+        }
+        for event_id, h, a, p in zip(model.event_ids, model.home_idx, model.away_idx, model.p_home)
+    ]
+    return {"sims": totals.sims, "teams": teams, "pool": pool, "games": games}
+
+
+def main() -> None:
+    parser = build_arg_parser("Simulate the rest of the season and pick'em pool outcomes", with_week=False)
+    parser.add_argument("--from-week", type=int, required=True, help="First week to simulate; games already final are skipped")
+    parser.add_argument("--to-week", type=int, default=18, help="Last week to simulate")
+    parser.add_argument("--sims", type=int, default=DEFAULT_SIMS, help="Number of simulated seasons")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes used for the simulation")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible runs")
+    parser.add_argument("--scale", type=float, default=PROBABILITY_SCALE, help="Logistic slope mapping rating edge to win probability")
+    parser.add_argument("--entries", default=None, help="JSON file of pool entries (default: the agent's own picks)")
+    parser.add_argument("--state", default=str(default_state_path()), help="Profile snapshot to simulate from (built if missing)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    engine, cache = build_engine(args)
+    try:
+        snapshot = load_snapshot(args.state)
+        if snapshot is None:
+            snapshot = ProfileSnapshot.build(engine)
+            snapshot.save(args.state)
+        elif refresh_snapshot(snapshot, engine).changed_events:
+            snapshot.save(args.state)
+    finally:
+        if cache is not None:
+            cache.flush()
+
+    events = remaining_events(snapshot, args.from_week, args.to_week)
+    if not events:
+        raise NFLPickemError(f"No scheduled games between weeks {args.from_week} and {args.to_week}")
+    if args.entries:
+        with open(args.entries) as handle:
+            entries = json.load(handle)
+    else:
+        entries = agent_entries(snapshot, events)
+
+    model = build_model(snapshot, events, entries, args.scale)
+    started = time.perf_counter()
+    totals = run_simulation(model, args.sims, args.workers, args.seed)
+    elapsed = time.perf_counter() - started
+    report = summarize(model, totals, list(entries), snapshot)
+    report["seconds"] = round(elapsed, 3)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{totals.sims:,} simulated seasons of {model.games} games in {elapsed:.2f}s\n")
+    print(f"{'Team':<28}{'Exp W':>7}{'Div':>8}{'Playoff':>9}{'#1 seed':>9}")
+    for team in report["teams"]:
+        print(
+            f"{team['name']:<28}{team['expected_wins']:>7.1f}{team['division_title']:>8.1%}"
+            f"{team['playoffs']:>9.1%}{team['top_seed']:>9.1%}"
+        )
+    if report["pool"]:
+        print(f"\n{'Entrant':<20}{'Mean':>7}{'Std':>7}{'P10':>5}{'P50':>5}{'P90':>5}{'Win pool':>10}")
+        for entry in report["pool"]:
+            print(
+                f"{entry['entrant']:<20}{entry['mean_score']:>7.2f}{entry['std_score']:>7.2f}"
+                f"{entry['p10']:>5}{entry['p50']:>5}{entry['p90']:>5}{entry['win_pool']:>10.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""Persisted team profiles with scoreboard-driven delta refresh.
+
+A full run of the pick'em agent fetches three resources for every team. On
+game days only the teams in live or just-finished games have new data, so this
+script keeps the scored profiles, the evaluated matchups and a fingerprint of
+every scoreboard game in a snapshot file. Each rerun pulls the league-wide
+scoreboard once, compares fingerprints, re-fetches and rescores only the teams
+whose games changed and re-evaluates only the matchups those teams play in.
+Without a snapshot (or with ``--full``) every team is built from scratch.
+
+Usage:
+    python scripts/pickem_snapshot.py --week 8
+    python scripts/pickem_snapshot.py --week 8 --state path/to/profiles.json --full
+    python scripts/pickem_snapshot.py --week all --fixtures path/to/recorded/payloads
+
+All transport and cache options of ``pickem_agent.py`` are accepted.
+
+Dependencies:
+    - requests
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from pickem_agent import (
+    SCOREBOARD_URL,
+    SNAPSHOT_VERSION,
+    EventIndex,
+    NFLPickemError,
+    ScheduleEvent,
+    StatSchema,
+    TeamProfile,
+    build_arg_parser,
+    build_engine,
+    build_team_profiles,
+    compact_event,
+    evaluate_matchup,
+    parse_point_spread,
+    render_matchups,
+    score_team,
+    team_resource_urls,
+)
+from pickem_cache import REVALIDATE_HEADERS, default_cache_dir
+from pickem_files import atomic_open
+from pickem_http import FetchEngine, FetchError
+
+
+def default_state_path() -> Path:
+    return default_cache_dir().parent / "profiles.json"
+
+
+def event_fingerprint(event: Dict[str, Any]) -> str:
+    """Digest the parts of a scoreboard event that feed a team's profile."""
+
+    competitions = event.get("competitions") or [{}]
+    competition = competitions[0]
+    status = event.get("status", {}).get("type", {})
+    parts: List[Any] = [status.get("state"), status.get("completed"), parse_point_spread(competition)]
+    for competitor in competition.get("competitors", []):
+        parts.append([competitor.get("homeAway"), competitor.get("team", {}).get("id"), competitor.get("score")])
+    encoded = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+def scoreboard_games(scoreboard: Dict[str, Any]) -> List[Tuple[ScheduleEvent, str]]:
+    """Return every scoreboard game with its fingerprint."""
+
+    games: List[Tuple[ScheduleEvent, str]] = []
+    for raw_event in scoreboard.get("events", []):
+        event = compact_event(raw_event)
+        if event is not None:
+            games.append((event, event_fingerprint(raw_event)))
+    return games
+
+
+@dataclass
+class RefreshSummary:
+    """What a delta refresh touched."""
+
+    changed_events: List[str] = field(default_factory=list)
+    refreshed_teams: List[str] = field(default_factory=list)
+    failed_teams: List[str] = field(default_factory=list)
+    rescored_matchups: int = 0
+    scoreboard_failed: bool = False
+
+    def describe(self) -> str:
+        if self.scoreboard_failed:
+            return "scoreboard unavailable, kept previous ratings"
+        text = (
+            f"{len(self.changed_events)} changed game(s), {len(self.refreshed_teams)} team(s) re-fetched, "
+            f"{self.rescored_matchups} matchup(s) re-evaluated"
+        )
+        if self.failed_teams:
+            text += f", kept previous data for {', '.join(self.failed_teams)}"
+        return text
+
+
+@dataclass
+class ProfileSnapshot:
+    """Scored team profiles, their games, matchup results and game fingerprints.
+
+    ``events`` holds each game once; the profiles' ``events`` tuples reference
+    the same objects. ``matchups`` is keyed by event id.
+    """
+
+    profiles: Dict[str, TeamProfile]
+    events: Dict[str, ScheduleEvent]
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+    matchups: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    updated_at: float = 0.0
+
+    @classmethod
+    def build(cls, engine: FetchEngine) -> "ProfileSnapshot":
+        """Fetch every team and record the current scoreboard fingerprints."""
+
+        profiles = build_team_profiles(engine)
+        snapshot = cls(profiles=profiles, events=dict(EventIndex.from_profiles(profiles).by_id))
+        try:
+            scoreboard = engine.fetch_json(SCOREBOARD_URL)
+        except FetchError as exc:
+            # Without fingerprints the next refresh re-fetches every team on
+            # the scoreboard, which is still correct.
+            print(f"warning: {exc}", file=sys.stderr)
+        else:
+            for event, fingerprint in scoreboard_games(scoreboard):
+                snapshot.fingerprints[event.event_id] = fingerprint
+        snapshot.evaluate()
+        return snapshot
+
+    def evaluate(self, event_ids: Optional[Iterable[str]] = None) -> int:
+        """(Re-)evaluate the matchups of ``event_ids`` (all when omitted)."""
+
+        count = 0
+        for event_id in self.events if event_ids is None else event_ids:
+            event = self.events[event_id]
+            home = self.profiles.get(event.home_id)
+            away = self.profiles.get(event.away_id)
+            if event.week is None or home is None or away is None:
+                continue
+            self.matchups[event_id] = evaluate_matchup(event.week, home, away, event.point_spread)
+            count += 1
+        return count
+
+    def weeks(self) -> List[int]:
+        return sorted({self.events[event_id].week for event_id in self.matchups})  # type: ignore[type-var]
+
+    def week_matchups(self, week: int) -> List[Dict[str, Any]]:
+        """Return ``week``'s matchups in ``gather_week_matchups`` order."""
+
+        matchups = [
+            matchup for event_id, matchup in self.matchups.items() if self.events[event_id].week == week
+        ]
+        matchups.sort(key=lambda item: item["home_team"])
+        return matchups
+
+    def adopt(self, profile: TeamProfile) -> None:
+        """Replace a team's profile, patching shared games in place."""
+
+        events: List[ScheduleEvent] = []
+        for event in profile.events:
+            current = self.events.get(event.event_id)
+            if current is None:
+                self.events[event.event_id] = current = event
+            elif current is not event:
+                for name in ScheduleEvent.__slots__:
+                    setattr(current, name, getattr(event, name))
+            events.append(current)
+        profile.events = tuple(events)
+        self.profiles[profile.team_id] = profile
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": SNAPSHOT_VERSION,
+            "updatedAt": self.updated_at,
+            "events": {
+                event_id: [e.season, e.season_type, e.week, e.home_id, e.away_id, e.point_spread, e.completed]
+                for event_id, e in self.events.items()
+            },
+            "teams": {
+                team_id: {
+                    "name": profile.name,
+                    "flatStats": profile.flat_stats,
+                    "events": [event.event_id for event in profile.events],
+                    "recentForm": profile.recent_form,
+                    "coverRate": profile.cover_rate,
+                    "rating": profile.rating,
+                }
+                for team_id, profile in self.profiles.items()
+            },
+            "fingerprints": self.fingerprints,
+            "matchups": self.matchups,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProfileSnapshot":
+        events = {
+            event_id: ScheduleEvent(event_id, *fields) for event_id, fields in data["events"].items()
+        }
+        profiles = {
+            team_id: TeamProfile(
+                team_id=team_id,
+                name=team["name"],
+                flat_stats=team["flatStats"],
+                events=tuple(events[event_id] for event_id in team["events"]),
+                recent_form=team["recentForm"],
+                cover_rate=team["coverRate"],
+                rating=team["rating"],
+            )
+            for team_id, team in data["teams"].items()
+        }
+        return cls(
+            profiles=profiles,
+            events=events,
+            fingerprints=data.get("fingerprints", {}),
+            matchups=data.get("matchups", {}),
+            updated_at=data.get("updatedAt", 0.0),
+        )
+
+    def save(self, path: Path | str) -> None:
+        """Write the snapshot atomically."""
+
+        self.updated_at = time.time()
+        with atomic_open(path, "w") as out:
+            json.dump(self.to_dict(), out, separators=(",", ":"))
+
+
+def load_snapshot(path: Path | str) -> Optional[ProfileSnapshot]:
+    """Return the stored snapshot, or ``None`` if it is missing or unreadable."""
+
+    try:
+        data = json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return None
+    except ValueError as exc:
+        print(f"warning: ignoring unreadable snapshot {path}: {exc}", file=sys.stderr)
+        return None
+    if data.get("version") != SNAPSHOT_VERSION:
+        print(f"warning: ignoring snapshot {path} from another version", file=sys.stderr)
+        return None
+    return ProfileSnapshot.from_dict(data)
+
+
+def refresh_snapshot(snapshot: ProfileSnapshot, engine: FetchEngine) -> RefreshSummary:
+    """Re-fetch and rescore only the teams whose scoreboard games changed.
+
+    Requests bypass fresh cache entries (they are revalidated instead), since
+    a changed fingerprint means the cached documents are out of date. A team
+    whose resources cannot be fetched keeps its previous profile, and its
+    games keep their old fingerprints so the next refresh retries them. When
+    the scoreboard itself cannot be fetched the snapshot is left unchanged.
+    """
+
+    summary = RefreshSummary()
+    try:
+        scoreboard = engine.fetch_json(SCOREBOARD_URL, headers=REVALIDATE_HEADERS)
+    except FetchError as exc:
+        print(f"warning: {exc}", file=sys.stderr)
+        summary.scoreboard_failed = True
+        return summary
+    changed: Dict[str, ScheduleEvent] = {}
+    fingerprints: Dict[str, str] = {}
+    for event, fingerprint in scoreboard_games(scoreboard):
+        if snapshot.fingerprints.get(event.event_id) != fingerprint:
+            changed[event.event_id] = event
+            fingerprints[event.event_id] = fingerprint
+    summary.changed_events = list(changed)
+    if not changed:
+        return summary
+
+    teams: Set[str] = set()
+    for event in changed.values():
+        for team_id in (event.home_id, event.away_id):
+            if team_id in snapshot.profiles:
+                teams.add(team_id)
+            else:
+                print(f"warning: team {team_id} is not in the snapshot; run with --full", file=sys.stderr)
+
+    payloads = engine.fetch_many(
+        (url for team_id in sorted(teams) for url in team_resource_urls(team_id)),
+        skip_failures=True,
+        headers=REVALIDATE_HEADERS,
+    )
+    schema = StatSchema()
+    refreshed: Set[str] = set()
+    for team_id in sorted(teams):
+        urls = team_resource_urls(team_id)
+        if any(url not in payloads for url in urls):
+            for url in urls:
+                if url not in payloads:
+                    print(f"warning: {engine.failures.get(url, 'fetch failed')}", file=sys.stderr)
+            summary.failed_teams.append(team_id)
+            continue
+        stats, schedule, past_perf = (payloads.pop(url) for url in urls)
+        name = snapshot.profiles[team_id].name
+        snapshot.adopt(score_team(team_id, name, stats, schedule, past_perf, schema))
+        refreshed.add(team_id)
+    summary.refreshed_teams = sorted(refreshed)
+
+    for event_id, event in changed.items():
+        if event.home_id in refreshed and event.away_id in refreshed:
+            snapshot.fingerprints[event_id] = fingerprints[event_id]
+    affected = [
+        event_id
+        for event_id, event in snapshot.events.items()
+        if event.home_id in refreshed or event.away_id in refreshed
+    ]
+    summary.rescored_matchups = snapshot.evaluate(affected)
+    return summary
+
+
+def main() -> None:
+    parser = build_arg_parser("Refresh pick'em profiles incrementally from the scoreboard")
+    parser.add_argument(
+        "--state",
+        default=str(default_state_path()),
+        help="Snapshot file holding profiles, matchups and scoreboard fingerprints",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rebuild every team instead of refreshing the existing snapshot",
+    )
+    args = parser.parse_args()
+    engine, cache = build_engine(args)
+
+    try:
+        snapshot = None if args.full else load_snapshot(args.state)
+        if snapshot is None:
+            snapshot = ProfileSnapshot.build(engine)
+            print(f"Built {len(snapshot.profiles)} team profiles", file=sys.stderr)
+        else:
+            print(f"Refreshed snapshot: {refresh_snapshot(snapshot, engine).describe()}", file=sys.stderr)
+    finally:
+        if cache is not None:
+            cache.flush()
+        if args.fetch_report:
+            print(json.dumps(engine.report(), indent=2), file=sys.stderr)
+    snapshot.save(args.state)
+
+    weeks = snapshot.weeks() if args.week == "all" else [args.week]
+    for week in weeks:
+        render_matchups(snapshot.week_matchups(week), week)
+
+    if args.export_snapshot:
+        if cache is None:
+            raise NFLPickemError("--export-snapshot requires the response cache to be enabled")
+        cache.export_fixtures(args.export_snapshot)
+
+
+if __name__ == "__main__":
+    main()
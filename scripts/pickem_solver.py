@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""Pick-set and confidence-point solver for pick'em pools.
+
+Two objectives are supported for a week of games with known win
+probabilities:
+
+* Expected score. Each pick takes the more likely side and confidence points
+  are assigned by the rearrangement inequality (most points on the most likely
+  pick), which is the optimal assignment for a sum of ``points * probability``.
+* Chance of winning the pool. Opponents are modelled as independent entrants
+  who pick each game with the public pick percentage and rank their
+  confidence by how lopsided the public is. For a sample of game outcomes the
+  opponents' score distribution is computed exactly with a dynamic program
+  over points, which turns "beat ``pool_size - 1`` opponents" into a table
+  lookup per outcome (ties split the prize). A local search over side flips
+  and point swaps, started from the expected-score solution, then climbs that
+  objective. The cost depends on the number of games and samples, not on the
+  pool size.
+
+Games come from a JSON file (``[{"event_id", "home", "away", "p_home",
+"public_home"}, ...]``; ``public_home`` defaults to ``p_home``) or from the
+profile snapshot, using the simulator's win probabilities for ``--week``.
+
+Usage:
+    python scripts/pickem_solver.py --games week9.json --pool-size 5000 --confidence
+    python scripts/pickem_solver.py --week 9 --public public.json --pool-size 250
+
+Dependencies:
+    - numpy
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from pickem_agent import NFLPickemError, build_arg_parser, build_engine
+from pickem_sim import PROBABILITY_SCALE, build_model
+from pickem_snapshot import ProfileSnapshot, default_state_path, load_snapshot, refresh_snapshot
+
+DEFAULT_SAMPLES = 20_000
+
+
+@dataclass
+class Game:
+    event_id: str
+    home: str
+    away: str
+    p_home: float
+    public_home: float
+
+
+@dataclass
+class PickSet:
+    """Chosen side (``True`` = home) and points per game."""
+
+    home: np.ndarray
+    points: np.ndarray
+
+    def p_correct(self, p_home: np.ndarray) -> np.ndarray:
+        return np.where(self.home, p_home, 1.0 - p_home)
+
+    def expected_score(self, p_home: np.ndarray) -> float:
+        return float((self.points * self.p_correct(p_home)).sum())
+
+
+def point_values(games: int, confidence: bool) -> np.ndarray:
+    """``1..games`` for a confidence pool, otherwise one point per game."""
+
+    return np.arange(1, games + 1) if confidence else np.ones(games, dtype=np.int64)
+
+
+def rank_points(strength: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Give the largest of ``values`` to the largest ``strength`` (rearrangement)."""
+
+    points = np.empty_like(values)
+    points[np.argsort(strength, kind="stable")] = np.sort(values)
+    return points
+
+
+def expected_score_picks(p_home: np.ndarray, values: np.ndarray) -> PickSet:
+    """Maximize the expected score: favourites, points ranked by confidence."""
+
+    home = p_home >= 0.5
+    return PickSet(home=home, points=rank_points(np.maximum(p_home, 1.0 - p_home), values))
+
+
+def score_pmf(p_correct: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Exact score distribution(s) for independent games.
+
+    ``p_correct`` is ``(games,)`` or ``(samples, games)``; the result has a
+    trailing axis over total scores ``0..points.sum()``.
+    """
+
+    p_correct = np.atleast_2d(p_correct)
+    pmf = np.zeros((p_correct.shape[0], int(points.sum()) + 1))
+    pmf[:, 0] = 1.0
+    for game, value in enumerate(points):
+        value = int(value)
+        hit = p_correct[:, game:game + 1]
+        shifted = np.zeros_like(pmf)
+        shifted[:, value:] = pmf[:, : pmf.shape[1] - value]
+        pmf = pmf * (1.0 - hit) + shifted * hit
+    return pmf
+
+
+def pool_share_table(pmf: np.ndarray, opponents: int, max_score: int) -> np.ndarray:
+    """Expected prize share for each of our scores given opponent score pmfs.
+
+    With ``n`` i.i.d. opponents whose CDF is ``F`` and mass ``f``, scoring
+    ``s`` wins outright with probability ``F(s-1)^n`` and, splitting ties
+    evenly, earns ``(F(s)^(n+1) - F(s-1)^(n+1)) / ((n+1) f(s))`` in
+    expectation.
+    """
+
+    width = max(pmf.shape[1], max_score + 1)
+    padded = np.zeros((pmf.shape[0], width))
+    padded[:, : pmf.shape[1]] = pmf
+    at_most = np.minimum(np.cumsum(padded, axis=1), 1.0)
+    below = at_most - padded
+    n = opponents
+    with np.errstate(divide="ignore", invalid="ignore"):
+        split = (at_most ** (n + 1) - below ** (n + 1)) / ((n + 1) * padded)
+    return np.where(padded > 1e-15, split, below**n)[:, : max_score + 1]
+
+
+class PoolObjective:
+    """Monte Carlo estimate of a pick set's expected share of the pool prize."""
+
+    def __init__(
+        self,
+        p_home: np.ndarray,
+        public_home: np.ndarray,
+        values: np.ndarray,
+        pool_size: int,
+        samples: int = DEFAULT_SAMPLES,
+        seed: Optional[int] = None,
+    ) -> None:
+        rng = np.random.default_rng(seed)
+        self.home_won = rng.random((samples, len(p_home))) < p_home
+        # The field ranks its confidence by how one-sided the public is.
+        field_points = rank_points(np.maximum(public_home, 1.0 - public_home), values)
+        field_correct = np.where(self.home_won, public_home, 1.0 - public_home)
+        pmf = score_pmf(field_correct, field_points)
+        table = pool_share_table(pmf, max(pool_size - 1, 0), int(values.sum()))
+        # Flat lookups: row offset plus integer score.
+        self.table = table.astype(np.float32).ravel()
+        self.offsets = np.arange(samples, dtype=np.int32) * np.int32(table.shape[1])
+
+    def correct(self, picks: PickSet) -> np.ndarray:
+        """``(samples, games)`` indicator of each pick being right."""
+
+        return (self.home_won == picks.home).astype(np.int32)
+
+    def share(self, scores: np.ndarray) -> np.ndarray:
+        """Mean prize share for score samples shaped ``(samples, ...)``."""
+
+        offsets = self.offsets.reshape((-1,) + (1,) * (scores.ndim - 1))
+        return self.table[offsets + scores].mean(axis=0, dtype=np.float64)
+
+    def __call__(self, picks: PickSet) -> float:
+        return float(self.share(self.correct(picks) @ picks.points.astype(np.int32)))
+
+
+def pool_picks(objective: PoolObjective, start: PickSet, max_rounds: int = 100) -> PickSet:
+    """Best-improvement local search over side flips and point swaps.
+
+    All moves from the current pick set are scored at once: flipping game
+    ``g`` changes each sample's score by ``points[g] * (1 - 2 * correct[g])``
+    and swapping the points of ``g`` and ``h`` by
+    ``(points[h] - points[g]) * (correct[g] - correct[h])``.
+    """
+
+    best = PickSet(start.home.copy(), start.points.astype(np.int32))
+    games = len(best.home)
+    first, second = np.triu_indices(games, k=1)
+    for _ in range(max_rounds):
+        correct = objective.correct(best)
+        scores = correct @ best.points
+        current = float(objective.share(scores))
+        flips = objective.share(scores[:, None] + best.points * (1 - 2 * correct))
+        gap = best.points[second] - best.points[first]
+        swaps = objective.share(scores[:, None] + gap * (correct[:, first] - correct[:, second]))
+        swaps[gap == 0] = -np.inf
+        flip, swap = int(np.argmax(flips)), int(np.argmax(swaps)) if len(swaps) else -1
+        if swap >= 0 and swaps[swap] > flips[flip]:
+            if swaps[swap] <= current + 1e-12:
+                break
+            g, h = first[swap], second[swap]
+            best.points[g], best.points[h] = best.points[h], best.points[g]
+        else:
+            if flips[flip] <= current + 1e-12:
+                break
+            best.home[flip] = not best.home[flip]
+    return best
+
+
+def load_games(path: str) -> List[Game]:
+    with open(path) as handle:
+        rows = json.load(handle)
+    return [
+        Game(
+            event_id=str(row["event_id"]),
+            home=str(row["home"]),
+            away=str(row["away"]),
+            p_home=float(row["p_home"]),
+            public_home=float(row.get("public_home", row["p_home"])),
+        )
+        for row in rows
+    ]
+
+
+def snapshot_games(
+    snapshot: ProfileSnapshot,
+    week: int,
+    public: Dict[str, float],
+    scale: float = PROBABILITY_SCALE,
+) -> List[Game]:
+    """Games of ``week`` with the simulator's win probabilities."""
+
+    events = [event for event in snapshot.events.values() if event.week == week]
+    model = build_model(snapshot, events, {}, scale)
+    games = []
+    for event_id, p in zip(model.event_ids, model.p_home):
+        event = snapshot.events[event_id]
+        games.append(Game(
+            event_id=event_id,
+            home=snapshot.profiles[event.home_id].name,
+            away=snapshot.profiles[event.away_id].name,
+            p_home=float(p),
+            public_home=float(public.get(event_id, p)),
+        ))
+    return games
+
+
+def describe(games: Sequence[Game], picks: PickSet, p_home: np.ndarray) -> List[Dict[str, Any]]:
+    p_correct = picks.p_correct(p_home)
+    rows = []
+    for index in np.argsort(-picks.points, kind="stable"):
+        game = games[index]
+        rows.append({
+            "event_id": game.event_id,
+            "pick": game.home if picks.home[index] else game.away,
+            "points": int(picks.points[index]),
+            "p_correct": round(float(p_correct[index]), 4),
+            "public_share": round(game.public_home if picks.home[index] else 1.0 - game.public_home, 4),
+        })
+    return rows
+
+
+def main() -> None:
+    parser = build_arg_parser("Solve for the best pick set in a pick'em pool", with_week=False)
+    source = parser.add_argument_group("games")
+    source.add_argument("--games", default=None, help="JSON list of games with p_home and optional public_home")
+    source.add_argument("--week", type=int, default=None, help="Use this week's games from the profile snapshot")
+    parser.add_argument("--public", default=None, help="With --week: JSON object of event_id -> public home share")
+    parser.add_argument("--state", default=str(default_state_path()), help="Profile snapshot used with --week")
+    parser.add_argument("--scale", type=float, default=PROBABILITY_SCALE, help="Logistic slope mapping rating edge to win probability")
+    parser.add_argument("--pool-size", type=int, default=1, help="Entrants in the pool, including you")
+    parser.add_argument("--confidence", action="store_true", help="Confidence pool: assign 1..N points")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="Outcome samples for the pool objective")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the outcome samples")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    if args.games:
+        games = load_games(args.games)
+    elif args.week is not None:
+        public: Dict[str, float] = {}
+        if args.public:
+            with open(args.public) as handle:
+                public = {str(key): float(value) for key, value in json.load(handle).items()}
+        engine, cache = build_engine(args)
+        try:
+            snapshot = load_snapshot(args.state)
+            if snapshot is None:
+                snapshot = ProfileSnapshot.build(engine)
+                snapshot.save(args.state)
+            elif refresh_snapshot(snapshot, engine).changed_events:
+                snapshot.save(args.state)
+        finally:
+            if cache is not None:
+                cache.flush()
+        games = snapshot_games(snapshot, args.week, public, args.scale)
+    else:
+        parser.error("one of --games or --week is required")
+    if not games:
+        raise NFLPickemError("No games to solve")
+
+    p_home = np.array([game.p_home for game in games])
+    public_home = np.array([game.public_home for game in games])
+    values = point_values(len(games), args.confidence)
+    ev_picks = expected_score_picks(p_home, values)
+    result: Dict[str, Any] = {"games": len(games), "pool_size": args.pool_size}
+    result["expected_score"] = {
+        "expected_score": round(ev_picks.expected_score(p_home), 3),
+        "picks": describe(games, ev_picks, p_home),
+    }
+    if args.pool_size > 1:
+        objective = PoolObjective(p_home, public_home, values, args.pool_size, args.samples, args.seed)
+        best = pool_picks(objective, ev_picks)
+        result["expected_score"]["win_probability"] = round(objective(ev_picks), 5)
+        result["pool"] = {
+            "expected_score": round(best.expected_score(p_home), 3),
+            "win_probability": round(objective(best), 5),
+            "picks": describe(games, best, p_home),
+        }
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    for key, title in (("expected_score", "Max expected score"), ("pool", "Max chance to win the pool")):
+        if key not in result:
+            continue
+        block = result[key]
+        line = f"{title}: expected {block['expected_score']:.2f} pts"
+        if "win_probability" in block:
+            line += f", wins pool {block['win_probability']:.2%}"
+        print(line)
+        for row in block["picks"]:
+            print(
+                f"  {row['points']:>3}  {row['pick']:<28} p={row['p_correct']:.2f}  public={row['public_share']:.0%}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
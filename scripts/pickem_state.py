@@ -0,0 +1,231 @@
+"""Incremental team state for the pick'em scripts.
+
+Team records, rolling recent form, cover rate and scoring margin are updated
+one game result at a time in constant time: the rolling windows are fixed-size
+ring buffers with running totals, so nothing is rescanned. :class:`LeagueState`
+freezes an immutable snapshot of every team at each week boundary, which makes
+"state as of week N" a dictionary lookup.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+FORM_LOOKBACK = 5
+COVER_LOOKBACK = 10
+
+
+class RingCounter:
+    """Fixed-size window of 0/1 outcomes with a running total."""
+
+    __slots__ = ("_buffer", "_head", "count", "total")
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._buffer = bytearray(size)
+        self._head = 0
+        self.count = 0
+        self.total = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._buffer)
+
+    def push(self, outcome: bool) -> None:
+        value = 1 if outcome else 0
+        if self.count == len(self._buffer):
+            self.total -= self._buffer[self._head]
+        else:
+            self.count += 1
+        self._buffer[self._head] = value
+        self.total += value
+        self._head = (self._head + 1) % len(self._buffer)
+
+    def rate(self, default: float = 0.5) -> float:
+        return self.total / self.count if self.count else default
+
+
+class TeamSnapshot(NamedTuple):
+    """Immutable view of a team's state at one point in time."""
+
+    wins: int
+    losses: int
+    ties: int
+    points_for: int
+    points_against: int
+    recent_form: float
+    cover_rate: float
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.losses + self.ties
+
+    @property
+    def scoring_margin(self) -> float:
+        return (self.points_for - self.points_against) / max(self.games, 1)
+
+    def record_text(self) -> str:
+        return f"{self.wins}-{self.losses}"
+
+    def flat_stats(self) -> Dict[str, float]:
+        """Return the stats in the shape ``pickem_agent.compute_rating`` reads."""
+
+        return {
+            "wins": float(self.wins),
+            "losses": float(self.losses),
+            "ties": float(self.ties),
+            "pointsFor": float(self.points_for),
+            "pointsAgainst": float(self.points_against),
+        }
+
+
+EMPTY_SNAPSHOT = TeamSnapshot(0, 0, 0, 0, 0, 0.5, 0.5)
+
+
+class TeamState:
+    """Running state for one team, updated with :meth:`apply`."""
+
+    __slots__ = ("wins", "losses", "ties", "points_for", "points_against", "form", "covers")
+
+    def __init__(self, form_lookback: int = FORM_LOOKBACK, cover_lookback: int = COVER_LOOKBACK) -> None:
+        self.wins = 0
+        self.losses = 0
+        self.ties = 0
+        self.points_for = 0
+        self.points_against = 0
+        self.form = RingCounter(form_lookback)
+        self.covers = RingCounter(cover_lookback)
+
+    def apply(self, scored: int, allowed: int, line: Optional[float] = None) -> None:
+        """Record one final score; ``line`` is this team's spread, if known.
+
+        Ties count as a non-win for recent form, and pushes against the line
+        are left out of the cover rate.
+        """
+
+        self.points_for += scored
+        self.points_against += allowed
+        if scored > allowed:
+            self.wins += 1
+        elif scored < allowed:
+            self.losses += 1
+        else:
+            self.ties += 1
+        self.form.push(scored > allowed)
+        if line is not None and scored + line != allowed:
+            self.covers.push(scored + line > allowed)
+
+    @property
+    def recent_form(self) -> float:
+        return self.form.rate()
+
+    @property
+    def cover_rate(self) -> float:
+        return self.covers.rate()
+
+    def record_text(self) -> str:
+        return f"{self.wins}-{self.losses}"
+
+    def snapshot(self) -> TeamSnapshot:
+        return TeamSnapshot(
+            self.wins,
+            self.losses,
+            self.ties,
+            self.points_for,
+            self.points_against,
+            self.form.rate(),
+            self.covers.rate(),
+        )
+
+
+class LeagueState:
+    """Team states for one season plus frozen per-week snapshots.
+
+    Games must arrive in non-decreasing week order. The first game of a new
+    week freezes the state every team had going into it, so
+    :meth:`as_of` never reflects results from the requested week or later.
+    """
+
+    def __init__(
+        self,
+        team_ids: Iterable[str] = (),
+        form_lookback: int = FORM_LOOKBACK,
+        cover_lookback: int = COVER_LOOKBACK,
+    ) -> None:
+        self.form_lookback = form_lookback
+        self.cover_lookback = cover_lookback
+        self.teams: Dict[str, TeamState] = {}
+        self.current_week: Optional[int] = None
+        self._week_start: Dict[int, Dict[str, TeamSnapshot]] = {}
+        self._dirty: Dict[str, TeamState] = {}
+        self._latest: Dict[str, TeamSnapshot] = {}
+        for team_id in team_ids:
+            self.team(team_id)
+
+    def team(self, team_id: str) -> TeamState:
+        state = self.teams.get(team_id)
+        if state is None:
+            state = self.teams[team_id] = TeamState(self.form_lookback, self.cover_lookback)
+            self._latest[team_id] = EMPTY_SNAPSHOT
+        return state
+
+    def begin_week(self, week: int) -> None:
+        """Freeze the state going into ``week``; implied by :meth:`apply_game`."""
+
+        if self.current_week is not None and week < self.current_week:
+            raise ValueError(f"week {week} arrives after week {self.current_week}")
+        if week == self.current_week:
+            return
+        # Only teams that played since the last boundary need a new snapshot.
+        for team_id, state in self._dirty.items():
+            self._latest[team_id] = state.snapshot()
+        self._dirty.clear()
+        self._week_start[week] = dict(self._latest)
+        self.current_week = week
+
+    def apply_game(
+        self,
+        week: int,
+        home_id: str,
+        away_id: str,
+        home_score: int,
+        away_score: int,
+        home_line: Optional[float] = None,
+    ) -> None:
+        """Apply one final score. ``home_line`` is the home team's spread."""
+
+        self.begin_week(week)
+        home = self.team(home_id)
+        away = self.team(away_id)
+        home.apply(home_score, away_score, home_line)
+        away.apply(away_score, home_score, None if home_line is None else -home_line)
+        self._dirty[home_id] = home
+        self._dirty[away_id] = away
+
+    def as_of(self, week: int) -> Dict[str, TeamSnapshot]:
+        """Return every team's snapshot going into ``week``.
+
+        Teams first seen after ``week`` are absent; treat them as
+        :data:`EMPTY_SNAPSHOT`.
+        """
+
+        frozen = self._week_start.get(week)
+        if frozen is not None:
+            return frozen
+        if self.current_week is None or week > self.current_week:
+            return self.latest()
+        # No games in ``week``: the state going into it is the state going
+        # into the next week that had games.
+        return self._week_start[min(w for w in self._week_start if w > week)]
+
+    def latest(self) -> Dict[str, TeamSnapshot]:
+        """Return every team's snapshot including all applied games."""
+
+        snapshots = dict(self._latest)
+        for team_id, state in self._dirty.items():
+            snapshots[team_id] = state.snapshot()
+        return snapshots
+
+    def weeks(self) -> Tuple[int, ...]:
+        return tuple(sorted(self._week_start))
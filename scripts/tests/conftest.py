@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The scripts import their siblings by module name, as when run from scripts/.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,47 @@
+from dataclasses import astuple
+
+import numpy as np
+
+from pickem_agent import DEFAULT_WEIGHTS
+from pickem_backtest import load_scores_csv, pack_slates, point_in_time_slates, replay, score_weight_grid
+
+HEADER = "Season,Week,GameStatus,Date,AwayTeam,AwayScore,HomeTeam,HomeScore\n"
+# Week 1 sets the records; from week 2 the team with the better record is
+# picked, so the picks are easy to check by hand:
+#   week 2  Eagles (1-0) at Bills (0-1)   -> Eagles, right
+#           Jets (1-0) at Cowboys (0-1)   -> Jets, wrong
+#   week 3  Eagles (2-0) at Jets (1-1)    -> Eagles, right
+#           Bills (0-2) at Cowboys (1-1)  -> a tie, not graded
+SEASON = [
+    "2025,Week 1,FINAL,4-Sep,Cowboys,20,Eagles,24",
+    "2025,Week 1,FINAL,7-Sep,Jets,17,Bills,10",
+    "2025,Week 2,FINAL,14-Sep,Eagles,30,Bills,10",
+    "2025,Week 2,FINAL,14-Sep,Jets,14,Cowboys,21",
+    "2025,Week 3,FINAL,21-Sep,Eagles,27,Jets,13",
+    "2025,Week 3,FINAL,21-Sep,Bills,17,Cowboys,17",
+    "2025,Week 4,,28-Sep,Cowboys,,Eagles,",
+]
+
+
+def test_replay_accuracy_on_a_hand_built_season(tmp_path):
+    source = tmp_path / "2025_scores.csv"
+    source.write_text(HEADER + "\n".join(SEASON) + "\n")
+    slates = point_in_time_slates(load_scores_csv(source))
+    assert [(slate.week, len(slate.games)) for slate in slates] == [(2, 2), (3, 2)]
+    assert astuple(replay(slates)) == (2, 3, 0, 0)
+
+    scores = score_weight_grid(pack_slates(slates), np.array([astuple(DEFAULT_WEIGHTS)]))
+    assert scores.tolist() == [[2, 3, 0, 0]]
+
+
+def test_bad_rows_are_skipped_and_reported(tmp_path):
+    source = tmp_path / "2025_scores.csv"
+    bad = ["2025,Week one,FINAL,4-Sep,Jets,3,Bills,7", "2025,Week 1,FINAL,4-Sep,Jets,,Bills,"]
+    source.write_text(HEADER + "\n".join(SEASON[:2] + bad) + "\n")
+    errors = []
+    games = load_scores_csv(source, errors)
+    assert [(game.home_id, game.home_score, game.away_score) for game in games] == [("Eagles", 24, 20), ("Bills", 10, 17)]
+    assert [(error.line, error.reason) for error in errors] == [
+        (4, "unrecognized week 'Week one'"),
+        (5, "final game without both scores"),
+    ]
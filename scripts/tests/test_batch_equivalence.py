@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from pickem_agent import EventIndex, RatingWeights, build_team_profiles, compute_rating, evaluate_matchup
+from pickem_batch import TeamBatch, batch_ratings, evaluate_events, weights_matrix
+from pickem_http import FetchEngine, FixtureTransport
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fixtures import synthesize  # noqa: E402
+
+WEIGHTS = [RatingWeights(), RatingWeights(0.2, 0.5, 0.3, 25.0), RatingWeights(1.0, 0.0, 0.0, 400.0)]
+
+
+@pytest.fixture(scope="module", params=[0, 1, 2], ids=lambda seed: f"seed{seed}")
+def profiles(request, tmp_path_factory):
+    directory = tmp_path_factory.mktemp(f"espn{request.param}")
+    synthesize(directory, seed=request.param)
+    return build_team_profiles(FetchEngine(FixtureTransport(directory)))
+
+
+@pytest.mark.parametrize("weights", WEIGHTS, ids=["default", "form", "record"])
+def test_batch_ratings_match_compute_rating(profiles, weights):
+    batch = TeamBatch.from_profiles(profiles)
+    expected = [compute_rating(p.flat_stats, p.recent_form, p.cover_rate, weights) for p in profiles.values()]
+    assert batch_ratings(batch, weights).tolist() == pytest.approx(expected, abs=1e-12)
+    assert batch_ratings(batch, weights_matrix(WEIGHTS))[WEIGHTS.index(weights)].tolist() == pytest.approx(
+        expected, abs=1e-12
+    )
+
+
+def test_scalar_profile_ratings_match_the_batch(profiles):
+    ratings = batch_ratings(TeamBatch.from_profiles(profiles))
+    assert ratings.tolist() == pytest.approx([p.rating for p in profiles.values()], abs=1e-12)
+
+
+def test_evaluate_events_matches_evaluate_matchup(profiles):
+    batch = TeamBatch.from_profiles(profiles)
+    index = EventIndex.from_profiles(profiles)
+    games = 0
+    for week in index.weeks():
+        events, result = evaluate_events(batch, index.week_events(week))
+        labels = result.confidence_labels()
+        for event, home_pick, label in zip(events, result.home_pick.tolist(), labels):
+            home, away = profiles[event.home_id], profiles[event.away_id]
+            matchup = evaluate_matchup(week, home, away, event.point_spread)
+            assert matchup["recommended_pick"] == (home.name if home_pick else away.name)
+            assert matchup["confidence"] == label
+        games += len(events)
+    assert games > 0
@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from bench_pipeline import build_benchmarks, measure, regressions  # noqa: E402
+from fixtures import seasons, synthesize  # noqa: E402
+
+
+def test_every_benchmark_runs_on_one_league(tmp_path):
+    synthesize(tmp_path / "espn", leagues=1)
+    seasons(tmp_path / "seasons", 2)
+    benchmarks = build_benchmarks(tmp_path / "espn", tmp_path / "seasons", tmp_path / "out")
+    for name, (unit, benchmark) in benchmarks.items():
+        result = measure(benchmark, repeat=1, min_seconds=0.0)
+        assert result["seconds"] > 0 and result["rate"] > 0, name
+    assert (tmp_path / "out" / "batch" / "index.json").is_file()
+
+
+def _entry(seconds):
+    return {
+        "params": {"leagues": 1},
+        "machine": "host/x86_64",
+        "results": {"score_teams": {"seconds": seconds}},
+    }
+
+
+def test_check_flags_slowdowns_beyond_tolerance():
+    history = [_entry(0.010), _entry(0.011), _entry(0.012)]
+    assert regressions(_entry(0.0125), history, tolerance=0.15, window=5) == []
+    assert len(regressions(_entry(0.020), history, tolerance=0.15, window=5)) == 1
+
+
+def test_check_ignores_history_from_other_parameters():
+    other = {**_entry(0.001), "params": {"leagues": 4}}
+    assert regressions(_entry(0.020), [other], tolerance=0.15, window=5) == []
@@ -0,0 +1,86 @@
+import json
+import sys
+from pathlib import Path
+
+from pickem_agent import SCHEDULE_URL_TEMPLATE, SCOREBOARD_URL, STATS_URL_TEMPLATE, team_resource_urls
+from pickem_http import FetchEngine, FixtureTransport, fixture_name
+from pickem_snapshot import ProfileSnapshot, refresh_snapshot
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fixtures import synthesize  # noqa: E402
+
+
+class CountingTransport(FixtureTransport):
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.calls = []
+
+    def get(self, url, headers=None, timeout=0.0):
+        self.calls.append(url)
+        return super().get(url, headers, timeout)
+
+
+def _edit(directory, url, change):
+    path = Path(directory) / fixture_name(url)
+    payload = json.loads(path.read_text())
+    change(payload)
+    path.write_text(json.dumps(payload))
+
+
+def _finish(event, home_score, away_score):
+    event["status"]["type"].update(state="post", completed=True, id="3")
+    for competitor in event["competitions"][0]["competitors"]:
+        score = home_score if competitor["homeAway"] == "home" else away_score
+        other = away_score if competitor["homeAway"] == "home" else home_score
+        competitor["score"] = {"value": float(score), "displayValue": str(score)}
+        competitor["winner"] = score > other
+
+
+def _finish_game(directory, event_id, home_id, away_id, home_score=31, away_score=10):
+    """Mark one scheduled game final in the scoreboard, both schedules and both stat lines."""
+
+    def in_events(payload):
+        for event in payload["events"]:
+            if event["id"] == event_id:
+                _finish(event, home_score, away_score)
+
+    def add_result(won):
+        def change(payload):
+            for category in payload["splits"][0]["categories"]:
+                for stat in category["stats"]:
+                    if stat["name"] == ("wins" if won else "losses"):
+                        stat["value"] += 1
+
+        return change
+
+    _edit(directory, SCOREBOARD_URL, in_events)
+    for team_id in (home_id, away_id):
+        _edit(directory, SCHEDULE_URL_TEMPLATE.format(team_id=team_id), in_events)
+    _edit(directory, STATS_URL_TEMPLATE.format(team_id=home_id), add_result(home_score > away_score))
+    _edit(directory, STATS_URL_TEMPLATE.format(team_id=away_id), add_result(away_score > home_score))
+
+
+def test_delta_refresh_after_one_game_equals_a_full_rebuild(tmp_path):
+    synthesize(tmp_path)
+    snapshot = ProfileSnapshot.build(FetchEngine(FixtureTransport(tmp_path)))
+    scoreboard = json.loads((tmp_path / fixture_name(SCOREBOARD_URL)).read_text())
+    game = scoreboard["events"][0]
+    competitors = {c["homeAway"]: c["team"]["id"] for c in game["competitions"][0]["competitors"]}
+    before = snapshot.profiles[competitors["home"]].rating
+    _finish_game(tmp_path, game["id"], competitors["home"], competitors["away"])
+
+    transport = CountingTransport(tmp_path)
+    summary = refresh_snapshot(snapshot, FetchEngine(transport))
+    expected_urls = [SCOREBOARD_URL, *team_resource_urls(competitors["home"]), *team_resource_urls(competitors["away"])]
+    assert sorted(transport.calls) == sorted(expected_urls)
+    assert summary.changed_events == [game["id"]]
+    assert summary.refreshed_teams == sorted(competitors.values())
+    assert snapshot.profiles[competitors["home"]].rating != before
+
+    rebuilt = ProfileSnapshot.build(FetchEngine(FixtureTransport(tmp_path)))
+    assert snapshot.to_dict() == rebuilt.to_dict()
+
+    transport.calls.clear()
+    assert refresh_snapshot(snapshot, FetchEngine(transport)).changed_events == []
+    assert transport.calls == [SCOREBOARD_URL]
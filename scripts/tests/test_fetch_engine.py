@@ -0,0 +1,185 @@
+import json
+
+import pytest
+
+from pickem_http import (
+    CircuitBreaker,
+    CircuitOpenError,
+    FetchEngine,
+    FetchError,
+    FixtureTransport,
+    RetryPolicy,
+    TransportError,
+    TransportResponse,
+    fixture_name,
+)
+
+URL = "https://example.test/teams/1"
+
+
+class ScriptedTransport:
+    """Answer each URL from a queue of statuses (or exceptions); the last one repeats."""
+
+    def __init__(self, script, body=b'{"ok": true}', headers=None):
+        self.script = {url: list(steps) for url, steps in script.items()}
+        self.body = body
+        self.headers = headers or {}
+        self.calls = []
+
+    def get(self, url, headers=None, timeout=0.0):
+        self.calls.append(url)
+        steps = self.script.get(url, [200])
+        step = steps.pop(0) if len(steps) > 1 else steps[0]
+        if isinstance(step, Exception):
+            raise step
+        return TransportResponse(url, step, self.body if step < 400 else b"", dict(self.headers))
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def engine_for(transport, sleeps=None, **kwargs):
+    sleeps = [] if sleeps is None else sleeps
+    return FetchEngine(transport, concurrency=4, sleep=sleeps.append, **kwargs)
+
+
+def test_retries_transient_statuses_then_succeeds():
+    sleeps = []
+    transport = ScriptedTransport({URL: [503, 502, 200]})
+    engine = engine_for(transport, sleeps, retry=RetryPolicy(attempts=4, base_delay=0.5, max_delay=8.0))
+    assert engine.fetch_json(URL) == {"ok": True}
+    assert len(transport.calls) == 3
+    assert len(sleeps) == 2 and 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+    assert engine.report()["retries"] == 2
+
+
+def test_retry_after_header_sets_the_delay():
+    sleeps = []
+    transport = ScriptedTransport({URL: [429, 200]}, headers={"Retry-After": "3"})
+    engine_for(transport, sleeps).fetch_json(URL)
+    assert sleeps == [3.0]
+
+
+def test_retry_after_is_capped_by_max_delay():
+    assert RetryPolicy(max_delay=2.0).delay(0, "120") == 2.0
+
+
+def test_transport_errors_are_retried_and_client_errors_are_not():
+    transport = ScriptedTransport({URL: [TransportError(URL, "reset"), 200]})
+    assert engine_for(transport).fetch_json(URL) == {"ok": True}
+
+    missing = ScriptedTransport({URL: [404]})
+    with pytest.raises(FetchError) as excinfo:
+        engine_for(missing).fetch_json(URL)
+    assert excinfo.value.status == 404
+    assert len(missing.calls) == 1
+
+
+def test_gives_up_after_the_retry_budget():
+    transport = ScriptedTransport({URL: [503]})
+    with pytest.raises(FetchError):
+        engine_for(transport, retry=RetryPolicy(attempts=3)).fetch_json(URL)
+    assert len(transport.calls) == 3
+
+
+def test_breaker_opens_half_opens_and_closes():
+    clock = Clock()
+    breaker = CircuitBreaker(threshold=2, cooldown=30.0, clock=clock)
+    urls = [f"https://example.test/teams/{n}" for n in range(4)]
+    transport = ScriptedTransport({urls[0]: [503], urls[1]: [503]})
+    engine = engine_for(transport, retry=RetryPolicy(attempts=1), breaker=breaker)
+    for url in urls[:2]:
+        with pytest.raises(FetchError):
+            engine.fetch_json(url)
+    assert breaker.open_endpoints() == ["example.test"]
+
+    calls = len(transport.calls)
+    with pytest.raises(CircuitOpenError):
+        engine.fetch_json(urls[2])
+    assert len(transport.calls) == calls
+    assert engine.report()["circuit_rejected"] == [urls[2]]
+
+    clock.now = 31.0
+    assert engine.fetch_json(urls[2]) == {"ok": True}  # half-open probe succeeds
+    assert breaker.open_endpoints() == []
+    assert engine.fetch_json(urls[3]) == {"ok": True}
+
+
+def test_failed_probe_reopens_the_circuit():
+    clock = Clock()
+    breaker = CircuitBreaker(threshold=1, cooldown=10.0, clock=clock)
+    engine = engine_for(ScriptedTransport({URL: [503]}), retry=RetryPolicy(attempts=1), breaker=breaker)
+    with pytest.raises(FetchError):
+        engine.fetch_json(URL)
+    clock.now = 11.0
+    with pytest.raises(FetchError):
+        engine.fetch_json(URL)
+    with pytest.raises(CircuitOpenError):
+        engine.fetch_json(URL)
+
+
+def test_fetch_many_skips_failures_and_collapses_duplicates():
+    bad = "https://example.test/teams/9"
+    transport = ScriptedTransport({bad: [404]})
+    engine = engine_for(transport)
+    results = engine.fetch_many([URL, URL, bad, URL], skip_failures=True)
+    assert list(results) == [URL]
+    assert sorted(transport.calls) == sorted([URL, bad])
+    assert set(engine.failures) == {bad}
+    assert engine.report()["skipped"] == [bad]
+
+
+def test_fetch_many_raises_the_first_failure_by_default():
+    bad = "https://example.test/teams/9"
+    with pytest.raises(FetchError):
+        engine_for(ScriptedTransport({bad: [404]})).fetch_many([URL, bad])
+
+
+def test_fixture_transport_serves_files_and_404s(tmp_path):
+    (tmp_path / fixture_name(URL)).write_text(json.dumps({"id": 1}))
+    engine = engine_for(FixtureTransport(tmp_path))
+    assert engine.fetch_json(URL) == {"id": 1}
+    with pytest.raises(FetchError) as excinfo:
+        engine.fetch_json("https://example.test/teams/2")
+    assert excinfo.value.status == 404
+
+
+def test_invalid_json_is_a_fetch_error():
+    with pytest.raises(FetchError, match="Invalid JSON"):
+        engine_for(ScriptedTransport({URL: [200]}, body=b"{nope")).fetch_json(URL)
+
+
+def test_offline_misses_are_not_retried_or_held_against_the_host(tmp_path):
+    from pickem_cache import CachingTransport, ResponseCache, TTLPolicy
+    from pickem_http import OfflineMissError
+
+    cache = ResponseCache(tmp_path)
+    cache.store(URL, b'{"cached": true}', {})
+    sleeps = []
+    engine = engine_for(
+        CachingTransport(None, cache, TTLPolicy([]), offline=True), sleeps, breaker=CircuitBreaker(threshold=2)
+    )
+    for n in range(5):
+        with pytest.raises(OfflineMissError):
+            engine.fetch_json(f"https://example.test/teams/{n + 10}")
+    assert sleeps == []
+    assert engine.breaker.open_endpoints() == []
+    assert engine.fetch_json(URL) == {"cached": True}
+    assert engine.report()["retries"] == 0
+
+
+def test_latency_samples_are_bounded(monkeypatch):
+    import pickem_http
+
+    monkeypatch.setattr(pickem_http, "LATENCY_WINDOW", 8)
+    engine = engine_for(ScriptedTransport({}))
+    for n in range(20):
+        engine.fetch_json(f"https://example.test/teams/{n}")
+    stats = next(iter(engine._stats.values()))
+    assert len(stats.latencies) == 8 and stats.requests == 20
+    assert engine.report()["requests"] == 20
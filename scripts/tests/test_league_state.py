@@ -0,0 +1,38 @@
+import pytest
+
+from pickem_state import EMPTY_SNAPSHOT, LeagueState
+
+
+def test_as_of_never_sees_the_requested_week_or_later():
+    league = LeagueState(["a", "b", "c"])
+    league.apply_game(1, "a", "b", 24, 20)
+    week1 = league.as_of(1)
+    league.apply_game(3, "a", "c", 10, 30)
+    league.apply_game(3, "b", "c", 17, 17)
+
+    assert week1 == {team: EMPTY_SNAPSHOT for team in "abc"}
+    assert league.as_of(1) is week1
+    assert (league.as_of(2)["a"].wins, league.as_of(2)["a"].losses) == (1, 0)
+    assert league.as_of(3) == league.as_of(2)
+    assert league.as_of(3)["c"] == EMPTY_SNAPSHOT
+    latest = league.latest()
+    assert (latest["a"].wins, latest["a"].losses, latest["c"].wins, latest["c"].ties) == (1, 1, 1, 1)
+    assert league.as_of(4) == latest
+
+
+def test_begin_week_freezes_state_before_the_games_of_that_week():
+    league = LeagueState(["a", "b"])
+    league.apply_game(1, "a", "b", 21, 14)
+    league.begin_week(2)
+    frozen = league.as_of(2)
+    league.apply_game(2, "b", "a", 28, 3)
+    assert frozen["b"].losses == 1 and frozen["b"].wins == 0
+    assert league.as_of(2) is frozen
+    assert league.weeks() == (1, 2)
+
+
+def test_weeks_must_not_go_backwards():
+    league = LeagueState()
+    league.apply_game(2, "a", "b", 1, 0)
+    with pytest.raises(ValueError, match="week 1 arrives after week 2"):
+        league.apply_game(1, "a", "b", 1, 0)
@@ -0,0 +1,130 @@
+import json
+import os
+import re
+import threading
+
+import pytest
+
+from pickem_metrics import LATENCY_BUCKETS, Metrics
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"(?:,|$)')
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+
+def parse_prometheus(text):
+    """Return ({metric: type}, [(name, labels, value)]) for an exposition document."""
+
+    types = {}
+    samples = []
+    assert text.endswith("\n")
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert name not in types
+            types[name] = kind
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        name, label_text, value = match.groups()
+        labels = {}
+        if label_text:
+            pairs = LABEL.findall(label_text)
+            assert ",".join(f'{key}="{raw}"' for key, raw in pairs) == label_text
+            labels = {key: raw.replace('\\"', '"').replace("\\\\", "\\") for key, raw in pairs}
+        samples.append((name, labels, float(value)))
+    return types, samples
+
+
+def _family(name, types):
+    for suffix in ("_bucket", "_sum", "_count"):
+        if name.endswith(suffix) and name[: -len(suffix)] in types:
+            return name[: -len(suffix)]
+    return name
+
+
+@pytest.fixture
+def metrics():
+    clock = FakeClock()
+    registry = Metrics(clock=clock)
+    registry.enable_tracing()
+    with registry.span("fetch", url="https://example.test/a"):
+        clock.now += 0.25
+    with registry.span('odd "stage"'):
+        clock.now += 0.5
+    registry.record_span("fetch", clock.now, 0.125)
+    for seconds in (0.003, 0.003, 0.2, 30.0):
+        registry.observe_request("scoreboard", seconds, 100, None)
+    registry.observe_request("stats", 0.001, 40, "fresh")
+    registry.count("retries", 2, endpoint="stats")
+    return registry
+
+
+def test_prometheus_text_parses(metrics):
+    types, samples = parse_prometheus(metrics.prometheus_text())
+    for name, _, _ in samples:
+        assert _family(name, types) in types, name
+
+    values = {(name, tuple(sorted(labels.items()))): value for name, labels, value in samples}
+    assert values[("pickem_stage_calls_total", (("stage", "fetch"),))] == 2
+    assert values[("pickem_stage_seconds_total", (("stage", "fetch"),))] == pytest.approx(0.375)
+    assert values[("pickem_stage_calls_total", (("stage", 'odd "stage"'),))] == 1
+    assert values[("pickem_responses_total", (("source", "network"),))] == 4
+    assert values[("pickem_responses_total", (("source", "fresh"),))] == 1
+    assert values[("pickem_bytes_downloaded_total", ())] == 400
+    assert values[("pickem_retries_total", (("endpoint", "stats"),))] == 2
+    assert types["pickem_request_duration_seconds"] == "histogram"
+
+    metric = "pickem_request_duration_seconds"
+    buckets = [
+        (labels["le"], value)
+        for name, labels, value in samples
+        if name == metric + "_bucket" and labels["endpoint"] == "scoreboard"
+    ]
+    assert [le for le, _ in buckets] == [f"{bound:g}" for bound in LATENCY_BUCKETS] + ["+Inf"]
+    counts = [value for _, value in buckets]
+    assert counts == sorted(counts)
+    by_bound = dict(buckets)
+    assert (by_bound["0.001"], by_bound["0.005"], by_bound["0.25"], by_bound["10"], by_bound["+Inf"]) == (0, 2, 3, 3, 4)
+    labels = (("endpoint", "scoreboard"),)
+    assert values[(metric + "_count", labels)] == 4
+    assert values[(metric + "_sum", labels)] == pytest.approx(30.206)
+
+
+def test_chrome_trace_json_parses(metrics, tmp_path):
+    path = tmp_path / "trace.json"
+    metrics.write_trace(path)
+    document = json.loads(path.read_text())
+    assert document["displayTimeUnit"] == "ms"
+    assert document["otherData"]["stages"]["fetch"]["calls"] == 2
+
+    events = document["traceEvents"]
+    metadata = [event for event in events if event["ph"] == "M"]
+    spans = [event for event in events if event["ph"] == "X"]
+    assert len(metadata) + len(spans) == len(events)
+    thread = threading.current_thread()
+    assert metadata == [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": thread.ident, "args": {"name": thread.name}}]
+
+    assert [(event["name"], event["ts"], event["dur"]) for event in spans] == [
+        ("fetch", 0.0, 250000.0),
+        ('odd "stage"', 250000.0, 500000.0),
+        ("fetch", 750000.0, 125000.0),
+    ]
+    assert spans[0]["args"] == {"url": "https://example.test/a"}
+    assert "args" not in spans[1]
+    assert all(event["pid"] == os.getpid() and event["tid"] == thread.ident for event in spans)
+
+
+def test_spans_are_not_traced_until_enabled():
+    metrics = Metrics(clock=FakeClock())
+    with metrics.span("quiet"):
+        pass
+    assert metrics.trace()["traceEvents"] == []
+    assert metrics.stages["quiet"].calls == 1
@@ -0,0 +1,74 @@
+from pickem_agent import ScheduleEvent, TeamProfile
+from pickem_odds import OddsTracker
+from pickem_snapshot import ProfileSnapshot
+
+
+def _profile(team_id, rating):
+    return TeamProfile(
+        team_id=team_id,
+        name=f"Team {team_id}",
+        flat_stats={},
+        events=(),
+        recent_form=0.5,
+        cover_rate=0.5,
+        rating=rating,
+    )
+
+
+def _tracker(spread="-3", **extra_events):
+    events = {"g1": ScheduleEvent("g1", 2025, 2, 8, "h", "a", spread, False), **extra_events}
+    snapshot = ProfileSnapshot(profiles={"h": _profile("h", 0.6), "a": _profile("a", 0.5)}, events=events)
+    snapshot.evaluate()
+    return OddsTracker(snapshot, clock=lambda: 100.0)
+
+
+def _kinds(changes):
+    return [(change.kind, change.before, change.after) for change in changes]
+
+
+def test_same_line_in_another_rendering_only_updates_the_text():
+    tracker = _tracker("-3")
+    assert tracker.ingest("g1", "Team h -3.0", at=101.0) == []
+    assert tracker.snapshot.events["g1"].point_spread == "Team h -3.0"
+    assert tracker.snapshot.matchups["g1"]["point_spread"] == "Team h -3.0"
+    assert tracker.evaluations == 0 and len(tracker.series["g1"]) == 1
+
+
+def test_line_move_that_flips_the_pick():
+    tracker = _tracker("-3")
+    assert tracker.snapshot.matchups["g1"]["recommended_pick"] == "Team h"
+    changes = tracker.ingest("g1", "+2", at=102.0)
+    assert _kinds(changes) == [("line_move", -3.0, 2.0), ("pick_flip", "Team h", "Team a")]
+    assert changes[0].week == 8 and changes[0].at == 102.0
+    assert tracker.snapshot.matchups["g1"]["point_spread"] == "+2"
+    assert tracker.series["g1"].points() == [(100.0, -3.0), (102.0, 2.0)]
+
+
+def test_line_move_without_a_flip_and_off_the_board():
+    tracker = _tracker("-3")
+    assert _kinds(tracker.ingest("g1", "-1", at=101.0)) == [("line_move", -3.0, -1.0)]
+    assert _kinds(tracker.ingest("g1", "N/A", at=102.0)) == [("line_move", -1.0, None)]
+    assert tracker.ingest("g1", "N/A", at=103.0) == []
+    assert tracker.evaluations == 2
+
+
+def test_confidence_change_after_the_profiles_moved():
+    tracker = _tracker("-3")
+    assert tracker.snapshot.matchups["g1"]["confidence"] == "Low"
+    # A profile refresh landed since the matchup was last evaluated.
+    tracker.snapshot.profiles["h"].rating = 0.9
+    changes = tracker.ingest("g1", "-4", at=101.0)
+    assert _kinds(changes) == [("line_move", -3.0, -4.0), ("confidence_change", "Low", "High")]
+
+
+def test_line_move_is_reported_even_when_the_game_cannot_be_evaluated():
+    tracker = _tracker(g2=ScheduleEvent("g2", 2025, 2, 9, "h", "x", "-1", False))
+    assert "g2" not in tracker.snapshot.matchups
+    changes = tracker.ingest("g2", "-6", at=101.0)
+    assert _kinds(changes) == [("line_move", -1.0, -6.0)]
+    assert (changes[0].week, changes[0].home_team, changes[0].away_team) == (9, "Team h", "x")
+    assert tracker.evaluations == 0
+
+
+def test_unknown_games_are_ignored():
+    assert _tracker().ingest("nope", "-3") == []
@@ -0,0 +1,137 @@
+import pytest
+
+from pickem_cache import REVALIDATE_HEADERS, CachingTransport, ResponseCache, TTLPolicy
+from pickem_http import TransportError, TransportResponse
+
+TEAM = "https://example.test/teams/{team_id}"
+URL = "https://example.test/teams/1"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Origin:
+    """In-memory origin with ETags; ``down`` makes every request fail."""
+
+    def __init__(self):
+        self.bodies = {}
+        self.requests = []
+        self.down = False
+        self.status = None
+
+    def get(self, url, headers=None, timeout=0.0):
+        headers = dict(headers or {})
+        self.requests.append((url, headers))
+        if self.down:
+            raise TransportError(url, "connection refused")
+        if self.status is not None:
+            return TransportResponse(url, self.status, b"")
+        body = self.bodies[url]
+        etag = f'"{len(body)}"'
+        if headers.get("If-None-Match") == etag:
+            return TransportResponse(url, 304, b"", {"ETag": etag})
+        return TransportResponse(url, 200, body, {"ETag": etag, "Last-Modified": "Tue, 07 Oct 2025 12:00:00 GMT"})
+
+
+@pytest.fixture
+def setup(tmp_path):
+    clock = Clock()
+    origin = Origin()
+    origin.bodies[URL] = b'{"v": 1}'
+    cache = ResponseCache(tmp_path, clock=clock)
+    transport = CachingTransport(origin, cache, TTLPolicy([(TEAM, 60.0)]))
+    return clock, origin, cache, transport
+
+
+def test_ttl_policy_matches_templates():
+    policy = TTLPolicy([(TEAM, 60.0), ("https://example.test/teams/{team_id}/schedule", 5.0)], default=1.0)
+    assert policy.ttl_for(URL) == 60.0
+    assert policy.ttl_for("https://example.test/teams/7/schedule") == 5.0
+    assert policy.ttl_for("https://example.test/scoreboard") == 1.0
+
+
+def test_fresh_entries_skip_the_origin(setup):
+    clock, origin, cache, transport = setup
+    assert transport.get(URL).body == b'{"v": 1}'
+    clock.now += 30
+    response = transport.get(URL)
+    assert response.headers["X-Cache"] == "hit"
+    assert len(origin.requests) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_stale_entries_revalidate_with_conditional_headers(setup):
+    clock, origin, cache, transport = setup
+    transport.get(URL)
+    clock.now += 61
+    response = transport.get(URL)
+    assert response.headers["X-Cache"] == "revalidated"
+    assert origin.requests[-1][1]["If-None-Match"] == '"8"'
+    assert origin.requests[-1][1]["If-Modified-Since"] == "Tue, 07 Oct 2025 12:00:00 GMT"
+    assert cache.revalidated == 1
+    # touch() restarted the TTL.
+    clock.now += 30
+    assert transport.get(URL).headers["X-Cache"] == "hit"
+
+
+def test_revalidate_headers_bypass_a_fresh_entry(setup):
+    _, origin, _, transport = setup
+    transport.get(URL)
+    transport.get(URL, headers=REVALIDATE_HEADERS)
+    assert len(origin.requests) == 2
+
+
+def test_unreachable_origin_serves_the_stale_body(setup):
+    clock, origin, _, transport = setup
+    transport.get(URL)
+    clock.now += 61
+    origin.down = True
+    response = transport.get(URL)
+    assert response.status == 200 and response.headers["X-Cache"] == "stale"
+    with pytest.raises(TransportError):
+        transport.get("https://example.test/teams/2")
+
+
+def test_server_errors_serve_the_stale_body(setup):
+    clock, origin, _, transport = setup
+    transport.get(URL)
+    clock.now += 61
+    origin.status = 503
+    assert transport.get(URL).headers["X-Cache"] == "stale"
+
+
+def test_offline_mode_misses_with_504(setup):
+    _, _, cache, _ = setup
+    offline = CachingTransport(None, cache, TTLPolicy([]), offline=True)
+    response = offline.get(URL)
+    assert response.status == 504 and response.headers["X-Cache"] == "offline-miss"
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=25)
+    for n in range(3):
+        cache.store(f"https://example.test/{n}", b"x" * 10, {})
+    assert cache.lookup("https://example.test/0") is None
+    assert cache.total_bytes == 20
+
+    cache.lookup("https://example.test/1")
+    cache.store("https://example.test/3", b"x" * 10, {})
+    assert cache.lookup("https://example.test/2") is None
+    assert cache.read_body("https://example.test/1") == b"x" * 10
+    assert cache.read_body("https://example.test/2") is None
+
+
+def test_index_persists_across_instances_after_flush(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.store(URL, b"body", {"ETag": '"e1"'})
+    assert ResponseCache(tmp_path).lookup(URL) is None
+    cache.flush()
+    reopened = ResponseCache(tmp_path)
+    entry = reopened.lookup(URL)
+    assert entry is not None and entry.etag == '"e1"' and entry.size == 4
+    assert reopened.read_body(URL) == b"body"
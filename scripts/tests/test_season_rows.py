@@ -0,0 +1,62 @@
+import argparse
+import json
+
+import pytest
+
+from generate_season_data import SeasonCsvError, iter_matchups, parse_workers, read_season_rows, run_batch
+
+
+def test_extra_trailing_cell_does_not_fill_absent_columns(tmp_path):
+    source = tmp_path / "2025.csv"
+    source.write_text("Week,HomeTeam,AwayTeam,Date\nWeek 1,Eagles,Cowboys,4-Sep,FINAL\nWeek 1,Chargers,Chiefs,5-Sep\n")
+    errors = []
+    rows = read_season_rows(source, 2025, errors)
+    assert errors == []
+    assert list(rows.final) == [0, 0]
+    assert list(rows.home_scores) == [-1, -1]
+    assert rows.day_values == ["TBD"]
+
+
+def test_missing_required_column_is_fatal(tmp_path):
+    source = tmp_path / "2025.csv"
+    source.write_text("Week,Home,AwayTeam\nWeek 1,Eagles,Cowboys\n")
+    with pytest.raises(SeasonCsvError, match="HomeTeam"):
+        read_season_rows(source, 2025, [])
+
+
+def test_batch_keeps_previous_output_of_an_unreadable_csv(tmp_path):
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    source = inputs / "2025_scores.csv"
+    source.write_text("Week,HomeTeam,AwayTeam,Date,HomeScore,AwayScore\nWeek 1,Eagles,Cowboys,4-Sep,24,20\n")
+    out = tmp_path / "out"
+    run_batch([source], out, workers=1)
+    season_json = (out / "season2025.json").read_bytes()
+
+    source.write_text("Week,Home,AwayTeam\nWeek 1,Eagles,Cowboys\n")
+    summary = run_batch([source], out, workers=1)
+    assert summary["failed"] == [2025] and summary["generated"] == []
+    assert "HomeTeam" in summary["errors"][0].reason
+    assert (out / "season2025.json").read_bytes() == season_json
+    assert [entry["season"] for entry in json.loads((out / "index.json").read_text())["seasons"]] == [2025]
+
+
+def test_records_count_every_scored_row_like_the_original_generator(tmp_path):
+    source = tmp_path / "2025.csv"
+    source.write_text(
+        "Week,HomeTeam,AwayTeam,Date,HomeScore,AwayScore,GameStatus\n"
+        "Week 1,Eagles,Cowboys,4-Sep,24,20,\n"
+        "Week 2,Eagles,Giants,11-Sep,,,\n"
+        "Week 3,Cowboys,Eagles,18-Sep,,,FINAL\n"
+    )
+    records = [
+        (matchup["homeTeam"]["record"], matchup["awayTeam"]["record"])
+        for _, _, matchup in iter_matchups(source, 2025, [])
+    ]
+    assert records == [("0-0", "0-0"), ("1-0", "0-0"), ("0-1", "1-0")]
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "two"])
+def test_workers_must_be_positive(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_workers(value)
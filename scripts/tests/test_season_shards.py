@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from generate_season_data import SeasonJsonWriter, generate_season
+
+SOURCE = Path(__file__).resolve().parents[2] / "data" / "2025_scores.csv"
+
+
+def _season_csv(path, away_score="20"):
+    lines = SOURCE.read_text().splitlines(keepends=True)
+    # Row 1 is the week 1 Cowboys at Eagles game.
+    fields = lines[1].split(",")
+    fields[7] = away_score
+    lines[1] = ",".join(fields)
+    path.write_text("".join(lines))
+    return path
+
+
+def _manifest(directory):
+    return json.loads((directory / "season2025.manifest.json").read_text())
+
+
+def _shard_files(directory):
+    return {path.name: path.stat() for path in directory.glob("season2025-w*.json")}
+
+
+def test_unchanged_weeks_are_not_rewritten(tmp_path):
+    source = _season_csv(tmp_path / "2025.csv")
+    out = tmp_path / "out" / "season2025.json"
+    generate_season(source, out, 2025, shards=True)
+    first = _shard_files(out.parent)
+    manifest = _manifest(out.parent)
+    assert len(first) == len(manifest["shards"]) == 18
+
+    generate_season(source, out, 2025, shards=True)
+    second = _shard_files(out.parent)
+    assert _manifest(out.parent) == manifest
+    assert {name: (st.st_ino, st.st_mtime_ns) for name, st in second.items()} == {
+        name: (st.st_ino, st.st_mtime_ns) for name, st in first.items()
+    }
+
+
+def test_superseded_shards_survive_one_generation(tmp_path):
+    out = tmp_path / "out" / "season2025.json"
+    generate_season(_season_csv(tmp_path / "a.csv", "20"), out, 2025, shards=True)
+    week1_a = _manifest(out.parent)["shards"]["1"]["file"]
+
+    generate_season(_season_csv(tmp_path / "b.csv", "21"), out, 2025, shards=True)
+    week1_b = _manifest(out.parent)["shards"]["1"]["file"]
+    assert week1_b != week1_a
+    assert (out.parent / week1_a).is_file()
+    assert _manifest(out.parent)["shards"]["2"]["file"] in _shard_files(out.parent)
+
+    generate_season(_season_csv(tmp_path / "c.csv", "22"), out, 2025, shards=True)
+    assert not (out.parent / week1_a).exists()
+    assert (out.parent / week1_b).is_file()
+    assert len(_shard_files(out.parent)) == 19
+
+
+def test_failed_season_commit_keeps_the_previous_manifest(tmp_path, monkeypatch):
+    out = tmp_path / "out" / "season2025.json"
+    generate_season(_season_csv(tmp_path / "a.csv", "20"), out, 2025, shards=True)
+    manifest = _manifest(out.parent)
+
+    def fail(self):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(SeasonJsonWriter, "commit", fail)
+    with pytest.raises(OSError):
+        generate_season(_season_csv(tmp_path / "b.csv", "21"), out, 2025, shards=True)
+    assert _manifest(out.parent) == manifest
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from pickem_season_store import (
+    HEADER,
+    NO_SCORE,
+    STATUS_FINAL,
+    STATUS_SCHEDULED,
+    SeasonStore,
+    SeasonStoreBuilder,
+    SeasonStoreError,
+    merge_season_stores,
+)
+
+
+def _build(path, season=2025, teams=("Eagles", "Cowboys", "Jets")):
+    builder = SeasonStoreBuilder(teams)
+    builder.add(season, 2, teams[2], teams[0], None, None, False, 1_757_000_000)
+    builder.add(season, 1, teams[0], teams[1], 24, 20, True, 1_756_000_000)
+    builder.add(season, 1, teams[2], teams[1], 10, 17, True, 1_756_100_000)
+    assert builder.write(path) == 3
+    return path
+
+
+def test_write_open_and_read_columns(tmp_path):
+    path = _build(tmp_path / "s.pkseason")
+    with SeasonStore(path) as store:
+        assert len(store) == 3
+        assert store.teams == ["Eagles", "Cowboys", "Jets"]
+        assert store.seasons() == [2025]
+        # Rows come back sorted by week, stable within a week.
+        assert store["week"].tolist() == [1, 1, 2]
+        assert [store.teams[i] for i in store["home"].tolist()] == ["Eagles", "Jets", "Jets"]
+        assert store["home_score"].tolist() == [24, 10, NO_SCORE]
+        assert store["status"].tolist() == [STATUS_FINAL, STATUS_FINAL, STATUS_SCHEDULED]
+        assert store["kickoff"].dtype == np.dtype("<i8")
+        assert not store["week"].flags.writeable
+        assert store.season_slice(2025) == slice(0, 3)
+        assert store.season_slice(2024) == slice(0, 0)
+
+
+def test_merge_remaps_team_indices_by_name(tmp_path):
+    first = _build(tmp_path / "a.pkseason", 2024)
+    second = _build(tmp_path / "b.pkseason", 2025, teams=("Jets", "Eagles", "Cowboys"))
+    assert merge_season_stores([second, first], tmp_path / "all.pkseason") == 6
+    with SeasonStore(tmp_path / "all.pkseason") as store:
+        assert store.seasons() == [2024, 2025]
+        names = [store.teams[i] for i in store["home"].tolist()]
+        assert names[:3] == ["Eagles", "Jets", "Jets"]
+        assert names[3:] == ["Jets", "Cowboys", "Cowboys"]
+
+
+@pytest.mark.parametrize("size", [0, 3, HEADER.size + 10, -100])
+def test_empty_or_truncated_files_are_rejected(tmp_path, size):
+    data = _build(tmp_path / "s.pkseason").read_bytes()
+    path = tmp_path / "cut.pkseason"
+    path.write_bytes(data[:size])
+    with pytest.raises(SeasonStoreError):
+        SeasonStore(path)
+
+
+def test_wrong_magic_is_rejected(tmp_path):
+    path = tmp_path / "s.pkseason"
+    path.write_bytes(b"NOPE" + bytes(HEADER.size))
+    with pytest.raises(SeasonStoreError, match="season store"):
+        SeasonStore(path)
+
+
+def test_close_refuses_while_column_views_are_alive(tmp_path):
+    store = SeasonStore(_build(tmp_path / "s.pkseason"))
+    weeks = store["week"]
+    with pytest.raises(BufferError):
+        store.close()
+    copied = weeks.copy()
+    del weeks
+    store.close()
+    assert copied.tolist() == [1, 1, 2]
@@ -0,0 +1,48 @@
+import hashlib
+import json
+from pathlib import Path
+
+from generate_season_data import generate_season, iter_matchups
+
+SOURCE = Path(__file__).resolve().parents[2] / "data" / "2025_scores.csv"
+# sha256 of what the original in-memory generator wrote for data/2025_scores.csv:
+# json.dumps(payload, indent=2) + "\n".
+BASELINE_SHA256 = "156ff496e2e002f57c7ecb5463e2142d6e4082afd41b750622cb6f807bdc6d87"
+
+
+def test_indented_output_is_byte_identical_to_the_original_generator(tmp_path):
+    out = tmp_path / "season2025.json"
+    generate_season(SOURCE, out, 2025)
+    data = out.read_bytes()
+    assert hashlib.sha256(data).hexdigest() == BASELINE_SHA256
+    assert data.decode() == json.dumps(json.loads(data), indent=2) + "\n"
+
+
+def test_compact_output_holds_the_same_payload(tmp_path):
+    indented = tmp_path / "indented.json"
+    compact = tmp_path / "compact.json"
+    generate_season(SOURCE, indented, 2025)
+    generate_season(SOURCE, compact, 2025, compact=True)
+    assert b"\n  " not in compact.read_bytes()
+    assert json.loads(compact.read_bytes()) == json.loads(indented.read_bytes())
+
+
+def test_memoized_dates_keep_tbd_games_in_their_own_week(tmp_path):
+    source = tmp_path / "2025.csv"
+    source.write_text(
+        "Week,HomeTeam,AwayTeam,Date,Day\n"
+        "Week 1,Eagles,Cowboys,TBD,\n"
+        "Week 2,Eagles,Giants,TBD,\n"
+        "Week 2,Jets,Bills,14-Sep,SUN\n"
+        "Week 3,Jets,Giants,14-Sep,SUN\n"
+    )
+    matchups = [matchup for _, _, matchup in iter_matchups(source, 2025, [])]
+    assert [m["kickoff"] for m in matchups] == [
+        "2025-09-04T17:00:00Z",
+        "2025-09-11T17:00:00Z",
+        "2025-09-14T17:00:00Z",
+        "2025-09-14T17:00:00Z",
+    ]
+    assert [m["network"] for m in matchups] == ["TBD", "TBD", "SUN", "SUN"]
+    # Team fields come from the shared table rather than per-row copies.
+    assert matchups[0]["homeTeam"]["name"] is matchups[1]["homeTeam"]["name"]
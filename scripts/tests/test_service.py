@@ -0,0 +1,141 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from pickem_http import FetchEngine, FixtureTransport
+from pickem_service import PROMETHEUS_CONTENT_TYPE, PickemService
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fixtures import synthesize  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def fixtures(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("espn")
+    synthesize(directory)
+    return directory
+
+
+async def _request(port, raw):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, body
+
+
+def _get(port, target, method="GET"):
+    return _request(port, f"{method} {target} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n".encode())
+
+
+def _serve(fixtures, scenario):
+    async def main():
+        service = PickemService(FetchEngine(FixtureTransport(fixtures)), refresh_interval=0)
+        await service.start()
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await scenario(service, port)
+
+    return asyncio.run(main())
+
+
+def test_routes(fixtures):
+    async def scenario(service, port):
+        status, _, body = await _get(port, "/weeks")
+        assert status == 200 and json.loads(body)["weeks"] == list(range(1, 19))
+
+        status, _, body = await _get(port, "/matchups?week=8")
+        payload = json.loads(body)
+        assert status == 200 and payload["week"] == 8 and len(payload["matchups"]) == 16
+        assert payload["matchups"] == service.snapshot.week_matchups(8)
+
+        status, _, body = await _get(port, "/matchups?week=40")
+        assert (status, json.loads(body)) == (200, {"week": 40, "matchups": []})
+        assert (await _get(port, "/matchups?week=eight"))[0] == 400
+        assert (await _get(port, "/matchups?week=8", "POST"))[0] == 405
+        assert (await _get(port, "/refresh"))[0] == 405
+        assert (await _get(port, "/nowhere"))[0] == 404
+
+        status, _, body = await _get(port, "/health")
+        assert status == 200 and json.loads(body)["teams"] == 32
+        status, headers, _ = await _get(port, "/metrics")
+        assert status == 200 and headers["Content-Type"] == PROMETHEUS_CONTENT_TYPE
+
+    _serve(fixtures, scenario)
+
+
+def test_keep_alive_serves_several_requests_on_one_connection(fixtures):
+    async def scenario(service, port):
+        raw = b"GET /weeks HTTP/1.1\r\n\r\nGET /health HTTP/1.1\r\nConnection: close\r\n\r\n"
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        data = await reader.read()
+        writer.close()
+        assert data.count(b"HTTP/1.1 200 OK") == 2
+        assert b"Connection: keep-alive" in data and b"Connection: close" in data
+
+    _serve(fixtures, scenario)
+
+
+@pytest.mark.parametrize("length", ["-5", "ten"])
+def test_bad_content_length_is_a_400(fixtures, length):
+    async def scenario(service, port):
+        raw = f"POST /refresh HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode()
+        status, headers, body = await _request(port, raw)
+        assert status == 400 and headers["Connection"] == "close"
+        assert json.loads(body) == {"error": "invalid Content-Length"}
+        assert service.refreshes == 0
+
+    _serve(fixtures, scenario)
+
+
+def test_concurrent_refreshes_run_one_at_a_time(fixtures):
+    active = []
+    overlaps = []
+    lock = threading.Lock()
+
+    async def scenario(service, port):
+        original = service._refresh
+
+        def slow_refresh():
+            with lock:
+                active.append(1)
+                overlaps.append(len(active))
+            time.sleep(0.05)
+            try:
+                return original()
+            finally:
+                with lock:
+                    active.pop()
+
+        service._refresh = slow_refresh
+        refreshes = [_get(port, "/refresh", "POST") for _ in range(4)]
+        results = await asyncio.gather(*refreshes, _get(port, "/matchups?week=1"))
+        assert [status for status, _, _ in results] == [200] * 5
+        assert json.loads(results[0][2])["scoreboard_failed"] is False
+        assert service.refreshes == 4
+
+    _serve(fixtures, scenario)
+    assert overlaps == [1, 1, 1, 1]
+
+
+def test_each_refresh_cycle_starts_with_no_recorded_failures(fixtures):
+    async def scenario(service, port):
+        service.engine.failures["https://example.test/stale"] = None
+        service.engine.rejected.append("https://example.test/stale")
+        await service.refresh()
+        report = service.engine.report()
+        assert report["skipped"] == [] and report["circuit_rejected"] == []
+
+    _serve(fixtures, scenario)
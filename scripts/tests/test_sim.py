@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from pickem_http import FetchEngine, FixtureTransport
+from pickem_sim import build_model, remaining_events, simulate
+from pickem_snapshot import ProfileSnapshot
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fixtures import synthesize  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def snapshot(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("espn")
+    synthesize(directory, completed_weeks=7)
+    return ProfileSnapshot.build(FetchEngine(FixtureTransport(directory)))
+
+
+def test_final_games_are_not_simulated_again(snapshot):
+    events = remaining_events(snapshot, 1, 18)
+    assert len(events) == 11 * 16
+    assert {event.week for event in events} == set(range(8, 19))
+    assert remaining_events(snapshot, 8, 18) == events
+    assert remaining_events(snapshot, 1, 7) == []
+
+
+def test_every_team_plays_a_full_season_once(snapshot):
+    model = build_model(snapshot, remaining_events(snapshot, 1, 18), {})
+    remaining = (model.home_idx[:, None] == range(32)).sum(axis=0) + (model.away_idx[:, None] == range(32)).sum(axis=0)
+    assert remaining.tolist() == [11] * 32
+    assert (model.base_games + remaining).tolist() == [18] * 32
+
+    totals = simulate(model, 200, seed=1)
+    expected_wins = totals.wins / totals.sims
+    assert (expected_wins >= model.base_wins).all() and (expected_wins <= model.base_wins + 11).all()
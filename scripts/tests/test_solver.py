@@ -0,0 +1,75 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from pickem_solver import (
+    PickSet,
+    PoolObjective,
+    expected_score_picks,
+    point_values,
+    pool_picks,
+    pool_share_table,
+    score_pmf,
+)
+
+
+def test_expected_score_picks_match_brute_force():
+    p_home = np.array([0.8, 0.3, 0.55])
+    values = point_values(3, confidence=True)
+    picks = expected_score_picks(p_home, values)
+    # Favourites with 3, 2, 1 points by confidence 0.8 > 0.7 > 0.55.
+    assert picks.home.tolist() == [True, False, True]
+    assert picks.points.tolist() == [3, 2, 1]
+    assert picks.expected_score(p_home) == pytest.approx(3 * 0.8 + 2 * 0.7 + 1 * 0.55)
+
+    best = max(
+        PickSet(np.array(home), np.array(points)).expected_score(p_home)
+        for home in itertools.product([True, False], repeat=3)
+        for points in itertools.permutations(values)
+    )
+    assert picks.expected_score(p_home) == pytest.approx(best)
+
+
+def test_score_pmf_is_exact():
+    pmf = score_pmf(np.array([0.5, 0.25]), np.array([1, 2]))
+    assert pmf.tolist() == [[0.375, 0.375, 0.125, 0.125]]
+
+
+def test_pool_share_table_splits_ties():
+    # One opponent scoring 0 or 1 with even odds.
+    pmf = np.array([[0.5, 0.5]])
+    assert pool_share_table(pmf, 1, 2)[0].tolist() == pytest.approx([0.25, 0.75, 1.0])
+    # Two opponents: scoring 1 beats both (1/4), ties one (1/2, half the prize)
+    # or ties both (1/4, a third of the prize).
+    assert pool_share_table(pmf, 2, 1)[0, 1] == pytest.approx(0.25 + 0.25 + 1 / 12)
+    # Alone in the pool every score takes the whole prize.
+    assert pool_share_table(pmf, 0, 2)[0].tolist() == pytest.approx([1.0, 1.0, 1.0])
+
+
+def test_confidence_pool_optimum_known_by_hand():
+    # One opponent picks both home teams with 1 and 2 points (public = 100%).
+    # Our home/home entry with points 2, 1 ties when both or neither home team
+    # wins (0.54 + 0.04) and wins outright on home/away (0.36):
+    # 0.58 / 2 + 0.36 = 0.65, the best of all eight entries.
+    p_home = np.array([0.9, 0.6])
+    values = point_values(2, confidence=True)
+    objective = PoolObjective(p_home, np.ones(2), values, pool_size=2, samples=200_000, seed=0)
+    start = PickSet(np.array([True, True]), np.array([1, 2]))
+    assert objective(start) == pytest.approx(0.5, abs=0.005)
+    best = pool_picks(objective, start)
+    assert best.home.tolist() == [True, True] and best.points.tolist() == [2, 1]
+    assert objective(best) == pytest.approx(0.65, abs=0.005)
+
+
+def test_pool_objective_prefers_the_contrarian_side():
+    # Two opponents always take the 60% home side. Joining them splits every
+    # outcome three ways (1/3); the underdog wins the whole prize 40% of the time.
+    p_home = np.array([0.6])
+    values = point_values(1, confidence=False)
+    objective = PoolObjective(p_home, np.ones(1), values, pool_size=3, samples=200_000, seed=0)
+    favourite = expected_score_picks(p_home, values)
+    assert objective(favourite) == pytest.approx(1 / 3)
+    best = pool_picks(objective, favourite)
+    assert best.home.tolist() == [False]
+    assert objective(best) == pytest.approx(0.4, abs=0.005)
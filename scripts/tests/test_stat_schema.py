@@ -0,0 +1,36 @@
+from pickem_agent import StatSchema, flatten_stats
+
+PAYLOAD = {
+    "splits": [
+        {
+            "categories": [
+                {"stats": [{"name": "wins", "value": 9}, {"name": "losses", "value": "8"}]},
+                {"stats": [{"name": "pointsForTotal", "value": 401.0}, {"name": "pointsAgainst", "value": 377}]},
+            ]
+        }
+    ]
+}
+
+
+def test_empty_payloads_read_as_missing():
+    # build_team_profiles passes {} for every failed or skipped stats fetch.
+    schema = StatSchema()
+    assert schema.extract({}) == {}
+    assert schema.extract({}) == {}
+
+
+def test_fast_path_matches_flatten_stats():
+    schema = StatSchema()
+    first = schema.extract(PAYLOAD)
+    second = schema.extract(PAYLOAD)
+    assert first == second == {"wins": 9.0, "losses": 8.0, "pointsFor": 401.0, "pointsAgainst": 377.0}
+    assert schema.fast_reads == 1
+    assert flatten_stats(PAYLOAD)["pointsForTotal"] == first["pointsFor"]
+
+
+def test_empty_payload_between_full_ones():
+    schema = StatSchema()
+    expected = schema.extract(PAYLOAD)
+    assert schema.extract({}) == {}
+    assert schema.extract({}) == {}
+    assert schema.extract(PAYLOAD) == expected
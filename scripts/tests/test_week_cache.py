@@ -0,0 +1,77 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+import pickem_agent
+from pickem_agent import (
+    EventIndex,
+    NFLPickemError,
+    build_team_profiles,
+    gather_all_matchups,
+    load_week_cache,
+    parse_positive_int,
+    save_week_cache,
+)
+from pickem_http import FetchEngine, FixtureTransport
+from pickem_snapshot import load_snapshot
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fixtures import synthesize  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def profiles(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("espn")
+    synthesize(directory)
+    return build_team_profiles(FetchEngine(FixtureTransport(directory)))
+
+
+def test_week_cache_round_trip(tmp_path, profiles, capsys):
+    index = EventIndex.from_profiles(profiles)
+    path = str(tmp_path / "weeks.json")
+    assert save_week_cache(path, profiles, index) == len(index.weeks())
+    assert load_week_cache(path) == gather_all_matchups(profiles, index)
+    assert capsys.readouterr().err == ""
+
+
+def test_week_cache_is_a_profile_snapshot(tmp_path, profiles):
+    index = EventIndex.from_profiles(profiles)
+    path = tmp_path / "weeks.json"
+    save_week_cache(str(path), profiles, index)
+    snapshot = load_snapshot(path)
+    assert snapshot is not None and snapshot.profiles.keys() == profiles.keys()
+    assert {week: snapshot.week_matchups(week) for week in snapshot.weeks()} == gather_all_matchups(profiles, index)
+
+
+def test_old_week_cache_warns(tmp_path, profiles, capsys, monkeypatch):
+    path = str(tmp_path / "weeks.json")
+    save_week_cache(path, profiles, EventIndex.from_profiles(profiles))
+    later = pickem_agent.time.time() + 7200
+    monkeypatch.setattr(pickem_agent.time, "time", lambda: later)
+    load_week_cache(path, max_age=3600)
+    assert "2.0 h old" in capsys.readouterr().err
+    load_week_cache(path, max_age=0)
+    assert capsys.readouterr().err == ""
+
+
+def test_missing_week_cache_is_an_error(tmp_path):
+    with pytest.raises(NFLPickemError, match="--refresh-week-cache"):
+        load_week_cache(str(tmp_path / "missing.json"))
+
+
+@pytest.mark.parametrize("content", ["", "{not json", json.dumps({"version": -1, "matchups": {}})])
+def test_unreadable_week_cache_is_an_error(tmp_path, content):
+    path = tmp_path / "weeks.json"
+    path.write_text(content)
+    with pytest.raises(NFLPickemError, match="unreadable or from another version"):
+        load_week_cache(str(path))
+
+
+@pytest.mark.parametrize("value", ["0", "-2", "many"])
+def test_counts_must_be_positive(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_positive_int(value)